@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for Codebase Genius
+Generates deterministic synthetic repositories and times each pipeline phase.
+Results are written as JSON and can be compared against a baseline run.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Callable
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import utils
+
+
+class SyntheticRepoGenerator:
+    """Deterministic generator of synthetic Python/Jac repositories."""
+
+    def __init__(self, seed: int = 42, files: int = 200, functions_per_file: int = 10,
+                 depth: int = 3, padding_lines: int = 0, language_mix: Optional[Dict[str, float]] = None):
+        self.seed = seed
+        self.files = files
+        self.functions_per_file = functions_per_file
+        self.depth = depth
+        self.padding_lines = padding_lines
+        self.language_mix = language_mix or {".py": 0.8, ".jac": 0.2}
+
+    def settings(self) -> Dict[str, Any]:
+        """Return the generator settings for the results file."""
+        return {
+            "seed": self.seed,
+            "files": self.files,
+            "functions_per_file": self.functions_per_file,
+            "depth": self.depth,
+            "padding_lines": self.padding_lines,
+            "language_mix": self.language_mix
+        }
+
+    def generate(self, root: str) -> str:
+        """Write the synthetic repository under root and return its path."""
+        rng = random.Random(self.seed)
+        repo_path = os.path.join(root, "synthetic_repo")
+        os.makedirs(repo_path, exist_ok=True)
+
+        with open(os.path.join(repo_path, "README.md"), "w", encoding="utf-8") as f:
+            f.write("# Synthetic Repository\n\nGenerated for benchmarking Codebase Genius phases.\n")
+
+        extensions = list(self.language_mix)
+        weights = [self.language_mix[ext] for ext in extensions]
+        modules = []
+
+        for index in range(self.files):
+            parts = [f"pkg{rng.randrange(4)}" for _ in range(rng.randint(0, self.depth))]
+            directory = os.path.join(repo_path, *parts)
+            os.makedirs(directory, exist_ok=True)
+
+            extension = rng.choices(extensions, weights)[0]
+            name = f"module_{index}"
+            if extension == ".py":
+                content = self._python_module(rng, index, modules)
+                modules.append(".".join(parts + [name]))
+            else:
+                content = self._jac_module(rng, index)
+
+            with open(os.path.join(directory, name + extension), "w", encoding="utf-8") as f:
+                f.write(content)
+
+        return repo_path
+
+    def _python_module(self, rng: random.Random, index: int, modules: List[str]) -> str:
+        lines = ['"""Synthetic module {}."""'.format(index), "", "import os", "import json"]
+        for module in rng.sample(modules, min(2, len(modules))):
+            lines.append(f"from {module} import func_0")
+        lines.append("")
+
+        for func_index in range(self.functions_per_file):
+            lines.extend(self._python_function(rng, f"func_{func_index}", "", func_index))
+
+        lines.append(f"class Model{index}(object):")
+        lines.append(f'    """Synthetic class {index}."""')
+        for method_index in range(max(1, self.functions_per_file // 3)):
+            lines.extend(self._python_function(rng, f"method_{method_index}", "    ", method_index, is_method=True))
+
+        lines.extend(f"# padding line {i}" for i in range(self.padding_lines))
+        return "\n".join(lines) + "\n"
+
+    def _python_function(self, rng: random.Random, name: str, indent: str, index: int,
+                         is_method: bool = False) -> List[str]:
+        params = ["self"] if is_method else []
+        params += [f"arg{i}" for i in range(rng.randint(0, 3))]
+        body = indent + "    "
+        lines = [
+            f"{indent}def {name}({', '.join(params)}):",
+            f'{body}"""Synthetic function {name}."""',
+            f"{body}total = 0",
+            f"{body}for i in range({rng.randint(1, 10)}):",
+            f"{body}    if i % 2 == 0 and total < 100:",
+            f"{body}        total += i",
+            f"{body}    else:",
+            f"{body}        total -= 1",
+        ]
+        if index > 0:
+            callee = f"self.method_{index - 1}" if is_method else f"func_{index - 1}"
+            lines.append(f"{body}{callee}()")
+        lines.append(f"{body}return total")
+        lines.append("")
+        return lines
+
+    def _jac_module(self, rng: random.Random, index: int) -> str:
+        lines = [f"# Synthetic Jac module {index}", "import:py os;", ""]
+        lines.append(f"node Item{index} {{")
+        lines.append("    has value: int = 0;")
+        lines.append("}")
+        lines.append("")
+        lines.append(f"walker Visitor{index} {{")
+        for func_index in range(self.functions_per_file):
+            lines.append(f"    can step_{func_index} with Item{index} entry {{")
+            lines.append(f"        here.value += {rng.randint(1, 9)};")
+            lines.append("    }")
+        lines.append("}")
+        lines.extend(f"# padding line {i}" for i in range(self.padding_lines))
+        return "\n".join(lines) + "\n"
+
+
+def load_walkers() -> Optional[Any]:
+    """Import main.jac through jaclang, or return None when Jac is unavailable."""
+    try:
+        from jaclang import jac_import
+        return jac_import("main", base_path=os.path.dirname(os.path.abspath(__file__)))
+    except Exception:
+        return None
+
+
+def collect_files(node: Dict[str, Any], extensions: tuple) -> List[Dict[str, Any]]:
+    """Collect file nodes with the given extensions in tree order."""
+    files = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if current["type"] == "file":
+            if current["extension"] in extensions:
+                files.append(current)
+        else:
+            stack.extend(reversed(current.get("children", [])))
+    return files
+
+
+def analyze_with_utils(repo_path: str, file_tree: Dict[str, Any]) -> Dict[str, Any]:
+    """Run the per-file analysis CodeAnalyzer delegates to, without the Jac runtime."""
+    config = utils.ConfigUtils.load_config()
+    nodes = collect_files(file_tree, (".py", ".jac"))
+    items = []
+    for node in nodes:
+        with open(os.path.join(repo_path, node["path"]), "r", encoding="utf-8") as f:
+            items.append((f.read(), node["extension"]))
+
+    results = utils.ParallelAnalyzer.from_config(config).analyze(items)
+    symbols = utils.SymbolIndex()
+    for node, result in zip(nodes, results):
+        symbols.add_file(os.path.join(repo_path, node["path"]), node["path"], result)
+    return {"files": len(results), "symbols": len(symbols.definitions)}
+
+
+def run_extractors(repo_path: str, file_tree: Dict[str, Any]) -> int:
+    """Run the TextProcessor extractors over every Python file."""
+    count = 0
+    for node in collect_files(file_tree, (".py",)):
+        with open(os.path.join(repo_path, node["path"]), "r", encoding="utf-8") as f:
+            content = f.read()
+        line_index = utils.LineIndex(content)
+        count += len(utils.TextProcessor.extract_functions_python(content, line_index))
+        count += len(utils.TextProcessor.extract_classes_python(content, line_index))
+        count += len(utils.TextProcessor.extract_imports_python(content))
+    return count
+
+
+def measure_analysis_memory(repo_path: str, file_tree: Dict[str, Any]) -> Dict[str, Any]:
+    """Compare memory held by plain analysis dicts and by the CompactSymbolStore.
+
+    The compact store spools docstrings to a temporary file, so the bytes spooled are
+    reported next to its memory and included in `ratio_with_spool`.
+    """
+    nodes = collect_files(file_tree, (".py", ".jac"))
+    files = []
+    for node in nodes:
+        with open(os.path.join(repo_path, node["path"]), "r", encoding="utf-8") as f:
+            result = utils.FileAnalyzer.analyze_content(f.read(), node["extension"])
+        files.append((os.path.join(repo_path, node["path"]), node["path"], result))
+
+    def build_dicts() -> Dict[str, Any]:
+        symbols = utils.SymbolIndex()
+        functions = {}
+        for file_path, relative_path, result in files:
+            for name, kind, record in symbols.add_file(file_path, relative_path, result):
+                if kind == "function":
+                    functions[name] = {
+                        "name": record["name"],
+                        "file": str(file_path),
+                        "calls": list(record.get("calls", [])),
+                        "called_by": [],
+                        "parameters": list(record["parameters"]),
+                        "docstring": record["docstring"],
+                        "line_start": record.get("line_start"),
+                        "complexity": record.get("complexity")
+                    }
+        return functions
+
+    def build_compact() -> Any:
+        symbols = utils.SymbolIndex()
+        store = utils.CompactSymbolStore()
+        for file_path, relative_path, result in files:
+            for name, kind, record in symbols.add_file(file_path, relative_path, result):
+                if kind == "function":
+                    store.add_function(name, file_path, record)
+        return store
+
+    sizes = {}
+    tracemalloc.start()
+    built = build_dicts()
+    sizes["dict_bytes"] = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del built
+
+    tracemalloc.start()
+    store = build_compact()
+    sizes["compact_bytes"] = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    sizes["compact_spool_bytes"] = store.docstrings.size
+    store.close()
+
+    total = sizes["dict_bytes"]
+    sizes["ratio"] = round(sizes["compact_bytes"] / total, 3) if total else None
+    sizes["ratio_with_spool"] = round((sizes["compact_bytes"] + sizes["compact_spool_bytes"]) / total, 3) if total else None
+    return sizes
+
+
+def time_phase(func: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """Time a phase over several runs, reporting the median and every run."""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    return {"seconds": statistics.median(runs), "runs": runs}
+
+
+@contextmanager
+def analysis_cache_disabled():
+    """Turn off the per-file analysis cache so repeats time parsing, not cache lookups."""
+    settings = utils.ConfigUtils.load_config().setdefault("cache", {})
+    previous = settings.get("enabled", True)
+    settings["enabled"] = False
+    try:
+        yield
+    finally:
+        settings["enabled"] = previous
+
+
+def run_benchmarks(generator: SyntheticRepoGenerator, repeat: int) -> Dict[str, Any]:
+    """Generate the synthetic repository and time each phase."""
+    workdir = tempfile.mkdtemp(prefix="codebase_genius_bench_")
+    phases = {}
+    engine = None
+    try:
+        with analysis_cache_disabled():
+            repo_path = generator.generate(workdir)
+            file_tree = utils.FileTreeBuilder.build(repo_path)
+            walkers = load_walkers()
+            # Jac walkers and the utils-only fallback time different code; results are only comparable per engine
+            engine = "jac" if walkers else "utils"
+
+            phases["build_file_tree"] = time_phase(lambda: utils.FileTreeBuilder.build(repo_path), repeat)
+
+            if walkers:
+                analyze = lambda: walkers.CodeAnalyzer().analyze_codebase(repo_path, file_tree)
+                phases["analyze_codebase"] = time_phase(analyze, repeat)
+            else:
+                phases["analyze_codebase"] = time_phase(lambda: analyze_with_utils(repo_path, file_tree), repeat)
+            phases["analyze_codebase"]["engine"] = engine
+
+            phases["text_extractors"] = time_phase(lambda: run_extractors(repo_path, file_tree), repeat)
+            phases["project_metrics"] = time_phase(lambda: utils.CodeMetrics.calculate_project_metrics(repo_path), repeat)
+
+            if walkers:
+                analysis = walkers.CodeAnalyzer().analyze_codebase(repo_path, file_tree)
+                repo = walkers.Repo(url="", name="synthetic_repo", path=repo_path, readme_summary="", file_tree=file_tree)
+                docs_path = os.path.join(workdir, "README.md")
+                render = lambda: walkers.DocGenie().write_documentation(repo, analysis, file_tree, "", docs_path)
+                phases["generate_documentation"] = time_phase(render, repeat)
+            else:
+                phases["generate_documentation"] = {"skipped": "jaclang is not installed"}
+            memory = measure_analysis_memory(repo_path, file_tree)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "generated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "analyzer_version": utils.ANALYZER_VERSION,
+        "engine": engine,
+        "repeat": repeat,
+        "repository": generator.settings(),
+        "phases": phases,
+        "analysis_memory": memory
+    }
+
+
+def result_engine(results: Dict[str, Any]) -> Optional[str]:
+    """Analysis engine a results file was measured with; older files only record it per phase."""
+    return results.get("engine") or results.get("phases", {}).get("analyze_codebase", {}).get("engine")
+
+
+def compare_to_baseline(results: Dict[str, Any], baseline: Dict[str, Any], max_slowdown: float) -> List[str]:
+    """Return a message for every phase slower than baseline by more than max_slowdown.
+
+    Raises ValueError when the two runs used different analysis engines.
+    """
+    if result_engine(results) != result_engine(baseline):
+        raise ValueError(f"engine mismatch: this run used {result_engine(results)!r}, "
+                         f"the baseline {result_engine(baseline)!r}")
+
+    regressions = []
+    for name, phase in results["phases"].items():
+        base = baseline.get("phases", {}).get(name, {})
+        if "seconds" not in phase or not base.get("seconds"):
+            continue
+        ratio = phase["seconds"] / base["seconds"]
+        if ratio > max_slowdown:
+            regressions.append(f"{name}: {phase['seconds']:.3f}s vs {base['seconds']:.3f}s ({ratio:.2f}x)")
+    return regressions
+
+
+def main():
+    """Main benchmark function."""
+    parser = argparse.ArgumentParser(description="Benchmark Codebase Genius pipeline phases")
+    parser.add_argument("--files", type=int, default=200, help="number of source files")
+    parser.add_argument("--functions", type=int, default=10, help="functions per file")
+    parser.add_argument("--depth", type=int, default=3, help="maximum directory nesting depth")
+    parser.add_argument("--padding", type=int, default=0, help="extra comment lines per file")
+    parser.add_argument("--jac-ratio", type=float, default=0.2, help="fraction of .jac files")
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per phase")
+    parser.add_argument("--output", default="benchmark_results.json", help="results JSON path")
+    parser.add_argument("--baseline", help="baseline results JSON to compare against")
+    parser.add_argument("--max-slowdown", type=float, default=1.25,
+                        help="fail when a phase is slower than baseline by this factor")
+    args = parser.parse_args()
+
+    generator = SyntheticRepoGenerator(
+        seed=args.seed,
+        files=args.files,
+        functions_per_file=args.functions,
+        depth=args.depth,
+        padding_lines=args.padding,
+        language_mix={".py": 1 - args.jac_ratio, ".jac": args.jac_ratio}
+    )
+
+    print(f"Benchmarking with {args.files} files x {args.functions} functions (seed {args.seed})")
+    results = run_benchmarks(generator, args.repeat)
+    print(f"  engine: {results['engine']}")
+
+    for name, phase in results["phases"].items():
+        if "seconds" in phase:
+            print(f"  {name:<24} {phase['seconds']:.4f}s")
+        else:
+            print(f"  {name:<24} skipped ({phase['skipped']})")
+
+    memory = results["analysis_memory"]
+    print(f"  analysis memory: {memory['dict_bytes']} bytes as dicts, "
+          f"{memory['compact_bytes']} bytes compact + {memory['compact_spool_bytes']} bytes of spooled docstrings "
+          f"(ratio {memory['ratio']} in memory, {memory['ratio_with_spool']} with the spool)")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        try:
+            regressions = compare_to_baseline(results, baseline, args.max_slowdown)
+        except ValueError as e:
+            print(f"❌ Cannot compare against {args.baseline}: {e}")
+            sys.exit(1)
+        if regressions:
+            print(f"❌ Slower than baseline by more than {args.max_slowdown}x:")
+            for message in regressions:
+                print(f"   - {message}")
+            sys.exit(1)
+        print("✅ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
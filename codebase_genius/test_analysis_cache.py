@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the content-hash keyed analysis cache.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import unittest
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import utils
+
+
+class AnalysisCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="codebase_genius_test_")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_round_trip(self):
+        cache = utils.AnalysisCache(self.directory)
+        key = utils.AnalysisCache.make_key("def f(): pass\n", ".py")
+        self.assertIsNone(cache.get(key))
+        cache.put(key, {"functions": [{"name": "f"}]})
+        self.assertEqual(cache.get(key), {"functions": [{"name": "f"}]})
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_key_depends_on_content_and_extension(self):
+        key = utils.AnalysisCache.make_key("x = 1\n", ".py")
+        self.assertEqual(key, utils.AnalysisCache.make_key("x = 1\n", ".py"))
+        self.assertNotEqual(key, utils.AnalysisCache.make_key("x = 2\n", ".py"))
+        self.assertNotEqual(key, utils.AnalysisCache.make_key("x = 1\n", ".jac"))
+
+    def test_eviction_stays_under_the_size_limit(self):
+        cache = utils.AnalysisCache(self.directory, max_size=2000)
+        for index in range(50):
+            cache.put(utils.AnalysisCache.make_key(str(index), ".py"), {"padding": "x" * 100})
+
+        total = sum(os.path.getsize(os.path.join(root, name))
+                    for root, _, names in os.walk(self.directory) for name in names)
+        self.assertLessEqual(total, 2000)
+
+    def test_disabled_cache_stores_nothing(self):
+        cache = utils.AnalysisCache(self.directory, enabled=False)
+        key = utils.AnalysisCache.make_key("x", ".py")
+        cache.put(key, {"functions": []})
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def size_on_disk(self):
+        return sum(os.path.getsize(os.path.join(root, name))
+                   for root, _, names in os.walk(self.directory) for name in names)
+
+    def test_size_is_counted_in_bytes(self):
+        cache = utils.AnalysisCache(self.directory)
+        cache.put(utils.AnalysisCache.make_key("a", ".py"), {"docstring": "é" * 100})
+        cache.put(utils.AnalysisCache.make_key("b", ".py"), {"docstring": "日本" * 100})
+        self.assertEqual(cache._size, self.size_on_disk())
+
+    def test_overwriting_a_key_replaces_its_size(self):
+        cache = utils.AnalysisCache(self.directory)
+        key = utils.AnalysisCache.make_key("a", ".py")
+        cache.put(utils.AnalysisCache.make_key("b", ".py"), {"functions": []})
+        for _ in range(5):
+            cache.put(key, {"padding": "x" * 100})
+        cache.put(key, {"padding": "x" * 10})
+        self.assertEqual(cache._size, self.size_on_disk())
+
+    def test_concurrent_writers_of_one_key(self):
+        cache = utils.AnalysisCache(self.directory)
+        key = utils.AnalysisCache.make_key("shared", ".py")
+        threads = [threading.Thread(target=lambda value=value: [cache.put(key, {"value": value}) for _ in range(50)])
+                   for value in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertIn(cache.get(key)["value"], range(8))
+        self.assertEqual([name for _, _, names in os.walk(self.directory) for name in names if name.endswith(".tmp")], [])
+        self.assertEqual(cache._size, self.size_on_disk())
+
+
+if __name__ == "__main__":
+    unittest.main()
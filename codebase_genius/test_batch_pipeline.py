@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the two-stage batch pipeline: ordering, failures and the in-flight bound.
+"""
+
+import os
+import sys
+import time
+import threading
+import unittest
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import utils
+
+
+class BatchPipelineTest(unittest.TestCase):
+    def test_reports_keep_input_order(self):
+        sources = [f"repo{index}" for index in range(10)]
+
+        def fetch(source):
+            # Later sources finish fetching first
+            time.sleep(0.002 * (10 - int(source[4:])))
+            return source.upper()
+
+        reports = utils.BatchPipeline(io_workers=4, cpu_workers=2).run(
+            sources, fetch, lambda source, fetched: f"{fetched} done")
+        self.assertEqual([report["source"] for report in reports], sources)
+        self.assertEqual([report["result"] for report in reports], [f"REPO{index} done" for index in range(10)])
+        self.assertTrue(all(report["status"] == "success" for report in reports))
+
+    def test_mixed_good_and_bad_entries(self):
+        def fetch(source):
+            if source == "missing":
+                raise RuntimeError("Error: Failed to clone repository")
+            return source
+
+        def process(source, fetched):
+            if source == "broken":
+                raise ValueError("analysis failed")
+            return f"documented {fetched}"
+
+        reports = utils.BatchPipeline(io_workers=2, cpu_workers=2).run(
+            ["good", "missing", "broken", "also-good"], fetch, process)
+        by_source = {report["source"]: report for report in reports}
+
+        self.assertEqual(by_source["good"]["status"], "success")
+        self.assertEqual(by_source["also-good"]["result"], "documented also-good")
+        self.assertEqual(by_source["missing"]["status"], "failed")
+        self.assertEqual(by_source["missing"]["error"], "Error: Failed to clone repository")
+        self.assertNotIn("process", by_source["missing"]["timings"])
+        self.assertEqual(by_source["broken"]["status"], "failed")
+        self.assertEqual(by_source["broken"]["error"], "analysis failed")
+        self.assertIsNone(by_source["broken"]["result"])
+
+    def test_timings(self):
+        reports = utils.BatchPipeline(io_workers=1, cpu_workers=1).run(["a"], lambda source: source,
+                                                                        lambda source, fetched: fetched)
+        timings = reports[0]["timings"]
+        self.assertEqual(set(timings), {"fetch", "wait", "process", "total"})
+        self.assertAlmostEqual(timings["total"], timings["fetch"] + timings["wait"] + timings["process"], places=3)
+
+    def test_fetched_but_unprocessed_repositories_are_bounded(self):
+        lock = threading.Lock()
+        state = {"in_flight": 0, "peak": 0}
+
+        def fetch(source):
+            with lock:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+            return source
+
+        def process(source, fetched):
+            # Analysis is much slower than cloning here
+            time.sleep(0.01)
+            with lock:
+                state["in_flight"] -= 1
+            return fetched
+
+        reports = utils.BatchPipeline(io_workers=4, cpu_workers=1, max_in_flight=3).run(
+            [f"repo{index}" for index in range(12)], fetch, process)
+        self.assertTrue(all(report["status"] == "success" for report in reports))
+        self.assertLessEqual(state["peak"], 3)
+
+    def test_fetches_overlap_processing(self):
+        processing = threading.Event()
+        fetched_while_processing = []
+
+        def fetch(source):
+            fetched_while_processing.append(processing.is_set())
+            return source
+
+        def process(source, fetched):
+            processing.set()
+            time.sleep(0.05)
+            return fetched
+
+        utils.BatchPipeline(io_workers=1, cpu_workers=1, max_in_flight=2).run(["a", "b", "c"], fetch, process)
+        self.assertTrue(any(fetched_while_processing[1:]))
+
+    def test_from_config(self):
+        pipeline = utils.BatchPipeline.from_config({"batch": {"io_workers": 3, "cpu_workers": 2}})
+        self.assertEqual((pipeline.io_workers, pipeline.cpu_workers, pipeline.max_in_flight), (3, 2, 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
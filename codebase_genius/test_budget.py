@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Unit tests for run budgets: size caps, time limits, truncated walks and bounded analysis.
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+import multiprocessing
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import utils
+
+
+class RunBudgetTest(unittest.TestCase):
+    def test_repo_size_cap_truncates(self):
+        budget = utils.RunBudget(max_repo_size=100)
+        self.assertTrue(budget.charge(60))
+        self.assertFalse(budget.charge(60))
+        self.assertEqual(budget.truncated, "max_repo_size")
+        self.assertTrue(budget.exceeded())
+
+    def test_first_truncation_reason_is_kept(self):
+        budget = utils.RunBudget()
+        budget.truncate("analysis_timeout")
+        budget.truncate("max_repo_size")
+        self.assertEqual(budget.truncated, "analysis_timeout")
+
+    def test_check_file(self):
+        budget = utils.RunBudget(max_analysis_size=10000, max_line_length=100)
+        self.assertIsNone(budget.check_file("x = 1\n" * 100))
+        self.assertEqual(budget.check_file("x" * 10001), "too_large")
+        self.assertEqual(budget.check_file("var a=1;" * 1000), "minified")
+
+    def test_phase_deadline(self):
+        budget = utils.RunBudget(timeout=300, phase_timeout=0.05)
+        budget.begin_phase("analysis")
+        self.assertFalse(budget.expired())
+        time.sleep(0.06)
+        self.assertTrue(budget.expired())
+        self.assertEqual(budget.expire_reason(), "analysis_timeout")
+
+        budget.begin_phase("documentation")
+        self.assertFalse(budget.expired())
+
+    def test_run_deadline(self):
+        budget = utils.RunBudget(timeout=0.01)
+        time.sleep(0.02)
+        self.assertTrue(budget.expired())
+        self.assertEqual(budget.expire_reason(), "repo_timeout")
+
+    def test_skipped_files_are_recorded(self):
+        budget = utils.RunBudget()
+        for index in range(utils.RunBudget.MAX_RECORDED + 5):
+            budget.skip(f"f{index}.py", "minified")
+        data = budget.to_dict()
+        self.assertEqual(data["skipped_total"], utils.RunBudget.MAX_RECORDED + 5)
+        self.assertEqual(len(data["skipped"]), utils.RunBudget.MAX_RECORDED)
+        self.assertTrue(budget.exceeded())
+
+    def test_untouched_budget_is_not_exceeded(self):
+        self.assertFalse(utils.RunBudget().exceeded())
+
+
+class TruncatedWalkTest(unittest.TestCase):
+    def setUp(self):
+        self.repo = tempfile.mkdtemp(prefix="codebase_genius_test_")
+        for index in range(20):
+            directory = os.path.join(self.repo, f"pkg{index:02d}")
+            os.makedirs(directory)
+            with open(os.path.join(directory, "mod.py"), "w") as f:
+                f.write("x = 1\n" * 50)
+
+    def tearDown(self):
+        shutil.rmtree(self.repo, ignore_errors=True)
+
+    def files(self, tree):
+        if tree["type"] == "file":
+            return 1
+        return sum(self.files(child) for child in tree.get("children", []))
+
+    def test_walk_stops_at_the_size_cap(self):
+        budget = utils.RunBudget(max_repo_size=1000)
+        tree = utils.FileTreeBuilder.build(self.repo, budget=budget)
+        self.assertEqual(budget.truncated, "max_repo_size")
+        self.assertLess(self.files(tree), 20)
+
+    def test_walk_stops_when_out_of_time(self):
+        budget = utils.RunBudget(timeout=300, phase_timeout=0.001)
+        budget.begin_phase("mapping")
+        time.sleep(0.01)
+        tree = utils.FileTreeBuilder.build(self.repo, budget=budget)
+        self.assertEqual(budget.truncated, "mapping_timeout")
+        self.assertEqual(self.files(tree), 0)
+
+    def test_unbounded_walk_sees_everything(self):
+        self.assertEqual(self.files(utils.FileTreeBuilder.build(self.repo, budget=utils.RunBudget())), 20)
+
+
+# Large enough that parsing it takes well over the deadlines used below
+SLOW_SOURCE = "".join(f"def f{index}(a):\n    if a:\n        return g(a)\n" for index in range(200000))
+
+
+class BoundedAnalysisTest(unittest.TestCase):
+    def test_file_timeout(self):
+        # The Jac lexer runs in Python, so the alarm interrupts it mid-file
+        source = "walker W {\n" + "    can run with entry { if x { f(y); } }\n" * 200000 + "}\n"
+        start = time.time()
+        result = utils.FileAnalyzer.analyze_bounded(source, ".jac", timeout=0.05)
+        self.assertLess(time.time() - start, 2)
+        self.assertEqual(result, {"skipped": "file_timeout"})
+
+    def test_fast_files_are_analyzed(self):
+        result = utils.FileAnalyzer.analyze_bounded("def f():\n    pass\n", ".py", timeout=5)
+        self.assertEqual([func["name"] for func in result["functions"]], ["f"])
+
+    def test_deadline_off_the_main_thread_kills_workers(self):
+        outcome = {}
+
+        def run():
+            analyzer = utils.ParallelAnalyzer(workers=2)
+            start = time.time()
+            outcome["results"] = analyzer.analyze([(SLOW_SOURCE, ".py")] * 2, file_timeout=60,
+                                                  deadline=time.time() + 0.5)
+            outcome["seconds"] = time.time() - start
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join(timeout=60)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(outcome["results"], [None, None])
+        self.assertLess(outcome["seconds"], 10)
+        self.assertEqual(multiprocessing.active_children(), [])
+
+    def test_serial_path_kills_files_stuck_in_c_code(self):
+        # ast.parse never returns to the interpreter, so only killing the worker stops it
+        start = time.time()
+        results = utils.ParallelAnalyzer(workers=2).analyze(
+            [(SLOW_SOURCE, ".py"), ("def f():\n    pass\n", ".py")], file_timeout=0.2)
+        self.assertLess(time.time() - start, 10)
+        self.assertEqual(results[0], {"skipped": "file_timeout"})
+        self.assertEqual([func["name"] for func in results[1]["functions"]], ["f"])
+        self.assertEqual(multiprocessing.active_children(), [])
+
+    def test_parallel_results_keep_input_order(self):
+        items = [(f"def f{index}():\n    pass\n", ".py") for index in range(40)]
+        results = utils.ParallelAnalyzer(workers=2, min_files=2).analyze(items)
+        self.assertEqual([result["functions"][0]["name"] for result in results], [f"f{index}" for index in range(40)])
+
+    def test_mp_context_never_forks(self):
+        self.assertIn(utils.ParallelAnalyzer.mp_context().get_start_method(), ("forkserver", "spawn"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Unit tests for line counting: per-language comment syntax, strings and streaming input.
+"""
+
+import io
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import utils
+
+SYNTAX = utils.CodeMetrics.DEFAULT_COMMENT_SYNTAX
+
+
+def count(source, extension):
+    counts = utils.CodeMetrics.count_lines(io.StringIO(source), SYNTAX.get(extension, utils.CodeMetrics.NO_COMMENTS))
+    return counts["code_lines"], counts["comment_lines"], counts["blank_lines"]
+
+
+class CountLinesTest(unittest.TestCase):
+    def test_python(self):
+        source = "# header\n\nx = 1  # trailing\n\n# more\ndef f():\n    return x\n"
+        self.assertEqual(count(source, ".py"), (3, 2, 2))
+
+    def test_code_after_a_block_comment_is_code(self):
+        self.assertEqual(count("/* x */ code();\n", ".js"), (1, 0, 0))
+        self.assertEqual(count("/* a */ /* b */\n", ".js"), (0, 1, 0))
+        self.assertEqual(count("/* start\n   end */ run();\n", ".c"), (1, 1, 0))
+
+    def test_multi_line_block_comments(self):
+        source = "/*\n * doc\n\n */\nint x;\n"
+        self.assertEqual(count(source, ".c"), (1, 4, 0))
+
+    def test_comment_markers_in_strings_are_ignored(self):
+        self.assertEqual(count('s = "/* not a comment";\nt = 1;\n', ".js"), (2, 0, 0))
+        self.assertEqual(count("url = 'http://example.com'\n", ".ts"), (1, 0, 0))
+        self.assertEqual(count('x = "# not a comment"\n', ".py"), (1, 0, 0))
+        self.assertEqual(count('s = "say \\"/*\\"";\nt = 1;\n', ".java"), (2, 0, 0))
+
+    def test_multi_line_strings(self):
+        source = 'doc = """\n# not a comment\n\n"""\n# comment\n'
+        self.assertEqual(count(source, ".py"), (3, 1, 1))
+        self.assertEqual(count("const t = `\n// inside\n`;\n", ".js"), (3, 0, 0))
+
+    def test_jac_block_and_line_comments(self):
+        source = "#* block\n   still *#\n#* one *# x = 1;\n# line\nwalker W {}\n"
+        self.assertEqual(count(source, ".jac"), (2, 3, 0))
+
+    def test_markup_quotes_are_prose(self):
+        self.assertEqual(count("<!-- note -->\nIt's <!-- aside -->\n", ".md"), (1, 1, 0))
+
+    def test_unknown_extensions_have_no_comments(self):
+        self.assertEqual(count("# title\ntext\n", ".txt"), (2, 0, 0))
+
+    def test_configured_comment_syntax(self):
+        config = {"agents": {"code_analyzer": {"languages": [
+            {"name": "Lua", "extensions": [".lua"], "line_comment": "--", "block_comment": ["--[[", "]]"]},
+        ]}}}
+        syntax = utils.CodeMetrics.comment_syntax(config)[".lua"]
+        counts = utils.CodeMetrics.count_lines(io.StringIO("--[[ block\n]]\n-- line\nx = 1\n"), syntax)
+        self.assertEqual((counts["code_lines"], counts["comment_lines"]), (1, 3))
+
+    def test_decisions_are_counted_in_code_only(self):
+        source = 'if a and b:\n    s = "if or while"  # if x\n'
+        counts = utils.CodeMetrics.count_lines(io.StringIO(source), SYNTAX[".py"])
+        self.assertEqual(counts["decision_points"], 2)
+
+    def test_streaming_a_file_matches_in_memory_counts(self):
+        source = "/* a */ x();\n// b\n\nint y = 0; /* c\n d */\n" * 500
+        directory = tempfile.mkdtemp(prefix="codebase_genius_test_")
+        try:
+            path = os.path.join(directory, "big.c")
+            with open(path, "w") as f:
+                f.write(source)
+            streamed = utils.CodeMetrics.calculate_file_metrics(path, syntax=SYNTAX[".c"])
+
+            store = utils.FileContentStore()
+            try:
+                stored = utils.CodeMetrics.calculate_file_metrics(path, content_store=store, syntax=SYNTAX[".c"])
+            finally:
+                store.close()
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+        self.assertEqual(streamed, stored)
+        self.assertEqual((streamed["total_lines"], streamed["code_lines"], streamed["comment_lines"],
+                          streamed["blank_lines"]), (2500, 1000, 1000, 500))
+        self.assertEqual(streamed["comment_ratio"], 0.4)
+
+
+if __name__ == "__main__":
+    unittest.main()
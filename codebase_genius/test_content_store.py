@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the per-run file content store.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import utils
+
+
+class FileContentStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="codebase_genius_test_")
+        self.store = utils.FileContentStore(mmap_threshold=10000, max_file_size=1024 * 1024, max_cached_bytes=1000)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def write(self, name, data):
+        path = os.path.join(self.directory, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_reads_each_file_once(self):
+        path = self.write("a.py", b"x = 1\n")
+        self.assertEqual(self.store.get_text(path), "x = 1\n")
+        self.assertEqual(self.store.get_text(path), "x = 1\n")
+        self.assertEqual(self.store.files_read, 1)
+
+    def test_eviction_keeps_mapped_views_valid(self):
+        big = self.write("big.py", b"x = 1\n" * 5000)
+        view = self.store.get_bytes(big)
+        self.assertIsInstance(view, memoryview)
+        self.store.get_text(big)
+
+        # Push the small-file cache far over its budget
+        for index in range(20):
+            self.store.get_text(self.write(f"s{index}.py", b"y = 2\n" * 100))
+
+        self.assertLessEqual(self.store._cached_bytes, self.store.max_cached_bytes)
+        self.assertEqual(bytes(view[:5]), b"x = 1")
+        self.assertIs(self.store.get_bytes(big), view)
+
+    def test_close_releases_mappings(self):
+        view = self.store.get_bytes(self.write("big.py", b"x = 1\n" * 5000))
+        self.store.close()
+        with self.assertRaises(ValueError):
+            bytes(view[:1])
+
+    def test_binary_is_sniffed_from_the_first_block(self):
+        path = self.write("blob.py", b"\0" * 100000)
+        self.assertIsNone(self.store.get_bytes(path))
+        self.assertEqual(self.store.skipped[path], "binary")
+        self.assertEqual(self.store.bytes_read, utils.FileContentStore.SNIFF_BYTES)
+
+    def test_oversized_and_missing_files_are_skipped(self):
+        path = self.write("huge.py", b"x" * (1024 * 1024 + 1))
+        self.assertIsNone(self.store.get_text(path))
+        self.assertTrue(self.store.skipped[path].startswith("too large"))
+
+        missing = os.path.join(self.directory, "missing.py")
+        self.assertIsNone(self.store.get_text(missing))
+        self.assertTrue(self.store.skipped[missing].startswith("unreadable"))
+
+    def test_non_utf8_text(self):
+        path = self.write("latin.py", "s = 'café'\n".encode("latin-1"))
+        self.assertIsNone(self.store.get_text(path))
+        self.assertIn("caf", self.store.get_text(path, errors="replace"))
+
+    def test_mapped_text_is_decoded_once(self):
+        path = self.write("big.py", b"x = 1\n" * 5000)
+        text = self.store.get_text(path)
+        self.assertIs(self.store.get_text(path), text)
+
+        latin = self.write("big_latin.py", "s = 'café'\n".encode("latin-1") * 2000)
+        replaced = self.store.get_text(latin, errors="replace")
+        self.assertIs(self.store.get_text(latin, errors="replace"), replaced)
+        self.assertEqual(self.store.files_read, 2)
+
+    def test_bytes_stay_exact_after_a_lossy_decode(self):
+        raw = "s = 'café'\n".encode("latin-1")
+        path = self.write("latin.py", raw)
+        self.assertEqual(self.store.get_text(path, errors="ignore"), "s = 'caf'\n")
+        self.assertEqual(self.store.get_bytes(path), raw)
+        self.assertEqual(self.store.files_read, 1)
+
+    def test_clean_text_serves_every_errors_mode(self):
+        path = self.write("a.py", b"x = 1\n")
+        text = self.store.get_text(path)
+        self.assertIs(self.store.get_text(path, errors="replace"), text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the git mirror cache, run offline against a local file:// remote.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import subprocess
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import utils
+
+
+def git(*args, cwd=None):
+    env = dict(os.environ, GIT_AUTHOR_NAME="test", GIT_AUTHOR_EMAIL="test@example.com",
+               GIT_COMMITTER_NAME="test", GIT_COMMITTER_EMAIL="test@example.com")
+    return subprocess.run(["git"] + list(args), cwd=cwd, env=env, check=True,
+                          capture_output=True, text=True).stdout.strip()
+
+
+@unittest.skipUnless(shutil.which("git"), "git is not installed")
+class GitMirrorTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix="codebase_genius_test_")
+        self.remote = os.path.join(self.root, "remote.git")
+        self.work = os.path.join(self.root, "work")
+        git("init", "--bare", "-q", self.remote)
+        git("--git-dir", self.remote, "config", "uploadpack.allowFilter", "true")
+        git("init", "-q", self.work)
+        self.url = f"file://{self.remote}"
+        self.head = self.commit("main.py", "def main():\n    pass\n")
+        self.checkouts = []
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+        for path in self.checkouts:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def commit(self, name, content):
+        with open(os.path.join(self.work, name), "w") as f:
+            f.write(content)
+        git("add", name, cwd=self.work)
+        git("commit", "-q", "-m", f"add {name}", cwd=self.work)
+        git("push", "-q", self.remote, "HEAD:refs/heads/master", cwd=self.work)
+        git("--git-dir", self.remote, "symbolic-ref", "HEAD", "refs/heads/master")
+        return git("rev-parse", "HEAD", cwd=self.work)
+
+    def mirror(self, **options):
+        return utils.GitMirror(directory=os.path.join(self.root, "mirrors"), timeout=60, **options)
+
+    def checkout(self, mirror):
+        path = mirror.checkout(self.url, prefix="codebase_genius_test_checkout_")
+        self.assertIsNotNone(path)
+        self.checkouts.append(path)
+        return path
+
+    def test_checkout_through_the_mirror(self):
+        mirror = self.mirror()
+        path = self.checkout(mirror)
+        self.assertTrue(os.path.isfile(os.path.join(path, "main.py")))
+        self.assertTrue(os.path.isdir(mirror.mirror_path(self.url)))
+        self.assertEqual(git("rev-parse", "HEAD", cwd=path), self.head)
+
+    def test_second_checkout_fetches_new_commits(self):
+        mirror = self.mirror(depth=1)
+        first = self.checkout(mirror)
+        head = self.commit("extra.py", "x = 1\n")
+
+        second = self.checkout(mirror)
+        self.assertFalse(os.path.exists(os.path.join(first, "extra.py")))
+        self.assertTrue(os.path.isfile(os.path.join(second, "extra.py")))
+        self.assertEqual(git("rev-parse", "HEAD", cwd=second), head)
+
+    def test_shallow_and_blobless_checkouts(self):
+        self.commit("extra.py", "x = 1\n")
+        for options in ({"depth": 1}, {"blobless": True}, {"depth": 1, "blobless": True}):
+            with self.subTest(**options):
+                path = self.checkout(self.mirror(**options))
+                self.assertTrue(os.path.isfile(os.path.join(path, "extra.py")))
+                if options.get("depth"):
+                    self.assertEqual(git("rev-list", "--count", "HEAD", cwd=path), "1")
+                shutil.rmtree(os.path.join(self.root, "mirrors"))
+
+    def test_plain_clone_when_the_cache_is_disabled(self):
+        mirror = self.mirror(enabled=False)
+        path = self.checkout(mirror)
+        self.assertTrue(os.path.isfile(os.path.join(path, "main.py")))
+        self.assertFalse(os.path.exists(mirror.mirror_path(self.url)))
+
+    def test_resolve_head(self):
+        mirror = self.mirror()
+        self.assertEqual(mirror.resolve_head(self.url), self.head)
+        head = self.commit("extra.py", "x = 1\n")
+        self.assertEqual(mirror.resolve_head(self.url), head)
+        self.assertIsNone(mirror.resolve_head(f"file://{self.root}/missing.git"))
+
+    def test_release_removes_the_worktree(self):
+        mirror = self.mirror()
+        path = self.checkout(mirror)
+        mirror.release(path)
+        self.assertFalse(os.path.exists(path))
+        worktrees = git("--git-dir", mirror.mirror_path(self.url), "worktree", "list")
+        self.assertNotIn(path, worktrees)
+
+    def test_failed_clone_returns_none(self):
+        self.assertIsNone(self.mirror().checkout(f"file://{self.root}/missing.git"))
+
+
+class RepoUrlValidationTest(unittest.TestCase):
+    def test_file_urls_need_the_config_flag(self):
+        directory = tempfile.mkdtemp(prefix="codebase_genius_test_")
+        try:
+            url = f"file://{directory}"
+            self.assertFalse(utils.ValidationUtils.validate_repo_url(url, {"git": {}}))
+            self.assertTrue(utils.ValidationUtils.validate_repo_url(url, {"git": {"allow_file_urls": True}}))
+            self.assertFalse(utils.ValidationUtils.validate_repo_url(f"{url}/missing", {"git": {"allow_file_urls": True}}))
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def test_github_urls(self):
+        self.assertTrue(utils.ValidationUtils.validate_repo_url("https://github.com/user/repo", {}))
+        self.assertFalse(utils.ValidationUtils.validate_repo_url("https://example.com/user/repo", {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the SQLite code graph and its queries.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import utils
+
+REPO = "/repo"
+
+
+def analysis():
+    """A small analysis in the shape CodeAnalyzer produces."""
+    def function(name, file_path, owner=None, line=1, calls=()):
+        info = {"name": name, "file": f"{REPO}/{file_path}", "line_start": line,
+                "complexity": 1, "docstring": "", "calls": list(calls)}
+        if owner:
+            info["class"] = owner
+        return info
+
+    functions = {
+        "app.main": function("main", "app.py", calls=["svc.Service.run", "util.helper"]),
+        "svc.Service.run": function("run", "svc.py", "Service", line=5, calls=["util.helper"]),
+        "util.helper": function("helper", "util.py"),
+    }
+    classes = {
+        "svc.Base": {"name": "Base", "file": f"{REPO}/svc.py", "line_start": 1, "inherits_from": []},
+        "svc.Service": {"name": "Service", "file": f"{REPO}/svc.py", "line_start": 4, "inherits_from": ["svc.Base"]},
+        "app.Special": {"name": "Special", "file": f"{REPO}/app.py", "line_start": 9, "inherits_from": ["svc.Service"]},
+        "util.Loop": {"name": "Loop", "file": f"{REPO}/util.py", "line_start": 3, "inherits_from": ["util.Back"]},
+        "util.Back": {"name": "Back", "file": f"{REPO}/util.py", "line_start": 6, "inherits_from": ["util.Loop"]},
+    }
+    return {
+        "functions": functions,
+        "classes": classes,
+        "call_graph": {name: {"calls": info["calls"]} for name, info in functions.items()},
+        "inheritance_graph": {name: {"inherits_from": info["inherits_from"]} for name, info in classes.items()},
+        "dependencies": {
+            f"{REPO}/app.py": {"imports": [], "modules": ["svc.Service", "util"]},
+            f"{REPO}/svc.py": {"imports": [], "modules": ["util.helper"]},
+            f"{REPO}/util.py": {"imports": [], "modules": ["os.path"]},
+        },
+        "complexity": {f"{REPO}/app.py": {"total": 3}},
+        "import_graph": {"edges": {"app.py": ["svc.py", "util.py"], "svc.py": ["util.py"], "util.py": ["svc.py"]}},
+    }
+
+
+class CodeGraphStoreTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp(prefix="codebase_genius_test_")
+        cls.graph = utils.CodeGraphStore(os.path.join(cls.directory, "graph.sqlite"))
+        cls.graph.write(REPO, analysis(), {"repo": "example"})
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory, ignore_errors=True)
+
+    def test_meta(self):
+        meta = self.graph.meta()
+        self.assertEqual(meta["repo"], "example")
+        self.assertEqual(meta["analyzer_version"], utils.ANALYZER_VERSION)
+
+    def test_callers_by_qualified_or_short_name(self):
+        callers = [row["caller"] for row in self.graph.callers_of("util.helper")]
+        self.assertEqual(callers, ["app.main", "svc.Service.run"])
+        self.assertEqual([row["caller"] for row in self.graph.callers_of("run")], ["app.main"])
+        self.assertEqual(self.graph.callers_of("missing"), [])
+
+    def test_definitions_in_line_order(self):
+        rows = self.graph.definitions_in("./svc.py")
+        self.assertEqual([row["qname"] for row in rows], ["svc.Base", "svc.Service", "svc.Service.run"])
+        self.assertEqual(rows[2]["kind"], "method")
+
+    def test_subclasses_are_transitive(self):
+        rows = self.graph.subclasses_of("svc.Base")
+        self.assertEqual([(row["qname"], row["depth"]) for row in rows], [("svc.Service", 1), ("app.Special", 2)])
+
+    def test_subclasses_terminate_on_inheritance_cycles(self):
+        rows = self.graph.subclasses_of("util.Loop")
+        self.assertEqual([(row["qname"], row["depth"]) for row in rows], [("util.Back", 1), ("util.Loop", 2)])
+
+    def test_import_dependents_cover_dotted_children(self):
+        rows = self.graph.import_dependents("util")
+        self.assertEqual([(row["file"], row["target"]) for row in rows], [("app.py", "util"), ("svc.py", "util.helper")])
+        self.assertEqual(self.graph.import_dependents("uti"), [])
+
+    def test_affected_by_follows_import_cycles(self):
+        self.assertEqual([row["file"] for row in self.graph.affected_by("util.py")], ["app.py", "svc.py", "util.py"])
+        self.assertEqual([row["file"] for row in self.graph.affected_by("app.py")], ["app.py"])
+
+    def test_missing_graph(self):
+        graph = utils.CodeGraphStore(os.path.join(self.directory, "missing.sqlite"))
+        self.assertFalse(graph.exists())
+        with self.assertRaises(FileNotFoundError):
+            graph.meta()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the resolved file-level import graph.
+"""
+
+import os
+import sys
+import unittest
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import utils
+
+
+def resolve_sources(sources):
+    """Analyze {relative path: source} and return the resolved import graph."""
+    symbols = utils.SymbolIndex()
+    graph = utils.ImportGraph()
+    for relative_path, content in sources.items():
+        result = utils.FileAnalyzer.analyze_content(content, os.path.splitext(relative_path)[1])
+        file_path = os.path.join("/repo", relative_path)
+        symbols.add_file(file_path, relative_path, result)
+        graph.add_file(relative_path, symbols.imported_modules(file_path), result["imports"])
+    return graph.resolve()
+
+
+class ImportGraphTest(unittest.TestCase):
+    def graph(self, edges):
+        graph = utils.ImportGraph()
+        graph.edges = {path: sorted(deps) for path, deps in edges.items()}
+        graph._index_dependents()
+        return graph
+
+    def test_python_resolution(self):
+        graph = resolve_sources({
+            "src/pkg/__init__.py": "",
+            "src/pkg/a.py": "from .sub import helper\nimport pkg.b\nimport json\n",
+            "src/pkg/b.py": "from pkg import a\n",
+            "src/pkg/sub/helper.py": "from ..a import thing\n",
+        })
+        self.assertEqual(graph.edges["src/pkg/a.py"], ["src/pkg/b.py", "src/pkg/sub/helper.py"])
+        self.assertEqual(graph.edges["src/pkg/b.py"], ["src/pkg/a.py"])
+        self.assertEqual(graph.edges["src/pkg/sub/helper.py"], ["src/pkg/a.py"])
+
+    def test_sibling_script_imports_and_self_imports(self):
+        graph = resolve_sources({
+            "tool/utils.py": "import tool.utils\n",
+            "tool/run.py": "import utils\n",
+        })
+        self.assertEqual(graph.edges["tool/run.py"], ["tool/utils.py"])
+        self.assertEqual(graph.edges["tool/utils.py"], [])
+
+    def test_quoted_and_dotted_imports_of_other_languages(self):
+        graph = utils.ImportGraph()
+        graph.add_file("web/app.js", [], ['import x from "./util"', 'import r from "react"'])
+        graph.add_file("web/util.js", [], [])
+        graph.add_file("c/main.c", [], ['#include "c/x.h"', "#include <stdio.h>"])
+        graph.add_file("c/x.h", [], [])
+        graph.add_file("java/com/x/Foo.java", [], ["import com.x.Bar", "import java.util.List"])
+        graph.add_file("java/com/x/Bar.java", [], [])
+        graph.add_file("app/main.jac", [], ['py_module utils from "./utils"', "import:jac walkers"])
+        graph.add_file("app/utils.py", [], [])
+        graph.add_file("app/utils.jac", [], [])
+        graph.add_file("app/walkers.jac", [], [])
+        graph.resolve()
+
+        self.assertEqual(graph.edges["web/app.js"], ["web/util.js"])
+        self.assertEqual(graph.edges["c/main.c"], ["c/x.h"])
+        self.assertEqual(graph.edges["java/com/x/Foo.java"], ["java/com/x/Bar.java"])
+        self.assertEqual(graph.edges["app/main.jac"], ["app/utils.py", "app/walkers.jac"])
+
+    def test_cycles_are_strongly_connected_components(self):
+        graph = self.graph({
+            "a": ["b"], "b": ["c"], "c": ["a", "d"], "d": [],
+            "e": ["f"], "f": ["e"], "g": [],
+        })
+        components = graph.strongly_connected_components()
+        self.assertIn(["a", "b", "c"], components)
+        self.assertIn(["e", "f"], components)
+        self.assertEqual(sorted(len(component) for component in components), [1, 1, 2, 3])
+        # Dependencies come out before their importers
+        self.assertLess(components.index(["d"]), components.index(["a", "b", "c"]))
+        self.assertEqual(graph.to_dict()["cycles"], [["a", "b", "c"], ["e", "f"]])
+
+    def test_layers_of_the_condensation(self):
+        graph = self.graph({"app": ["svc", "util"], "svc": ["db", "util"], "db": ["util"], "util": [],
+                            "x": ["y"], "y": ["x", "db"]})
+        self.assertEqual(graph.layers(), [["util"], ["db"], ["svc", "x", "y"], ["app"]])
+
+    def test_deep_chains_do_not_recurse(self):
+        size = 50000
+        graph = self.graph({f"m{index}": [f"m{index + 1}"] if index + 1 < size else [] for index in range(size)})
+        self.assertEqual(len(graph.strongly_connected_components()), size)
+        self.assertEqual(len(graph.layers()), size)
+
+    def test_affected_by_follows_reverse_edges_through_cycles(self):
+        graph = self.graph({"app": ["svc"], "svc": ["db"], "db": ["svc"], "util": [], "cli": ["util"]})
+        self.assertEqual(graph.affected_by(["db"]), ["app", "db", "svc"])
+        self.assertEqual(graph.affected_by(["util"]), ["cli", "util"])
+        self.assertEqual(graph.affected_by(["app"]), ["app"])
+
+    def test_round_trip_through_plain_data(self):
+        graph = self.graph({"app": ["svc"], "svc": ["db"], "db": []})
+        data = graph.to_dict(changed=["db"])
+        self.assertEqual(data["affected"], ["app", "db", "svc"])
+        self.assertEqual(data["dependents"]["db"], ["svc"])
+
+        restored = utils.ImportGraph.from_dict(data)
+        self.assertEqual(restored.affected_by(["svc"]), ["app", "svc"])
+
+
+if __name__ == "__main__":
+    unittest.main()
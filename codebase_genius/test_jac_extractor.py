@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the single-pass Jac extractor.
+"""
+
+import os
+import sys
+import unittest
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import utils
+
+SAMPLE = '''import:py os;
+import:jac helpers;
+include:jac shared.defs;
+
+"""Module docstring."""
+
+node Animal {
+    has name: str;
+}
+
+walker Walk :Base, Other: {
+    """Walks around."""
+    can run with entry {
+        if x { helper(y).replace("a", "b"); }
+        elif z { self.step(); }
+        # can commented { }
+        print("can fake { }");
+    }
+
+    can step -> int { return 1; }
+}
+
+edge Knows {}
+
+obj Legacy(Base) {
+    def area(a: int, b: int) -> int { return a * b; }
+}
+
+can top_level(a: int, b: str) {
+    while a { a = a - 1; }
+}
+'''
+
+
+class JacExtractorTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.result = utils.JacExtractor.extract(SAMPLE)
+        cls.classes = {cls_info["name"]: cls_info for cls_info in cls.result["classes"]}
+        cls.functions = {func["name"]: func for func in cls.result["functions"]}
+
+    def test_archetypes_and_kinds(self):
+        self.assertEqual(sorted(self.classes), ["Animal", "Knows", "Legacy", "Walk"])
+        self.assertEqual(self.classes["Animal"]["kind"], "node")
+        self.assertEqual(self.classes["Walk"]["kind"], "walker")
+        self.assertEqual(self.classes["Knows"]["kind"], "edge")
+        self.assertEqual(self.classes["Walk"]["line_start"], 11)
+
+    def test_inheritance_in_both_syntaxes(self):
+        self.assertEqual(self.classes["Walk"]["inherits_from"], ["Base", "Other"])
+        self.assertEqual(self.classes["Legacy"]["inherits_from"], ["Base"])
+
+    def test_docstrings(self):
+        self.assertEqual(self.classes["Walk"]["docstring"], "Walks around.")
+
+    def test_comment_documents_only_the_first_declaration_on_a_line(self):
+        result = utils.JacExtractor.extract("# Walks the graph\nwalker W { can run with entry { f(); } }\n")
+        self.assertEqual(result["classes"][0]["docstring"], "Walks the graph")
+        self.assertEqual(result["functions"][0]["docstring"], "")
+
+    def test_abilities_are_attributed_to_their_archetype(self):
+        self.assertEqual(self.functions["run"]["class"], "Walk")
+        self.assertEqual(self.functions["area"]["class"], "Legacy")
+        self.assertNotIn("class", self.functions["top_level"])
+        self.assertEqual(self.classes["Walk"]["methods"], ["run", "step"])
+
+    def test_signatures_and_parameters(self):
+        self.assertEqual(self.functions["run"]["signature"], "with entry")
+        self.assertEqual(self.functions["step"]["signature"], "-> int")
+        self.assertEqual(self.functions["area"]["parameters"], ["a", "b"])
+        self.assertEqual(self.functions["top_level"]["parameters"], ["a", "b"])
+
+    def test_strings_and_comments_are_not_code(self):
+        self.assertNotIn("fake", self.functions)
+        self.assertNotIn("commented", self.functions)
+
+    def test_calls_and_complexity(self):
+        self.assertEqual(self.functions["run"]["calls"], ["helper", "self.step", "print"])
+        self.assertEqual(self.functions["run"]["complexity"], 3)
+        self.assertEqual(self.functions["top_level"]["complexity"], 2)
+        self.assertEqual(self.functions["step"]["complexity"], 1)
+
+    def test_imports(self):
+        self.assertEqual(self.result["imports"], ["import:py os", "import:jac helpers", "include:jac shared.defs"])
+
+    def test_unterminated_input_does_not_raise(self):
+        result = utils.JacExtractor.extract('walker W {\n    can run with entry {\n        print("open')
+        self.assertEqual([cls_info["name"] for cls_info in result["classes"]], ["W"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the background job queue: dedupe, phase reporting and bounds.
+"""
+
+import os
+import sys
+import time
+import threading
+import unittest
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import utils
+
+
+def wait_for(queue, job_id, status, timeout=5):
+    """Poll a job until it reaches a status."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        summary = queue.status(job_id)
+        if summary and summary["status"] == status:
+            return summary
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} never reached {status}: {queue.status(job_id)}")
+
+
+class JobQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.queue = utils.JobQueue(workers=2, max_pending=2, max_finished=3)
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+        self.queue._executor.shutdown(wait=True)
+
+    def blocked(self, value="done"):
+        """A job body that waits until the test releases it."""
+        def run(report_phase):
+            self.release.wait(5)
+            return value
+        return run
+
+    def test_same_key_reuses_the_in_flight_job(self):
+        first = self.queue.submit("repo@abc", self.blocked())
+        second = self.queue.submit("repo@abc", self.blocked())
+        self.assertEqual(first["job_id"], second["job_id"])
+
+        self.release.set()
+        wait_for(self.queue, first["job_id"], "completed")
+        third = self.queue.submit("repo@abc", lambda report_phase: "again")
+        self.assertNotEqual(third["job_id"], first["job_id"])
+
+    def test_phases_and_result(self):
+        reached = threading.Event()
+
+        def run(report_phase):
+            report_phase("cloning")
+            report_phase("analysis")
+            reached.set()
+            self.release.wait(5)
+            report_phase("documentation")
+            return {"path": "out/README.md"}
+
+        job = self.queue.submit("repo", run)
+        self.assertIn(job["status"], ("queued", "running"))
+        self.assertTrue(reached.wait(5))
+        running = self.queue.status(job["job_id"])
+        self.assertEqual((running["status"], running["phase"]), ("running", "analysis"))
+        self.assertIsNotNone(running["started_at"])
+
+        self.release.set()
+        done = wait_for(self.queue, job["job_id"], "completed")
+        self.assertEqual(done["phase"], "documentation")
+        self.assertEqual(self.queue.result(job["job_id"])["result"], {"path": "out/README.md"})
+
+    def test_failures_are_reported(self):
+        def run(report_phase):
+            raise ValueError("clone failed")
+
+        job = self.queue.submit("repo", run)
+        wait_for(self.queue, job["job_id"], "failed")
+        result = self.queue.result(job["job_id"])
+        self.assertEqual(result["error"], "clone failed")
+        self.assertIsNone(result["result"])
+
+    def test_full_queue_rejects_new_keys(self):
+        self.queue.submit("a", self.blocked())
+        self.queue.submit("b", self.blocked())
+        with self.assertRaises(RuntimeError):
+            self.queue.submit("c", self.blocked())
+        # A duplicate of an in-flight key is not a new job, so it is still accepted
+        self.assertEqual(self.queue.submit("a", self.blocked())["key"], "a")
+
+    def test_oldest_finished_jobs_are_forgotten(self):
+        ids = []
+        for index in range(5):
+            job = self.queue.submit(f"repo{index}", lambda report_phase: "ok")
+            wait_for(self.queue, job["job_id"], "completed")
+            ids.append(job["job_id"])
+        # Finished jobs are recorded after their status changes; let every worker wrap up
+        self.queue._executor.shutdown(wait=True)
+
+        self.assertIsNone(self.queue.status(ids[0]))
+        self.assertIsNone(self.queue.result(ids[1]))
+        for job_id in ids[2:]:
+            self.assertEqual(self.queue.status(job_id)["status"], "completed")
+
+    def test_unknown_job(self):
+        self.assertIsNone(self.queue.status("missing"))
+        self.assertIsNone(self.queue.result("missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
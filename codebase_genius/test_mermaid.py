@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Unit tests for Mermaid diagrams: module clustering and node/edge budgets.
+"""
+
+import os
+import sys
+import unittest
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import utils
+
+Mermaid = utils.MermaidGenerator
+
+
+def node_lines(diagram):
+    """Node declarations (id["label"]) in a diagram, excluding subgraph headers."""
+    return [line.strip() for line in diagram.splitlines()
+            if '["' in line and not line.strip().startswith("subgraph")]
+
+
+def edge_lines(diagram):
+    return [line.strip() for line in diagram.splitlines() if "-->" in line]
+
+
+class ClusteringTest(unittest.TestCase):
+    def test_symbols_are_grouped_by_module(self):
+        diagram = Mermaid.generate_call_graph({
+            "pkg.a.run": {"calls": ["pkg.b.helper"]},
+            "pkg.b.helper": {"calls": []},
+            "pkg.b.Job.go": {"class": "Job", "calls": ["pkg.b.helper"]},
+            "main": {"calls": ["pkg.a.run"]},
+        })
+        self.assertEqual(diagram, "\n".join([
+            "graph TD",
+            '    subgraph mod_pkg_a["pkg.a"]',
+            '        pkg_a_run["run()"]',
+            "    end",
+            '    subgraph mod_pkg_b["pkg.b"]',
+            '        pkg_b_helper["helper()"]',
+            '        pkg_b_Job_go["Job.go()"]',
+            "    end",
+            '    subgraph mod_["(root)"]',
+            '        main["main()"]',
+            "    end",
+            "    pkg_a_run --> pkg_b_helper",
+            "    pkg_b_Job_go --> pkg_b_helper",
+            "    main --> pkg_a_run",
+        ]) + "\n")
+
+    def test_external_bases_sit_outside_every_subgraph(self):
+        diagram = Mermaid.generate_inheritance_graph({"a.Foo": {"inherits_from": ["Base"]}}, direction="left-right")
+        lines = diagram.splitlines()
+        self.assertEqual(lines[0], "graph LR")
+        self.assertIn('    Base["Base"]', lines)
+        self.assertLess(lines.index("    end"), lines.index('    Base["Base"]'))
+        self.assertIn("    Base --> a_Foo", lines)
+
+    def test_dependency_graph_clusters_by_directory(self):
+        diagram = Mermaid.generate_dependency_graph({"pkg/a.py": ["pkg/b.py"], "pkg/b.py": [], "main.py": ["pkg/a.py"]})
+        self.assertIn('    subgraph mod_pkg["pkg"]', diagram)
+        self.assertIn('        pkg_a_py["a.py"]', diagram)
+        self.assertIn("    main_py --> pkg_a_py", diagram)
+
+    def test_empty_inputs(self):
+        self.assertIn("No functions found", Mermaid.generate_call_graph({}))
+        self.assertIn("No classes found", Mermaid.generate_inheritance_graph({}))
+        self.assertIn("No files found", Mermaid.generate_dependency_graph({}))
+
+
+class BudgetTest(unittest.TestCase):
+    def setUp(self):
+        # Every function calls m0.f0, so it is the most connected node
+        self.functions = {f"m{index % 3}.f{index}": {"calls": ["m0.f0"]} for index in range(12)}
+
+    def test_node_budget_keeps_the_most_connected_nodes(self):
+        diagram = Mermaid.generate_call_graph(self.functions, max_nodes=4)
+        drawn = [line for line in node_lines(diagram) if not line.startswith("more__")]
+        self.assertEqual(len(drawn), 4)
+        self.assertIn('m0_f0["f0()"]', drawn)
+        self.assertIn("%% showing 4 of 12 nodes (budget 4)", diagram)
+
+    def test_hidden_nodes_collapse_into_per_module_summaries(self):
+        diagram = Mermaid.generate_call_graph(self.functions, max_nodes=4)
+        summaries = {line.split("[", 1)[0]: line for line in node_lines(diagram) if line.startswith("more__")}
+        self.assertEqual(sorted(summaries), ["more__mod_m0", "more__mod_m1", "more__mod_m2"])
+        hidden = sum(int(line.split("... ", 1)[1].split(" ", 1)[0]) for line in summaries.values())
+        self.assertEqual(hidden, 8)
+        # Edges from hidden callers point at their module's summary node
+        self.assertIn("more__mod_m1 --> m0_f0", edge_lines(diagram))
+
+    def test_modules_with_nothing_drawn_share_one_summary(self):
+        functions = {"hub.main": {"calls": []}, "x.a": {"calls": ["hub.main"]},
+                     "y.b": {"calls": []}, "z.c": {"calls": []}}
+        diagram = Mermaid.generate_call_graph(functions, max_nodes=2)
+        self.assertIn('    more__other["... 2 more in 2 other modules"]', diagram)
+        self.assertNotIn("mod_y", diagram)
+
+    def test_edge_budget(self):
+        diagram = Mermaid.generate_call_graph(self.functions, max_edges=3)
+        self.assertEqual(len(edge_lines(diagram)), 3)
+        self.assertIn("%% 9 edges omitted (budget 3)", diagram)
+
+    def test_collapsed_edges_are_deduplicated(self):
+        diagram = Mermaid.generate_call_graph(self.functions, max_nodes=2)
+        edges = edge_lines(diagram)
+        self.assertEqual(len(edges), len(set(edges)))
+
+    def test_within_budget_has_no_summary(self):
+        diagram = Mermaid.generate_call_graph(self.functions)
+        self.assertNotIn("more__", diagram)
+        self.assertNotIn("%%", diagram)
+        self.assertEqual(len(node_lines(diagram)), 12)
+
+    def test_file_tree_budget(self):
+        tree = {"type": "directory", "name": "repo", "children": [
+            {"type": "file", "name": f"f{index}.py"} for index in range(10)
+        ]}
+        diagram = Mermaid.generate_file_structure_tree(tree, max_nodes=4)
+        self.assertIn('    more_0["... 7 more"]', diagram)
+        self.assertIn("    n0 --> more_0", diagram)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Prometheus metrics registry and per-run statistics.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import unittest
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import utils
+
+
+def samples(text):
+    """Parse Prometheus text into {series: value}, skipping comments."""
+    result = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            series, value = line.rsplit(" ", 1)
+            result[series] = float(value)
+    return result
+
+
+class MetricsRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = utils.MetricsRegistry(buckets=(1.0, 5.0, 10.0))
+
+    def test_counters_with_labels(self):
+        self.registry.inc("runs_total", labels={"status": "success"})
+        self.registry.inc("runs_total", labels={"status": "success"})
+        self.registry.inc("runs_total", labels={"status": "failed"})
+        self.registry.inc("bytes_read_total", 1.5)
+
+        text = self.registry.render_prometheus()
+        self.assertIn("# TYPE codebase_genius_runs_total counter\n", text)
+        values = samples(text)
+        self.assertEqual(values['codebase_genius_runs_total{status="success"}'], 2)
+        self.assertEqual(values['codebase_genius_runs_total{status="failed"}'], 1)
+        self.assertEqual(values["codebase_genius_bytes_read_total"], 1.5)
+
+    def test_histogram_buckets_are_cumulative(self):
+        for value in (0.5, 3, 7, 20):
+            self.registry.observe("phase_duration_seconds", value, {"phase": "analysis"})
+
+        text = self.registry.render_prometheus()
+        self.assertIn("# TYPE codebase_genius_phase_duration_seconds histogram\n", text)
+        values = samples(text)
+        series = 'codebase_genius_phase_duration_seconds_bucket{phase="analysis",le="%s"}'
+        self.assertEqual(values[series % "1"], 1)
+        self.assertEqual(values[series % "5"], 2)
+        self.assertEqual(values[series % "10"], 3)
+        self.assertEqual(values[series % "+Inf"], 4)
+        self.assertEqual(values['codebase_genius_phase_duration_seconds_sum{phase="analysis"}'], 30.5)
+        self.assertEqual(values['codebase_genius_phase_duration_seconds_count{phase="analysis"}'], 4)
+
+    def test_boundary_values_fall_in_their_bucket(self):
+        self.registry.observe("latency", 5.0)
+        values = samples(self.registry.render_prometheus())
+        self.assertEqual(values['codebase_genius_latency_bucket{le="1"}'], 0)
+        self.assertEqual(values['codebase_genius_latency_bucket{le="5"}'], 1)
+
+    def test_label_values_are_escaped(self):
+        self.registry.inc("errors_total", labels={"message": 'bad "quote"\\path\nline'})
+        self.assertIn('codebase_genius_errors_total{message="bad \\"quote\\"\\\\path\\nline"} 1',
+                      self.registry.render_prometheus())
+
+    def test_empty_registry(self):
+        self.assertEqual(self.registry.render_prometheus(), "\n")
+
+
+class RunStatsTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = utils.MetricsRegistry(buckets=(1.0, 60.0))
+        self.stats = utils.RunStats("repo", registry=self.registry)
+
+    def test_phase_timings_accumulate(self):
+        with self.stats.phase("analysis"):
+            time.sleep(0.02)
+        with self.stats.phase("analysis"):
+            time.sleep(0.02)
+        with self.assertRaises(ValueError):
+            with self.stats.phase("documentation"):
+                raise ValueError("render failed")
+
+        self.assertGreaterEqual(self.stats.phases["analysis"], 0.04)
+        self.assertIn("documentation", self.stats.phases)
+        values = samples(self.registry.render_prometheus())
+        self.assertEqual(values['codebase_genius_phase_duration_seconds_count{phase="analysis"}'], 2)
+        self.assertEqual(values['codebase_genius_phase_duration_seconds_count{phase="documentation"}'], 1)
+
+    def test_finish_feeds_the_registry_once(self):
+        self.stats.add("files_scanned", 3)
+        self.stats.add("output_bytes", 1024)
+        self.stats.finish("success")
+        self.stats.finish("failed")
+
+        values = samples(self.registry.render_prometheus())
+        self.assertEqual(values['codebase_genius_runs_total{status="success"}'], 1)
+        self.assertNotIn('codebase_genius_runs_total{status="failed"}', values)
+        self.assertEqual(values["codebase_genius_files_scanned_total"], 3)
+        self.assertEqual(values["codebase_genius_output_bytes_total"], 1024)
+        self.assertEqual(values["codebase_genius_run_duration_seconds_count"], 1)
+
+    def test_summary(self):
+        directory = tempfile.mkdtemp(prefix="codebase_genius_test_")
+        try:
+            with self.stats.phase("clone"):
+                pass
+            self.stats.add("cache_hits")
+            self.stats.finish("success")
+            path = os.path.join(directory, "run_summary.json")
+            self.stats.write(path)
+            with open(path) as f:
+                summary = json.load(f)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+        self.assertEqual(summary["repo"], "repo")
+        self.assertEqual(summary["status"], "success")
+        self.assertEqual(list(summary["phases"]), ["clone"])
+        self.assertEqual(summary["counters"]["cache_hits"], 1)
+        self.assertEqual(set(summary["counters"]), set(utils.RunStats.COUNTERS))
+
+    def test_running_summary(self):
+        self.assertEqual(self.stats.to_dict()["status"], "running")
+
+
+if __name__ == "__main__":
+    unittest.main()
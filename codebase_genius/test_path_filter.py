@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Unit tests for .gitignore matching and the pruning repository walk.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import utils
+
+
+class IgnoreRulesTest(unittest.TestCase):
+    def test_unanchored_name_matches_at_any_depth(self):
+        rules = utils.IgnoreRules("", ["*.log"])
+        self.assertTrue(rules.match("debug.log", False))
+        self.assertTrue(rules.match("a/b/debug.log", False))
+        self.assertIsNone(rules.match("debug.log.txt", False))
+
+    def test_slash_anchors_to_the_gitignore_directory(self):
+        rules = utils.IgnoreRules("", ["/build", "docs/out"])
+        self.assertTrue(rules.match("build", True))
+        self.assertIsNone(rules.match("src/build", True))
+        self.assertTrue(rules.match("docs/out", True))
+        self.assertIsNone(rules.match("x/docs/out", True))
+
+    def test_double_star(self):
+        rules = utils.IgnoreRules("", ["**/cache", "logs/**", "a/**/b"])
+        self.assertTrue(rules.match("cache", True))
+        self.assertTrue(rules.match("x/y/cache", True))
+        self.assertTrue(rules.match("logs/2024/app.txt", False))
+        self.assertTrue(rules.match("a/b", True))
+        self.assertTrue(rules.match("a/x/y/b", True))
+
+    def test_directory_only_patterns(self):
+        rules = utils.IgnoreRules("", ["tmp/"])
+        self.assertTrue(rules.match("tmp", True))
+        self.assertIsNone(rules.match("tmp", False))
+
+    def test_character_classes(self):
+        rules = utils.IgnoreRules("", ["file[0-9].txt", "*.py[co]"])
+        self.assertTrue(rules.match("file3.txt", False))
+        self.assertIsNone(rules.match("fileA.txt", False))
+        self.assertTrue(rules.match("mod.pyc", False))
+        self.assertIsNone(rules.match("mod.py", False))
+
+    def test_negation_reincludes_and_last_pattern_wins(self):
+        rules = utils.IgnoreRules("", ["*.log", "!keep.log"])
+        self.assertTrue(rules.match("debug.log", False))
+        self.assertIs(rules.match("keep.log", False), False)
+
+        rules = utils.IgnoreRules("", ["!keep.log", "*.log"])
+        self.assertTrue(rules.match("keep.log", False))
+
+    def test_comments_blank_lines_and_escapes(self):
+        rules = utils.IgnoreRules("", ["# comment", "", "\\#hash", "\\!bang"])
+        self.assertEqual(len(rules.rules), 2)
+        self.assertTrue(rules.match("#hash", False))
+        self.assertTrue(rules.match("!bang", False))
+
+    def test_nested_base_only_applies_below_it(self):
+        rules = utils.IgnoreRules("pkg", ["*.gen.py"])
+        self.assertTrue(rules.match("pkg/sub/a.gen.py", False))
+        self.assertIsNone(rules.match("other/a.gen.py", False))
+
+
+class PathFilterTest(unittest.TestCase):
+    def setUp(self):
+        self.repo = tempfile.mkdtemp(prefix="codebase_genius_test_")
+        files = {
+            ".gitignore": "*.log\n!keep.log\nbuild/\n",
+            "main.py": "",
+            "debug.log": "",
+            "keep.log": "",
+            "build/out.py": "",
+            "node_modules/lib/index.js": "",
+            ".hidden/secret.py": "",
+            "pkg/.gitignore": "generated.py\n!important.log\n",
+            "pkg/mod.py": "",
+            "pkg/generated.py": "",
+            "pkg/important.log": "",
+            "pkg/notes.md": "",
+        }
+        for name, content in files.items():
+            path = os.path.join(self.repo, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(content)
+
+    def tearDown(self):
+        shutil.rmtree(self.repo, ignore_errors=True)
+
+    def walked(self, path_filter):
+        found = []
+        for relative_dir, entries in path_filter.walk(self.repo):
+            for entry in entries:
+                if entry.is_file():
+                    found.append(entry.name if relative_dir == "." else f"{relative_dir}/{entry.name}")
+        return sorted(found)
+
+    def test_walk_applies_config_gitignore_and_hidden_rules(self):
+        path_filter = utils.PathFilter(ignored=("node_modules",), extensions=(".py", ".log"))
+        self.assertEqual(self.walked(path_filter), ["keep.log", "main.py", "pkg/important.log", "pkg/mod.py"])
+        self.assertGreater(path_filter.pruned, 0)
+
+    def test_gitignore_can_be_disabled(self):
+        path_filter = utils.PathFilter(ignored=("node_modules",), extensions=(".py",), use_gitignore=False)
+        self.assertIn("build/out.py", self.walked(path_filter))
+        self.assertIn("pkg/generated.py", self.walked(path_filter))
+
+    def test_glob_entries_in_config(self):
+        path_filter = utils.PathFilter(ignored=("*.egg-info",), extensions=(".py",))
+        self.assertTrue(path_filter.is_ignored("x.egg-info", "x.egg-info", True, []))
+        self.assertFalse(path_filter.is_ignored("src", "src", True, []))
+
+    def test_file_tree_uses_the_filter(self):
+        path_filter = utils.PathFilter(ignored=("node_modules",), extensions=(".py",))
+        _, index = utils.FileTreeBuilder.build_with_index(self.repo, path_filter=path_filter)
+        self.assertIn("pkg/mod.py", index)
+        self.assertNotIn("pkg/generated.py", index)
+        self.assertNotIn("build/out.py", index)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the per-commit result cache and request coalescing.
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import utils
+
+
+class ResultCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix="codebase_genius_test_")
+        self.index_path = os.path.join(self.root, ".result_cache.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def cache(self, **options):
+        return utils.ResultCache(index_path=self.index_path, **options)
+
+    def output(self, name, size=100):
+        """Create an output directory holding `size` bytes of generated files."""
+        output_dir = os.path.join(self.root, name)
+        os.makedirs(output_dir, exist_ok=True)
+        with open(os.path.join(output_dir, "README.md"), "w") as f:
+            f.write("x" * (size - 2))
+        with open(os.path.join(output_dir, "analysis.json"), "w") as f:
+            f.write("{}")
+        return output_dir
+
+    def test_store_and_lookup(self):
+        cache = self.cache()
+        output_dir = self.output("repo")
+        cache.store("https://github.com/u/repo", "abc", output_dir)
+
+        entry = cache.lookup("https://github.com/u/repo", "abc")
+        self.assertEqual(entry["docs_path"], os.path.join(output_dir, "README.md"))
+        self.assertEqual(entry["size"], 100)
+        self.assertIsNone(cache.lookup("https://github.com/u/repo", "def"))
+
+    def test_new_commit_replaces_the_old_entry(self):
+        cache = self.cache()
+        output_dir = self.output("repo")
+        cache.store("https://github.com/u/repo", "abc", output_dir)
+        cache.store("https://github.com/u/repo", "def", output_dir)
+        self.assertIsNone(cache.lookup("https://github.com/u/repo", "abc"))
+        self.assertIsNotNone(cache.lookup("https://github.com/u/repo", "def"))
+
+    def test_missing_outputs_are_a_miss(self):
+        cache = self.cache()
+        output_dir = self.output("repo")
+        cache.store("https://github.com/u/repo", "abc", output_dir)
+        os.remove(os.path.join(output_dir, "analysis.json"))
+        self.assertIsNone(cache.lookup("https://github.com/u/repo", "abc"))
+
+    def test_expired_entries_are_misses_and_get_evicted(self):
+        cache = self.cache(ttl=0.05)
+        old = self.output("old")
+        cache.store("https://github.com/u/old", "abc", old)
+        time.sleep(0.1)
+        self.assertIsNone(cache.lookup("https://github.com/u/old", "abc"))
+
+        cache.store("https://github.com/u/new", "abc", self.output("new"))
+        self.assertFalse(os.path.exists(old))
+
+    def test_size_cap_evicts_the_oldest(self):
+        cache = self.cache(max_size=250)
+        first, second, third = self.output("a"), self.output("b"), self.output("c")
+        cache.store("https://github.com/u/a", "1", first)
+        cache.store("https://github.com/u/b", "1", second)
+        cache.store("https://github.com/u/c", "1", third)
+
+        self.assertFalse(os.path.exists(first))
+        self.assertIsNone(cache.lookup("https://github.com/u/a", "1"))
+        self.assertIsNotNone(cache.lookup("https://github.com/u/b", "1"))
+        self.assertIsNotNone(cache.lookup("https://github.com/u/c", "1"))
+
+    def test_entry_cap_evicts_the_oldest(self):
+        cache = self.cache(max_entries=1)
+        first = self.output("a")
+        cache.store("https://github.com/u/a", "1", first)
+        cache.store("https://github.com/u/b", "1", self.output("b"))
+        self.assertFalse(os.path.exists(first))
+
+    def test_held_outputs_are_not_evicted(self):
+        cache = self.cache(max_entries=1)
+        first = self.output("a")
+        cache.store("https://github.com/u/a", "1", first)
+        with utils.ResultCache.hold(first):
+            cache.store("https://github.com/u/b", "1", self.output("b"))
+            self.assertTrue(os.path.exists(first))
+
+        # Once released, the next store evicts it as usual
+        cache.store("https://github.com/u/c", "1", self.output("c"))
+        self.assertFalse(os.path.exists(first))
+
+    def test_concurrent_stores_keep_every_entry(self):
+        outputs = [self.output(f"repo{index}", size=10) for index in range(16)]
+
+        def store(index):
+            # Each request builds its own cache instance, as the API does
+            self.cache().store(f"https://github.com/u/repo{index}", "abc", outputs[index])
+
+        threads = [threading.Thread(target=store, args=(index,)) for index in range(len(outputs))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        cache = self.cache()
+        for index in range(len(outputs)):
+            self.assertIsNotNone(cache.lookup(f"https://github.com/u/repo{index}", "abc"))
+
+    def test_disabled(self):
+        cache = self.cache(enabled=False)
+        cache.store("https://github.com/u/repo", "abc", self.output("repo"))
+        self.assertIsNone(cache.lookup("https://github.com/u/repo", "abc"))
+        self.assertFalse(os.path.exists(self.index_path))
+
+    def test_key_depends_on_commit(self):
+        self.assertNotEqual(utils.ResultCache.make_key("u", "a"), utils.ResultCache.make_key("u", "b"))
+
+
+class RequestCoalescerTest(unittest.TestCase):
+    def run_concurrently(self, coalescer, key, func, callers=5):
+        outcomes = []
+        lock = threading.Lock()
+
+        def call():
+            try:
+                outcome = coalescer.run(key, func)
+            except Exception as e:
+                outcome = e
+            with lock:
+                outcomes.append(outcome)
+
+        threads = [threading.Thread(target=call) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        return threads, outcomes
+
+    def test_concurrent_callers_share_one_call(self):
+        coalescer = utils.RequestCoalescer()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def work():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "docs"
+
+        first = threading.Thread(target=lambda: coalescer.run("repo@abc", work))
+        first.start()
+        self.assertTrue(started.wait(5))
+        threads, outcomes = self.run_concurrently(coalescer, "repo@abc", work)
+        time.sleep(0.05)
+        release.set()
+        for thread in threads + [first]:
+            thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(outcomes, ["docs"] * 5)
+
+    def test_failures_reach_every_waiter(self):
+        coalescer = utils.RequestCoalescer()
+        started = threading.Event()
+        release = threading.Event()
+
+        def fail():
+            started.set()
+            release.wait(5)
+            raise RuntimeError("clone failed")
+
+        first = threading.Thread(target=lambda: self.assertRaises(RuntimeError, coalescer.run, "k", fail))
+        first.start()
+        self.assertTrue(started.wait(5))
+        threads, outcomes = self.run_concurrently(coalescer, "k", fail, callers=3)
+        time.sleep(0.05)
+        release.set()
+        for thread in threads + [first]:
+            thread.join(5)
+
+        self.assertEqual(len(outcomes), 3)
+        self.assertTrue(all(isinstance(outcome, RuntimeError) for outcome in outcomes))
+
+    def test_later_calls_run_again(self):
+        coalescer = utils.RequestCoalescer()
+        calls = []
+        for _ in range(2):
+            coalescer.run("k", lambda: calls.append(1))
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(coalescer._inflight, {})
+
+    def test_different_keys_do_not_wait_for_each_other(self):
+        coalescer = utils.RequestCoalescer()
+        release = threading.Event()
+        blocked = threading.Thread(target=lambda: coalescer.run("a", lambda: release.wait(5)))
+        blocked.start()
+        try:
+            self.assertEqual(coalescer.run("b", lambda: "b"), "b")
+        finally:
+            release.set()
+            blocked.join(5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Unit tests for per-package documentation shards and their change manifest.
+"""
+
+import os
+import sys
+import copy
+import shutil
+import tempfile
+import unittest
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import utils
+
+REPO = "/repo"
+
+
+def analysis():
+    """Functions, classes and files spread over the root and two packages."""
+    return {
+        "functions": {
+            "main.run": {"name": "run", "file": f"{REPO}/main.py", "line_start": 1},
+            "pkg.a.helper": {"name": "helper", "file": f"{REPO}/pkg/a.py", "line_start": 1},
+            "pkg.sub.b.work": {"name": "work", "file": f"{REPO}/pkg/sub/b.py", "line_start": 3},
+        },
+        "classes": {
+            "pkg.a.Thing": {"name": "Thing", "file": f"{REPO}/pkg/a.py", "line_start": 5, "inherits_from": []},
+        },
+        "dependencies": {
+            f"{REPO}/main.py": {"imports": ["pkg.a"], "modules": ["pkg.a"]},
+            f"{REPO}/pkg/a.py": {"imports": [], "modules": []},
+            f"{REPO}/pkg/sub/b.py": {"imports": [], "modules": []},
+        },
+        "complexity": {f"{REPO}/pkg/a.py": {"total": 4}},
+    }
+
+
+class DocumentationShardsTest(unittest.TestCase):
+    def setUp(self):
+        self.output = tempfile.mkdtemp(prefix="codebase_genius_test_")
+        self.shards = utils.DocumentationShards(self.output, REPO)
+
+    def tearDown(self):
+        shutil.rmtree(self.output, ignore_errors=True)
+
+    def render(self, plan, names):
+        os.makedirs(self.shards.pages_dir, exist_ok=True)
+        for name in names:
+            with open(self.shards.page_path(name), "w") as f:
+                f.write(name)
+        self.shards.save_manifest(plan)
+
+    def test_shard_of(self):
+        self.assertEqual(utils.DocumentationShards.shard_of("main.py"), utils.DocumentationShards.ROOT)
+        self.assertEqual(utils.DocumentationShards.shard_of("pkg/sub/b.py"), "pkg/sub")
+
+    def test_plan_groups_by_package(self):
+        plan = self.shards.plan(analysis())
+        self.assertEqual(sorted(plan), [".", "pkg", "pkg/sub"])
+        self.assertEqual(plan["pkg"]["functions"], ["pkg.a.helper"])
+        self.assertEqual(plan["pkg"]["classes"], ["pkg.a.Thing"])
+        self.assertEqual(plan["pkg"]["files"], [f"{REPO}/pkg/a.py"])
+
+    def test_page_names_come_from_the_path(self):
+        dotted = self.shards.page_path("v1.2")
+        nested = self.shards.page_path("v1/2")
+        self.assertNotEqual(dotted, nested)
+        self.assertEqual(os.path.dirname(nested), self.shards.pages_dir)
+        self.assertTrue(self.shards.page_link("v1/2").startswith("pages/v1.2-"))
+        self.assertEqual(self.shards.page_link(utils.DocumentationShards.ROOT), "pages/_root.md")
+        self.assertNotEqual(self.shards.page_path("_root"), self.shards.page_path(utils.DocumentationShards.ROOT))
+
+    def test_diagram_budgets_are_part_of_the_digest(self):
+        config = utils.ConfigUtils.load_config()
+        saved = copy.deepcopy(config.get("diagrams"))
+        before = self.shards.plan(analysis())
+        try:
+            config.setdefault("diagrams", {}).setdefault("call_graph", {})["max_nodes"] = 3
+            after = self.shards.plan(analysis())
+        finally:
+            if saved is None:
+                config.pop("diagrams", None)
+            else:
+                config["diagrams"] = saved
+        self.assertTrue(all(before[name]["digest"] != after[name]["digest"] for name in before))
+
+    def test_only_changed_shards_are_rendered_again(self):
+        plan = self.shards.plan(analysis())
+        self.assertEqual(self.shards.changed(plan), sorted(plan))
+        self.render(plan, plan)
+        self.assertEqual(self.shards.changed(self.shards.plan(analysis())), [])
+
+        edited = analysis()
+        edited["functions"]["pkg.a.helper"]["line_start"] = 2
+        self.assertEqual(self.shards.changed(self.shards.plan(edited)), ["pkg"])
+
+    def test_missing_page_is_rendered_again(self):
+        plan = self.shards.plan(analysis())
+        self.render(plan, plan)
+        os.remove(self.shards.page_path("pkg/sub"))
+        self.assertEqual(self.shards.changed(plan), ["pkg/sub"])
+
+    def test_shards_left_stale_are_rendered_next_run(self):
+        plan = self.shards.plan(analysis())
+        self.render(plan, plan)
+        self.shards.save_manifest(plan, stale=["pkg"])
+        self.assertTrue(os.path.exists(self.shards.page_path("pkg")))
+        self.assertEqual(self.shards.changed(plan), ["pkg"])
+
+    def test_pages_from_an_older_layout_are_deleted(self):
+        plan = self.shards.plan(analysis())
+        os.makedirs(self.shards.pages_dir)
+        old_page = os.path.join(self.shards.pages_dir, "pkg.sub.md")
+        with open(old_page, "w") as f:
+            f.write("old")
+        self.render(plan, plan)
+        self.assertFalse(os.path.exists(old_page))
+
+    def test_stale_pages_are_deleted(self):
+        plan = self.shards.plan(analysis())
+        self.render(plan, plan)
+
+        smaller = analysis()
+        del smaller["functions"]["pkg.sub.b.work"]
+        del smaller["dependencies"][f"{REPO}/pkg/sub/b.py"]
+        self.render(self.shards.plan(smaller), [])
+        self.assertFalse(os.path.exists(self.shards.page_path("pkg/sub")))
+        self.assertTrue(os.path.exists(self.shards.page_path("pkg")))
+
+    def test_output_size_counts_the_index_and_every_page(self):
+        plan = self.shards.plan(analysis())
+        self.render(plan, plan)
+        with open(os.path.join(self.output, "README.md"), "w") as f:
+            f.write("x" * 100)
+        pages = sum(len(name) for name in plan)
+        self.assertEqual(self.shards.output_size(), 100 + pages)
+
+    def test_materialize_uses_relative_paths(self):
+        source = analysis()
+        untouched = copy.deepcopy(source)
+        shard = self.shards.materialize(source, self.shards.plan(source)["pkg"])
+        self.assertEqual(shard["functions"]["pkg.a.helper"]["file"], "pkg/a.py")
+        self.assertEqual(list(shard["dependencies"]), ["pkg/a.py"])
+        self.assertEqual(shard["complexity"], {"pkg/a.py": {"total": 4}})
+        self.assertEqual(source, untouched)
+
+
+if __name__ == "__main__":
+    unittest.main()
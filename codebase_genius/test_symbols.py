@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Unit tests for qualified symbol resolution.
+"""
+
+import os
+import sys
+import unittest
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import utils
+
+
+def index_sources(sources):
+    """Analyze {relative path: source} and return the populated symbol index."""
+    symbols = utils.SymbolIndex()
+    for relative_path, content in sources.items():
+        result = utils.FileAnalyzer.analyze_content(content, os.path.splitext(relative_path)[1])
+        symbols.add_file(os.path.join("/repo", relative_path), relative_path, result)
+    return symbols
+
+
+class SymbolIndexTest(unittest.TestCase):
+    def test_module_name(self):
+        self.assertEqual(utils.SymbolIndex.module_name("pkg/sub/mod.py"), "pkg.sub.mod")
+        self.assertEqual(utils.SymbolIndex.module_name("pkg/__init__.py"), "pkg")
+
+    def test_same_names_in_different_modules_do_not_collide(self):
+        symbols = index_sources({
+            "a.py": "def run():\n    pass\n",
+            "b.py": "class Job:\n    def run(self):\n        pass\n",
+        })
+        self.assertIn("a.run", symbols.definitions)
+        self.assertIn("b.Job.run", symbols.definitions)
+        self.assertEqual(sorted(symbols.by_name["run"]), ["a.run", "b.Job.run"])
+
+    def test_redefinitions_stay_addressable(self):
+        symbols = index_sources({"a.py": "def f():\n    pass\ndef f():\n    pass\n"})
+        self.assertIn("a.f", symbols.definitions)
+        self.assertIn("a.f#2", symbols.definitions)
+
+    def test_resolution_through_imports_and_self(self):
+        symbols = index_sources({
+            "pkg/__init__.py": "",
+            "pkg/helpers.py": "def helper():\n    pass\n",
+            "pkg/main.py": (
+                "from .helpers import helper\n"
+                "from . import helpers as h\n"
+                "class Worker:\n"
+                "    def go(self):\n"
+                "        pass\n"
+            ),
+        })
+        main = "/repo/pkg/main.py"
+        self.assertEqual(symbols.resolve("helper", main), "pkg.helpers.helper")
+        self.assertEqual(symbols.resolve("h.helper", main), "pkg.helpers.helper")
+        self.assertEqual(symbols.resolve("self.go", main, "Worker"), "pkg.main.Worker.go")
+        self.assertIsNone(symbols.resolve("os.path.join", main))
+
+    def test_ambiguous_short_names_are_not_guessed(self):
+        symbols = index_sources({
+            "a.py": "def run():\n    pass\n",
+            "b.py": "def run():\n    pass\n",
+            "c.py": "x = 1\n",
+        })
+        self.assertIsNone(symbols.resolve("run", "/repo/c.py"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Unit tests for tree-sitter base class extraction. Each grammar's tests are skipped when it is not installed.
+"""
+
+import os
+import sys
+import unittest
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import utils
+
+
+def requires(language):
+    return unittest.skipUnless(utils.TreeSitterEngine._load(language), f"tree-sitter {language} grammar is not installed")
+
+
+class BasesTest(unittest.TestCase):
+    def bases(self, source, extension):
+        result = utils.TreeSitterEngine.extract(source, extension)
+        return {record["name"]: record["inherits_from"] for record in result["classes"]}
+
+    @requires("javascript")
+    def test_javascript(self):
+        self.assertEqual(self.bases("class A extends B {}\nclass C extends ns.D {}\nclass E {}\n", ".js"),
+                         {"A": ["B"], "C": ["ns.D"], "E": []})
+
+    @requires("javascript")
+    def test_javascript_call_arguments_are_not_bases(self):
+        self.assertEqual(self.bases("class A extends mixin(B, C) {}\n", ".js"), {"A": ["mixin"]})
+
+    @requires("typescript")
+    def test_typescript_generics(self):
+        source = "class A<T> extends B<T> implements I<T>, J {}\ninterface K<T> extends L<T>, M {}\n"
+        self.assertEqual(self.bases(source, ".ts"), {"A": ["B", "I", "J"], "K": ["L", "M"]})
+
+    @requires("tsx")
+    def test_tsx_generics(self):
+        self.assertEqual(self.bases("class A<T> extends B<T> implements I {}\n", ".tsx"), {"A": ["B", "I"]})
+
+    @requires("java")
+    def test_java_generics(self):
+        source = (
+            "class A<T extends Comparable<T>> extends B<T> implements I<T>, J {}\n"
+            "interface K<T> extends L<T>, M {}\n"
+            "class N extends p.Q<R> {}\n"
+        )
+        self.assertEqual(self.bases(source, ".java"), {"A": ["B", "I", "J"], "K": ["L", "M"], "N": ["p.Q"]})
+
+    @requires("cpp")
+    def test_cpp_templates(self):
+        source = "class A : public B<T>, private ns::C {};\nstruct D : E<F<G>> {};\n"
+        self.assertEqual(self.bases(source, ".cpp"), {"A": ["B", "ns::C"], "D": ["E"]})
+
+    @requires("c")
+    def test_c_structs_have_no_bases(self):
+        self.assertEqual(self.bases("struct point { int x; int y; };\n", ".c"), {"point": []})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,12 +3,37 @@ Utility functions for the Codebase Genius system.
 Provides helper functions for file operations, text processing, and more.
 """
 
+import io
 import os
+import posixpath
 import re
+import ast
 import json
-from typing import Dict, List, Any, Optional
+import mmap
+import multiprocessing
+import heapq
+import hashlib
+import shutil
+import signal
+import sqlite3
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
+# Bump whenever extractor output changes so cached per-file results are invalidated
+ANALYZER_VERSION = "8"
+
 
 class FileUtils:
     """Utility class for file operations."""
@@ -25,8 +50,12 @@ class FileUtils:
         return FileUtils.get_file_extension(file_path) in text_extensions
 
     @staticmethod
-    def read_file_content(file_path: str, max_size: int = 10 * 1024 * 1024) -> Optional[str]:
-        """Read file content with size limit."""
+    def read_file_content(file_path: str, max_size: int = 10 * 1024 * 1024,
+                          content_store: Optional['FileContentStore'] = None) -> Optional[str]:
+        """Read file content with size limit, through a shared content store when given."""
+        if content_store is not None:
+            return content_store.get_text(file_path, errors='ignore')
+
         try:
             if not os.path.exists(file_path):
                 return None
@@ -56,17 +85,482 @@ class FileUtils:
         return total_size
 
 
+class FileContentStore:
+    """Per-run file content service: reads each file at most once and shares the result."""
+
+    SNIFF_BYTES = 8192
+    TEXT_CHARACTERS = bytes(range(32, 127)) + b'\n\r\t\f\b'
+
+    def __init__(self, mmap_threshold: int = 1024 * 1024, max_file_size: int = 10 * 1024 * 1024,
+                 max_cached_bytes: int = 256 * 1024 * 1024):
+        self.mmap_threshold = mmap_threshold
+        self.max_file_size = max_file_size
+        self.max_cached_bytes = max_cached_bytes
+        self.bytes_read = 0
+        self.files_read = 0
+        self.skipped: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._data: 'OrderedDict[str, bytes]' = OrderedDict()
+        # Mapped files are not counted against the cache budget and stay mapped until close(),
+        # since callers may still hold views into them
+        self._mapped: Dict[str, memoryview] = {}
+        # Decoded text keyed by (path, errors mode); mapped files are decoded once and kept with their mapping
+        self._text: 'OrderedDict[Tuple[str, str], str]' = OrderedDict()
+        self._mapped_text: Dict[Tuple[str, str], str] = {}
+        self._cached_bytes = 0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'FileContentStore':
+        """Create a store from the `processing` section of config.json."""
+        settings = config.get('processing', {})
+        return cls(
+            mmap_threshold=settings.get('mmap_threshold', 1024 * 1024),
+            max_file_size=settings.get('max_file_size', 10 * 1024 * 1024),
+            max_cached_bytes=settings.get('content_cache_size', 256 * 1024 * 1024)
+        )
+
+    @staticmethod
+    def looks_binary(sample: bytes) -> bool:
+        """Guess whether a leading sample of a file is binary data."""
+        if not sample:
+            return False
+        if b'\0' in sample:
+            return True
+        # Decodable UTF-8 is text even if it is mostly non-ASCII
+        try:
+            sample.decode('utf-8')
+            return False
+        except UnicodeDecodeError as e:
+            # A multi-byte character cut off at the end of the sample is still text
+            if e.start >= len(sample) - 3:
+                return False
+        non_text = len(sample.translate(None, FileContentStore.TEXT_CHARACTERS))
+        return non_text / len(sample) > 0.3
+
+    def get_bytes(self, file_path: str) -> Optional[Any]:
+        """Return file content as bytes (or a memoryview over a mapping), or None if skipped."""
+        with self._lock:
+            if file_path in self._mapped:
+                return self._mapped[file_path]
+            if file_path in self._data:
+                self._data.move_to_end(file_path)
+                return self._data[file_path]
+            if file_path in self.skipped:
+                return None
+
+        data = self._load(file_path)
+        if data is None:
+            return None
+        with self._lock:
+            if isinstance(data, memoryview):
+                if file_path in self._mapped:
+                    # Another thread mapped the file first; this view was never handed out
+                    FileContentStore._release(data)
+                    return self._mapped[file_path]
+                self._mapped[file_path] = data
+            else:
+                if file_path in self._data:
+                    return self._data[file_path]
+                self._data[file_path] = data
+                self._cached_bytes += len(data)
+                self._evict()
+        return data
+
+    def _load(self, file_path: str) -> Optional[Any]:
+        try:
+            with open(file_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size > self.max_file_size:
+                    return self._skip(file_path, f"too large ({size} bytes)")
+
+                # Binary files are recognised from their first block without reading the rest
+                sample = f.read(FileContentStore.SNIFF_BYTES)
+                if FileContentStore.looks_binary(sample):
+                    return self._skip(file_path, "binary", len(sample))
+
+                if size >= self.mmap_threshold:
+                    data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+                else:
+                    data = sample + f.read()
+        except (OSError, ValueError) as e:
+            return self._skip(file_path, f"unreadable ({e})")
+
+        with self._lock:
+            self.files_read += 1
+            self.bytes_read += len(data)
+        return data
+
+    def _skip(self, file_path: str, reason: str, bytes_read: int = 0) -> None:
+        with self._lock:
+            self.skipped[file_path] = reason
+            if bytes_read:
+                self.files_read += 1
+                self.bytes_read += bytes_read
+
+    @staticmethod
+    def _release(data: Any) -> None:
+        if isinstance(data, memoryview):
+            mapping = data.obj
+            data.release()
+            mapping.close()
+
+    def get_text(self, file_path: str, errors: str = 'strict') -> Optional[str]:
+        """Return file content decoded as UTF-8, or None if skipped or (strictly) undecodable."""
+        with self._lock:
+            text = self._cached_text(file_path, errors)
+            if text is not None:
+                return text
+
+        data = self.get_bytes(file_path)
+        if data is None:
+            return None
+
+        mode = 'strict'
+        try:
+            text = str(data, 'utf-8')
+        except UnicodeDecodeError:
+            if errors == 'strict':
+                return None
+            mode = errors
+            text = str(data, 'utf-8', errors)
+
+        with self._lock:
+            if isinstance(data, memoryview):
+                self._mapped_text[(file_path, mode)] = text
+            else:
+                # The raw bytes stay cached too: a lossy decode does not round-trip to the file's bytes
+                self._text[(file_path, mode)] = text
+                self._cached_bytes += len(text)
+                self._evict()
+        return text
+
+    def _cached_text(self, file_path: str, errors: str) -> Optional[str]:
+        # A file that decoded cleanly serves every errors mode from its strict entry
+        for key in ((file_path, 'strict'), (file_path, errors)):
+            if key in self._mapped_text:
+                return self._mapped_text[key]
+            if key in self._text:
+                self._text.move_to_end(key)
+                return self._text[key]
+        return None
+
+    def is_binary(self, file_path: str) -> bool:
+        """Return True if a file was sniffed as binary."""
+        self.get_bytes(file_path)
+        return self.skipped.get(file_path) == "binary"
+
+    def _evict(self) -> None:
+        """Drop least recently used in-memory contents once over the cache budget."""
+        while self._cached_bytes > self.max_cached_bytes and (self._text or self._data):
+            cache = self._text if self._text else self._data
+            _, value = cache.popitem(last=False)
+            self._cached_bytes -= len(value)
+
+    def close(self) -> None:
+        """Release cached contents and memory mappings."""
+        with self._lock:
+            for value in self._mapped.values():
+                FileContentStore._release(value)
+            self._mapped.clear()
+            self._data.clear()
+            self._text.clear()
+            self._mapped_text.clear()
+            self._cached_bytes = 0
+
+
+class IgnoreRules:
+    """Patterns from one .gitignore file compiled to regular expressions.
+
+    Patterns without negations are merged into one alternation per kind, so a path
+    is tested with at most two regex searches.
+    """
+
+    def __init__(self, base: str, lines: List[str]):
+        self.base = base
+        self.rules: List[Tuple[Any, bool, bool]] = []
+        for line in lines:
+            line = line.rstrip('\n').rstrip('\r')
+            if not line.strip() or line.startswith('#'):
+                continue
+            line = line.rstrip(' ')
+            negated = line.startswith('!')
+            if negated:
+                line = line[1:]
+            elif line.startswith('\\'):
+                line = line[1:]
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            if line:
+                self.rules.append((IgnoreRules.translate(line), negated, dir_only))
+
+        self._combined = None
+        if not any(negated for _, negated, _ in self.rules):
+            any_path = [regex for regex, _, dir_only in self.rules if not dir_only]
+            dirs_only = [regex for regex, _, dir_only in self.rules if dir_only]
+            self._combined = (
+                re.compile('|'.join(any_path)) if any_path else None,
+                re.compile('|'.join(dirs_only)) if dirs_only else None
+            )
+        self.rules = [(re.compile(regex), negated, dir_only) for regex, negated, dir_only in self.rules]
+
+    @classmethod
+    def load(cls, path: str, base: str) -> Optional['IgnoreRules']:
+        """Compile a .gitignore file, or return None if it is unreadable or has no patterns."""
+        try:
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                rules = cls(base, f.readlines())
+        except OSError:
+            return None
+        return rules if rules.rules else None
+
+    @staticmethod
+    def translate(pattern: str) -> str:
+        """Translate a gitignore glob into a regex over '/'-separated relative paths."""
+        # A slash anywhere but the end anchors the pattern to the .gitignore's directory
+        anchored = '/' in pattern
+        pattern = pattern.lstrip('/')
+        parts = []
+        i = 0
+        while i < len(pattern):
+            if pattern.startswith('**/', i):
+                parts.append('(?:.*/)?')
+                i += 3
+            elif pattern.startswith('/**', i) and i + 3 == len(pattern):
+                parts.append('/.*')
+                i += 3
+            elif pattern.startswith('**', i):
+                parts.append('.*')
+                i += 2
+            elif pattern[i] == '*':
+                parts.append('[^/]*')
+                i += 1
+            elif pattern[i] == '?':
+                parts.append('[^/]')
+                i += 1
+            elif pattern[i] == '[' and ']' in pattern[i + 2:]:
+                close = pattern.index(']', i + 2)
+                body = pattern[i + 1:close]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                parts.append('[' + body.replace('\\', '\\\\') + ']')
+                i = close + 1
+            else:
+                parts.append(re.escape(pattern[i]))
+                i += 1
+        prefix = '^' if anchored else '(?:^|/)'
+        return f"(?:{prefix}{''.join(parts)}$)"
+
+    def match(self, relative_path: str, is_dir: bool) -> Optional[bool]:
+        """True if ignored, False if re-included by a negation, None if no pattern applies."""
+        if self.base:
+            if not relative_path.startswith(self.base + '/'):
+                return None
+            relative_path = relative_path[len(self.base) + 1:]
+
+        if self._combined is not None:
+            any_path, dirs_only = self._combined
+            if any_path is not None and any_path.search(relative_path):
+                return True
+            if is_dir and dirs_only is not None and dirs_only.search(relative_path):
+                return True
+            return None
+
+        # The last matching pattern wins, as in git
+        for regex, negated, dir_only in reversed(self.rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.search(relative_path):
+                return not negated
+        return None
+
+
+class PathFilter:
+    """Compiled ignore rules and extension filter shared by every repository walk.
+
+    Directories are pruned before they are descended into. Rules come from
+    processing.ignored_directories, every .gitignore met on the way down, and
+    hidden names.
+    """
+
+    GLOB_CHARS = re.compile(r'[*?\[]')
+
+    def __init__(self, ignored: Tuple[str, ...] = (), extensions: Optional[Tuple[str, ...]] = None,
+                 use_gitignore: bool = True, skip_hidden: bool = True):
+        # Plain names are a set lookup; glob entries are compiled like .gitignore patterns
+        self.ignored_names = {name.strip('/') for name in ignored if not PathFilter.GLOB_CHARS.search(name)}
+        globs = [name for name in ignored if PathFilter.GLOB_CHARS.search(name)]
+        self.config_rules = IgnoreRules('', globs) if globs else None
+        self.extensions = tuple(ext.lower() for ext in extensions) if extensions is not None else None
+        self.use_gitignore = use_gitignore
+        self.skip_hidden = skip_hidden
+        self.pruned = 0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], extensions: Optional[Tuple[str, ...]] = None) -> 'PathFilter':
+        """Create a filter from the `processing` section of config.json."""
+        settings = config.get('processing', {})
+        return cls(
+            ignored=tuple(settings.get('ignored_directories', FileTreeBuilder.DEFAULT_IGNORED)),
+            extensions=extensions,
+            use_gitignore=settings.get('respect_gitignore', True)
+        )
+
+    def is_ignored(self, name: str, relative_path: str, is_dir: bool, rules: List[IgnoreRules]) -> bool:
+        """Check a directory entry against config ignores and the .gitignore rules in scope."""
+        if self.skip_hidden and name.startswith('.'):
+            return True
+        if is_dir and name in self.ignored_names:
+            return True
+
+        path = relative_path if os.sep == '/' else relative_path.replace(os.sep, '/')
+        if self.config_rules is not None and self.config_rules.match(path, is_dir):
+            return True
+        # Deeper .gitignore files take precedence over their parents
+        for ignore_rules in reversed(rules):
+            verdict = ignore_rules.match(path, is_dir)
+            if verdict is not None:
+                return verdict
+        return False
+
+    def accepts_file(self, name: str) -> bool:
+        """Check a file name against the extension filter."""
+        return self.extensions is None or os.path.splitext(name)[1].lower() in self.extensions
+
+    def walk(self, repo_path: str):
+        """Yield (relative_dir, entries) for each kept directory, parents before children.
+
+        `entries` are the kept os.DirEntry objects of the directory, sorted by name.
+        relative_dir is "." for the repository root.
+        """
+        stack = [(repo_path, ".", [])]
+        while stack:
+            dir_path, relative_dir, rules = stack.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+            except OSError:
+                continue
+
+            if self.use_gitignore and any(entry.name == '.gitignore' for entry in entries):
+                base = "" if relative_dir == "." else relative_dir.replace(os.sep, '/')
+                ignore_rules = IgnoreRules.load(os.path.join(dir_path, '.gitignore'), base)
+                if ignore_rules is not None:
+                    rules = rules + [ignore_rules]
+
+            kept = []
+            subdirs = []
+            for entry in entries:
+                name = entry.name
+                relative_path = name if relative_dir == "." else os.path.join(relative_dir, name)
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                if self.is_ignored(name, relative_path, is_dir, rules):
+                    if is_dir:
+                        self.pruned += 1
+                    continue
+                if is_dir:
+                    subdirs.append((entry.path, relative_path, rules))
+                elif not self.accepts_file(name):
+                    continue
+                kept.append(entry)
+
+            yield relative_dir, kept
+            stack.extend(reversed(subdirs))
+
+
+class FileTreeBuilder:
+    """Build the nested repository file tree in a single scandir pass."""
+
+    DEFAULT_EXTENSIONS = ('.py', '.jac', '.md', '.txt', '.js', '.ts', '.java', '.cpp', '.c', '.h')
+    DEFAULT_IGNORED = ('__pycache__', 'node_modules', '.git')
+
+    @staticmethod
+    def build(repo_path: str, extensions: Tuple[str, ...] = DEFAULT_EXTENSIONS,
+              ignored: Tuple[str, ...] = DEFAULT_IGNORED, path_filter: Optional[PathFilter] = None,
+              budget: Optional['RunBudget'] = None) -> Dict[str, Any]:
+        """Build the file tree for a repository."""
+        return FileTreeBuilder.build_with_index(repo_path, extensions, ignored, path_filter, budget)[0]
+
+    @staticmethod
+    def build_with_index(repo_path: str, extensions: Tuple[str, ...] = DEFAULT_EXTENSIONS,
+                         ignored: Tuple[str, ...] = DEFAULT_IGNORED, path_filter: Optional[PathFilter] = None,
+                         budget: Optional['RunBudget'] = None) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        """Build the file tree and an index from relative path to tree node.
+
+        With a budget, the walk stops once the repository size cap or the time budget is hit.
+        """
+        if path_filter is None:
+            path_filter = PathFilter(tuple(ignored), tuple(extensions))
+        root = {"name": os.path.basename(os.path.normpath(repo_path)), "type": "directory", "children": []}
+        index = {".": root}
+
+        for relative_dir, entries in path_filter.walk(repo_path):
+            if budget is not None and (budget.expired() or budget.truncated):
+                budget.truncate(budget.truncated or budget.expire_reason())
+                break
+            node = index[relative_dir]
+            for entry in entries:
+                name = entry.name
+                relative_path = name if relative_dir == "." else os.path.join(relative_dir, name)
+
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        child = {"name": name, "type": "directory", "children": []}
+                    else:
+                        child = {
+                            "name": name,
+                            "type": "file",
+                            "path": relative_path,
+                            "size": entry.stat().st_size,
+                            "extension": os.path.splitext(name)[1]
+                        }
+                except OSError:
+                    # Broken symlinks and files removed mid-walk are skipped
+                    continue
+                if budget is not None and child["type"] == "file" and not budget.charge(child["size"]):
+                    break
+                node["children"].append(child)
+                index[relative_path] = child
+
+        return root, index
+
+
+class LineIndex:
+    """Offsets of line starts in a text, for O(log n) offset-to-line lookups."""
+
+    __slots__ = ('offsets',)
+
+    def __init__(self, content: str):
+        offsets = [0]
+        position = content.find('\n')
+        while position != -1:
+            offsets.append(position + 1)
+            position = content.find('\n', position + 1)
+        self.offsets = offsets
+
+    def line_of(self, offset: int) -> int:
+        """Return the 1-based line number containing a character offset."""
+        return bisect_right(self.offsets, offset)
+
+
 class TextProcessor:
     """Utility class for text processing and analysis."""
 
+    FUNCTION_PATTERN = re.compile(r'def\s+(\w+)\s*\(([^)]*)\)\s*(?:->\s*[^:]+)?\s*:', re.MULTILINE)
+    CLASS_PATTERN = re.compile(r'class\s+(\w+)(?:\(([^)]+)\))?\s*:', re.MULTILINE)
+    DOCSTRING_PATTERN = re.compile(r'""".*?"""', re.DOTALL)
+    DOCSTRING_WINDOW = 1000
+
     @staticmethod
-    def extract_functions_python(content: str) -> List[Dict[str, Any]]:
+    def extract_functions_python(content: str, line_index: Optional[LineIndex] = None) -> List[Dict[str, Any]]:
         """Extract function definitions from Python code."""
         functions = []
+        line_index = line_index or LineIndex(content)
 
         # Match function definitions
-        func_pattern = r'def\s+(\w+)\s*\(([^)]*)\)\s*(?:->\s*[^:]+)?\s*:'
-        matches = re.finditer(func_pattern, content, re.MULTILINE)
+        matches = TextProcessor.FUNCTION_PATTERN.finditer(content)
 
         for match in matches:
             func_name = match.group(1)
@@ -89,19 +583,19 @@ class TextProcessor:
                 'name': func_name,
                 'parameters': parameters,
                 'docstring': docstring,
-                'line_start': content[:match.start()].count('\n') + 1
+                'line_start': line_index.line_of(match.start())
             })
 
         return functions
 
     @staticmethod
-    def extract_classes_python(content: str) -> List[Dict[str, Any]]:
+    def extract_classes_python(content: str, line_index: Optional[LineIndex] = None) -> List[Dict[str, Any]]:
         """Extract class definitions from Python code."""
         classes = []
+        line_index = line_index or LineIndex(content)
 
         # Match class definitions
-        class_pattern = r'class\s+(\w+)(?:\(([^)]+)\))?\s*:'
-        matches = re.finditer(class_pattern, content, re.MULTILINE)
+        matches = TextProcessor.CLASS_PATTERN.finditer(content)
 
         for match in matches:
             class_name = match.group(1)
@@ -119,7 +613,7 @@ class TextProcessor:
                 'name': class_name,
                 'inherits_from': inherits_from,
                 'docstring': docstring,
-                'line_start': content[:match.start()].count('\n') + 1
+                'line_start': line_index.line_of(match.start())
             })
 
         return classes
@@ -144,12 +638,11 @@ class TextProcessor:
     @staticmethod
     def _extract_docstring_after_match(content: str, position: int) -> str:
         """Extract docstring starting after a given position."""
-        # Look for triple quotes after the match
-        docstring_pattern = r'""".*?"""'
-        matches = re.findall(docstring_pattern, content[position:position+1000], re.DOTALL)
+        # Look for triple quotes within a window after the match, without slicing
+        match = TextProcessor.DOCSTRING_PATTERN.search(content, position, position + TextProcessor.DOCSTRING_WINDOW)
 
-        if matches:
-            return matches[0].strip('"""').strip()
+        if match:
+            return match.group(0).strip('"""').strip()
 
         return ""
 
@@ -172,34 +665,1820 @@ class TextProcessor:
         return complexity
 
 
+class ComplexityAnalyzer:
+    """Cyclomatic complexity scoring shared by the Python extractors."""
+
+    # Decision points mirror the keywords counted by TextProcessor.calculate_cyclomatic_complexity
+    BRANCH_NODES = (
+        ast.If, ast.IfExp, ast.For, ast.AsyncFor, ast.While, ast.With, ast.AsyncWith,
+        ast.ExceptHandler
+    ) + ((ast.match_case,) if hasattr(ast, 'match_case') else ())
+    TRY_NODES = (ast.Try,) + ((ast.TryStar,) if hasattr(ast, 'TryStar') else ())
+
+    @staticmethod
+    def decision_points(node: ast.AST) -> int:
+        """Return the number of decision points contributed by a single AST node."""
+        if isinstance(node, ComplexityAnalyzer.BRANCH_NODES):
+            return 1
+        if isinstance(node, ComplexityAnalyzer.TRY_NODES):
+            return 1 + (1 if node.finalbody else 0)
+        if isinstance(node, ast.BoolOp):
+            return len(node.values) - 1
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return 1
+        if isinstance(node, ast.comprehension):
+            return 1 + len(node.ifs)
+        return 0
+
+    @staticmethod
+    def file_totals(module_points: int, function_values: List[int]) -> Dict[str, Any]:
+        """Summarize file-level complexity from module and per-function scores."""
+        function_points = sum(value - 1 for value in function_values)
+        return {
+            'total': 1 + module_points + function_points,
+            'module': 1 + module_points,
+            'max_function': max(function_values, default=0),
+            'average_function': round(sum(function_values) / len(function_values), 2) if function_values else 0.0
+        }
+
+
+class PythonASTExtractor:
+    """Single-parse extraction of functions, classes, imports, calls and complexity from Python code."""
+
+    FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+    def __init__(self, content: str):
+        self.content = content
+        self.functions: List[Dict[str, Any]] = []
+        self.classes: List[Dict[str, Any]] = []
+        self.imports: List[str] = []
+        self.import_bindings: List[List[Any]] = []
+
+    @staticmethod
+    def extract(content: str) -> Optional[Dict[str, Any]]:
+        """Extract a file's structure, or return None if it cannot be parsed."""
+        try:
+            tree = ast.parse(content)
+        except (SyntaxError, ValueError):
+            return None
+
+        extractor = PythonASTExtractor(content)
+        module_points = extractor._walk_scope(tree, None, None)
+
+        return {
+            'functions': extractor.functions,
+            'classes': extractor.classes,
+            'imports': extractor.imports,
+            'import_bindings': extractor.import_bindings,
+            'complexity': ComplexityAnalyzer.file_totals(
+                module_points, [func['complexity'] for func in extractor.functions]
+            )
+        }
+
+    def _walk_scope(self, scope: ast.AST, owner_class: Optional[Dict[str, Any]],
+                    calls: Optional[List[str]]) -> int:
+        """Visit a scope in source order, returning its decision points.
+
+        Nested functions and classes are recorded as they are reached and
+        scored separately; `calls` collects call sites for function scopes.
+        """
+        points = 0
+        stack = list(reversed(list(ast.iter_child_nodes(scope))))
+
+        while stack:
+            node = stack.pop()
+
+            if isinstance(node, PythonASTExtractor.FUNCTION_NODES):
+                self._visit_function(node, owner_class)
+                continue
+            if isinstance(node, ast.ClassDef):
+                points += self._visit_class(node)
+                continue
+
+            if isinstance(node, ast.Call) and calls is not None:
+                call_name = PythonASTExtractor._call_name(node.func)
+                if call_name and call_name not in calls:
+                    calls.append(call_name)
+            elif isinstance(node, ast.Import):
+                self.imports.append(', '.join(PythonASTExtractor._alias_text(alias) for alias in node.names))
+                for alias in node.names:
+                    if alias.asname:
+                        self.import_bindings.append([alias.asname, alias.name, 0])
+                    else:
+                        top_level = alias.name.split('.')[0]
+                        self.import_bindings.append([top_level, top_level, 0])
+            elif isinstance(node, ast.ImportFrom):
+                module = '.' * node.level + (node.module or '')
+                names = ', '.join(PythonASTExtractor._alias_text(alias) for alias in node.names)
+                self.imports.append(f"{module} import {names}")
+                for alias in node.names:
+                    if alias.name != '*':
+                        target = f"{node.module}.{alias.name}" if node.module else alias.name
+                        self.import_bindings.append([alias.asname or alias.name, target, node.level])
+
+            points += ComplexityAnalyzer.decision_points(node)
+            stack.extend(reversed(list(ast.iter_child_nodes(node))))
+
+        return points
+
+    def _visit_function(self, node: ast.AST, owner_class: Optional[Dict[str, Any]]) -> None:
+        args = node.args
+        record = {
+            'name': node.name,
+            'parameters': [arg.arg for arg in args.posonlyargs + args.args + args.kwonlyargs],
+            'docstring': ast.get_docstring(node) or "",
+            'line_start': node.lineno,
+            'calls': []
+        }
+        if owner_class is not None:
+            record['class'] = owner_class['name']
+            owner_class['methods'].append(node.name)
+
+        self.functions.append(record)
+        # Methods of classes nested in this function are not methods of owner_class
+        record['complexity'] = 1 + self._walk_scope(node, None, record['calls'])
+
+    def _visit_class(self, node: ast.ClassDef) -> int:
+        record = {
+            'name': node.name,
+            'inherits_from': [ast.get_source_segment(self.content, base) or '' for base in node.bases],
+            'docstring': ast.get_docstring(node) or "",
+            'line_start': node.lineno,
+            'methods': []
+        }
+        self.classes.append(record)
+        # Statements in a class body are evaluated in the enclosing scope
+        return self._walk_scope(node, record, None)
+
+    @staticmethod
+    def _call_name(func: ast.AST) -> Optional[str]:
+        """Return the dotted name of a call target, or None for computed targets."""
+        parts = []
+        while isinstance(func, ast.Attribute):
+            parts.append(func.attr)
+            func = func.value
+        if not isinstance(func, ast.Name):
+            return None
+        parts.append(func.id)
+        return '.'.join(reversed(parts))
+
+    @staticmethod
+    def _alias_text(alias: ast.alias) -> str:
+        return f"{alias.name} as {alias.asname}" if alias.asname else alias.name
+
+
+class TreeSitterEngine:
+    """Tree-sitter extraction for JavaScript/TypeScript, Java and C/C++.
+
+    Grammars and queries are loaded once per process and parsers once per thread. Each
+    file is parsed once, and a single query pass collects definitions, imports, call
+    sites and decision points. tree-sitter is optional: without it, or without a
+    grammar, extract() returns None.
+    """
+
+    _JS_QUERY = """
+        (function_declaration) @function
+        (generator_function_declaration) @function
+        (method_definition) @function
+        (variable_declarator value: [(arrow_function) (function_expression)]) @function
+        (class_declaration) @class
+        (import_statement) @import
+        (call_expression) @call
+        [(if_statement) (for_statement) (for_in_statement) (while_statement) (do_statement)
+         (switch_case) (catch_clause) (ternary_expression)] @branch
+        (binary_expression operator: ["&&" "||" "??"]) @branch
+    """
+    _C_QUERY = """
+        (function_definition) @function
+        (struct_specifier body: (_)) @class
+        (preproc_include) @import
+        (call_expression) @call
+        [(if_statement) (for_statement) (while_statement) (do_statement)
+         (case_statement) (conditional_expression)] @branch
+        (binary_expression operator: ["&&" "||"]) @branch
+    """
+
+    LANGUAGES = {
+        'javascript': {'module': 'tree_sitter_javascript', 'loader': 'language',
+                       'extensions': ('.js', '.jsx', '.mjs', '.cjs'), 'query': _JS_QUERY},
+        'typescript': {'module': 'tree_sitter_typescript', 'loader': 'language_typescript',
+                       'extensions': ('.ts',),
+                       'query': _JS_QUERY.replace("(class_declaration) @class",
+                                                  "[(class_declaration) (abstract_class_declaration) (interface_declaration)] @class")},
+        'tsx': {'module': 'tree_sitter_typescript', 'loader': 'language_tsx', 'extensions': ('.tsx',),
+                'query': _JS_QUERY.replace("(class_declaration) @class",
+                                           "[(class_declaration) (abstract_class_declaration) (interface_declaration)] @class")},
+        'java': {'module': 'tree_sitter_java', 'loader': 'language', 'extensions': ('.java',), 'query': """
+            [(method_declaration) (constructor_declaration)] @function
+            [(class_declaration) (interface_declaration) (enum_declaration) (record_declaration)] @class
+            (import_declaration) @import
+            [(method_invocation) (object_creation_expression)] @call
+            [(if_statement) (for_statement) (enhanced_for_statement) (while_statement) (do_statement)
+             (switch_label) (catch_clause) (ternary_expression)] @branch
+            (binary_expression operator: ["&&" "||"]) @branch
+        """},
+        'c': {'module': 'tree_sitter_c', 'loader': 'language', 'extensions': ('.c', '.h'), 'query': _C_QUERY},
+        'cpp': {'module': 'tree_sitter_cpp', 'loader': 'language',
+                'extensions': ('.cpp', '.cc', '.cxx', '.hpp', '.hh'),
+                'query': _C_QUERY.replace("(struct_specifier body: (_)) @class",
+                                          "[(struct_specifier body: (_)) (class_specifier body: (_))] @class")
+                                 .replace("(do_statement)", "(do_statement) (for_range_loop) (catch_clause)")},
+    }
+
+    EXTENSIONS = {ext: name for name, spec in LANGUAGES.items() for ext in spec['extensions']}
+    HERITAGE_TYPES = ('class_heritage', 'superclass', 'super_interfaces', 'extends_interfaces',
+                      'base_class_clause', 'extends_clause', 'implements_clause', 'extends_type_clause')
+    # Type arguments and call arguments inside a heritage clause are not bases (`B<T>`, `mixin(B)`)
+    HERITAGE_SKIP = ('type_arguments', 'type_parameters', 'template_argument_list', 'arguments')
+    TYPE_NAMES = ('identifier', 'type_identifier', 'scoped_type_identifier', 'qualified_identifier',
+                  'member_expression', 'generic_type', 'scoped_identifier')
+
+    _loaded: Dict[str, Any] = {}
+    _load_lock = threading.Lock()
+    _local = threading.local()
+
+    @classmethod
+    def language_for(cls, extension: str) -> Optional[str]:
+        """Tree-sitter language name handling a file extension."""
+        return cls.EXTENSIONS.get(extension.lower())
+
+    @classmethod
+    def _load(cls, name: str) -> Optional[Tuple[Any, Any]]:
+        """Grammar and compiled query for a language, or None if tree-sitter or the grammar is missing."""
+        if name in cls._loaded:
+            return cls._loaded[name]
+
+        with cls._load_lock:
+            if name not in cls._loaded:
+                spec = cls.LANGUAGES[name]
+                try:
+                    import importlib
+                    import tree_sitter
+                    grammar = importlib.import_module(spec['module'])
+                    language = tree_sitter.Language(getattr(grammar, spec['loader'])())
+                    if hasattr(tree_sitter, 'Query'):
+                        query = tree_sitter.Query(language, spec['query'])
+                    else:
+                        query = language.query(spec['query'])
+                    cls._loaded[name] = (language, query)
+                except Exception:
+                    cls._loaded[name] = None
+        return cls._loaded[name]
+
+    @classmethod
+    def _parser(cls, name: str, language: Any) -> Any:
+        # Parsers are not thread-safe; each thread keeps one per language
+        parsers = getattr(cls._local, 'parsers', None)
+        if parsers is None:
+            parsers = cls._local.parsers = {}
+        parser = parsers.get(name)
+        if parser is None:
+            import tree_sitter
+            parser = tree_sitter.Parser(language)
+            parsers[name] = parser
+        return parser
+
+    @staticmethod
+    def _captures(query: Any, root: Any) -> Dict[str, List[Any]]:
+        """Query captures as {name: [nodes]} across tree-sitter API versions."""
+        try:
+            import tree_sitter
+            cursor_type = getattr(tree_sitter, 'QueryCursor', None)
+        except ImportError:
+            cursor_type = None
+        captures = cursor_type(query).captures(root) if cursor_type else query.captures(root)
+        if isinstance(captures, dict):
+            return captures
+
+        grouped: Dict[str, List[Any]] = {}
+        for node, capture in captures:
+            grouped.setdefault(capture, []).append(node)
+        return grouped
+
+    @classmethod
+    def extract(cls, content: str, extension: str) -> Optional[Dict[str, Any]]:
+        """Extract functions, classes, imports, call sites and complexity in one parse."""
+        name = cls.language_for(extension)
+        loaded = cls._load(name) if name else None
+        if loaded is None:
+            return None
+
+        language, query = loaded
+        tree = cls._parser(name, language).parse(content.encode('utf-8'))
+        captures = cls._captures(query, tree.root_node)
+
+        classes: Dict[int, Dict[str, Any]] = {}
+        for node in sorted(captures.get('class', []), key=lambda n: n.start_byte):
+            class_name = cls._text(node.child_by_field_name('name'))
+            if class_name:
+                classes[node.id] = {
+                    'name': class_name,
+                    'inherits_from': cls._bases(node),
+                    'docstring': cls._leading_comment(node),
+                    'line_start': node.start_point[0] + 1,
+                    'methods': []
+                }
+
+        functions: Dict[int, Dict[str, Any]] = {}
+        for node in sorted(captures.get('function', []), key=lambda n: n.start_byte):
+            func_name = cls._function_name(node)
+            if not func_name:
+                continue
+            record = {
+                'name': func_name,
+                'parameters': cls._parameters(node),
+                'docstring': cls._leading_comment(node),
+                'line_start': node.start_point[0] + 1,
+                'calls': [],
+                'complexity': 1
+            }
+            owner = cls._enclosing(node, classes, functions)
+            if owner is not None and owner in classes:
+                record['class'] = classes[owner]['name']
+                classes[owner]['methods'].append(func_name)
+            elif '::' in func_name:
+                # Out-of-line C++ member definitions (Type::method)
+                scope, record['name'] = func_name.rsplit('::', 1)
+                record['class'] = scope.rsplit('::', 1)[-1]
+                for cls_record in classes.values():
+                    if cls_record['name'] == record['class']:
+                        cls_record['methods'].append(record['name'])
+            functions[node.id] = record
+
+        for node in captures.get('call', []):
+            call = cls._call_name(node)
+            owner = cls._enclosing(node, functions, functions)
+            if call and owner is not None:
+                calls = functions[owner]['calls']
+                if call not in calls:
+                    calls.append(call)
+
+        module_points = 0
+        for node in captures.get('branch', []):
+            owner = cls._enclosing(node, functions, functions)
+            if owner is None:
+                module_points += 1
+            else:
+                functions[owner]['complexity'] += 1
+
+        imports = [cls._text(node).strip().rstrip(';') for node in
+                   sorted(captures.get('import', []), key=lambda n: n.start_byte)]
+        function_list = list(functions.values())
+        return {
+            'functions': function_list,
+            'classes': list(classes.values()),
+            'imports': imports,
+            'import_bindings': [],
+            'complexity': ComplexityAnalyzer.file_totals(module_points, [f['complexity'] for f in function_list])
+        }
+
+    @staticmethod
+    def _text(node: Any) -> str:
+        return node.text.decode('utf-8', errors='replace') if node is not None else ''
+
+    @staticmethod
+    def _enclosing(node: Any, primary: Dict[int, Any], stop: Dict[int, Any]) -> Optional[int]:
+        """Id of the nearest ancestor in `primary`; None once an ancestor in `stop` is not in `primary`."""
+        parent = node.parent
+        while parent is not None:
+            if parent.id in primary:
+                return parent.id
+            if parent.id in stop:
+                return None
+            parent = parent.parent
+        return None
+
+    @classmethod
+    def _function_name(cls, node: Any) -> str:
+        name = node.child_by_field_name('name')
+        if name is not None:
+            return cls._text(name)
+        # C/C++ names sit inside nested declarators: pointer -> function -> identifier
+        declarator = node.child_by_field_name('declarator')
+        while declarator is not None:
+            if declarator.type in ('identifier', 'field_identifier', 'qualified_identifier',
+                                   'destructor_name', 'operator_name'):
+                return cls._text(declarator)
+            declarator = declarator.child_by_field_name('declarator')
+        return ''
+
+    @classmethod
+    def _parameters(cls, node: Any) -> List[str]:
+        params = node.child_by_field_name('parameters')
+        if params is None:
+            value = node.child_by_field_name('value')
+            if value is not None:
+                params = value.child_by_field_name('parameters') or value.child_by_field_name('parameter')
+        declarator = node.child_by_field_name('declarator')
+        while params is None and declarator is not None:
+            params = declarator.child_by_field_name('parameters')
+            declarator = declarator.child_by_field_name('declarator')
+        if params is None:
+            return []
+        if params.type == 'identifier':
+            return [cls._text(params)]
+
+        names = []
+        for param in params.named_children:
+            if param.type.endswith('comment'):
+                continue
+            target = param.child_by_field_name('name') or param.child_by_field_name('pattern') \
+                or param.child_by_field_name('left')
+            inner = param.child_by_field_name('declarator')
+            while target is None and inner is not None:
+                if inner.type in ('identifier', 'field_identifier'):
+                    target = inner
+                inner = inner.child_by_field_name('declarator')
+            if target is None and param.type == 'parameter_declaration':
+                # C `(void)` and unnamed prototype parameters
+                continue
+            names.append(cls._text(target if target is not None else param))
+        return names
+
+    @classmethod
+    def _bases(cls, node: Any) -> List[str]:
+        bases = []
+        for child in node.children:
+            if child.type not in cls.HERITAGE_TYPES and child.child_by_field_name('superclass') is None:
+                continue
+            stack = list(reversed(child.named_children)) if child.type in cls.HERITAGE_TYPES \
+                else [child.child_by_field_name('superclass')]
+            while stack:
+                current = stack.pop()
+                if current.type in cls.TYPE_NAMES:
+                    bases.append(cls._text(current).split('<', 1)[0])
+                elif current.type not in cls.HERITAGE_SKIP:
+                    stack.extend(reversed(current.named_children))
+        superclass = node.child_by_field_name('superclass')
+        if superclass is not None and not bases:
+            bases.append(cls._text(superclass).replace('extends', '').strip())
+        return bases
+
+    @classmethod
+    def _call_name(cls, node: Any) -> str:
+        function = node.child_by_field_name('function')
+        if function is None:
+            # Java: object.name(...) / new Type(...)
+            name = node.child_by_field_name('name') or node.child_by_field_name('type')
+            target = node.child_by_field_name('object')
+            text = cls._text(name)
+            if target is not None:
+                text = f"{cls._text(target)}.{text}"
+        else:
+            text = cls._text(function)
+        text = re.sub(r'\s+', '', text)
+        # `this.x()` resolves like Python's `self.x()` in the symbol index
+        if text.startswith('this.'):
+            text = 'self.' + text[5:]
+        return text if re.fullmatch(r'[\w$.:]+', text) else ''
+
+    @classmethod
+    def _leading_comment(cls, node: Any) -> str:
+        """Text of the comment directly above a definition (or its export wrapper)."""
+        if node.parent is not None and node.parent.type in ('export_statement', 'lexical_declaration', 'variable_declaration'):
+            node = node.parent
+            if node.parent is not None and node.parent.type == 'export_statement':
+                node = node.parent
+        comment = node.prev_named_sibling
+        # Java splits comments into line_comment/block_comment nodes
+        if comment is None or not comment.type.endswith('comment') or node.start_point[0] - comment.end_point[0] > 1:
+            return ''
+        text = cls._text(comment)
+        text = re.sub(r'^/\*+|\*+/$', '', text.strip())
+        lines = [re.sub(r'^\s*(//+|\*)\s?', '', line).strip() for line in text.splitlines()]
+        return '\n'.join(line for line in lines if line)
+
+
+class JacExtractor:
+    """Single-pass lexer and extractor for Jac source.
+
+    One regex scan tokenizes the file. Comments and strings are whole tokens, so keywords
+    inside them are never matched. A small state machine over the tokens records
+    archetypes (node, walker, edge, graph, obj), abilities with their owner, signatures,
+    parameters, docstrings, line numbers, imports, call sites and decision points.
+    """
+
+    TOKEN_PATTERN = re.compile(r'''
+        (?P<comment>\#\*.*?\*\#|\#[^\n]*)
+      | (?P<string>[rRbBfF]{0,2}(?:"""(?:\\.|[^\\])*?"""|\'\'\'(?:\\.|[^\\])*?\'\'\'|"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'))
+      | (?P<name>[A-Za-z_]\w*)
+      | (?P<op>->|[{}()\[\];:,.=])
+    ''', re.VERBOSE | re.DOTALL)
+
+    ARCHETYPES = frozenset(('node', 'walker', 'edge', 'graph', 'obj', 'object', 'class', 'enum'))
+    ABILITIES = frozenset(('can', 'def'))
+    IMPORTS = frozenset(('import', 'include', 'py_module'))
+    DECISIONS = frozenset(('if', 'elif', 'for', 'while', 'except', 'catch', 'and', 'or'))
+    NOT_CALLS = frozenset(('if', 'elif', 'while', 'for', 'return', 'and', 'or', 'not', 'in', 'with',
+                           'can', 'def', 'yield', 'from', 'else', 'except', 'catch', 'raise', 'assert'))
+    STATEMENT_START = (None, ';', '{', '}')
+
+    def __init__(self, content: str):
+        self.content = content
+        self.lines = LineIndex(content)
+        self.functions: List[Dict[str, Any]] = []
+        self.classes: List[Dict[str, Any]] = []
+        self.imports: List[str] = []
+        self.module_points = 0
+
+    @staticmethod
+    def extract(content: str) -> Dict[str, Any]:
+        """Extract a Jac file's structure in one linear scan."""
+        extractor = JacExtractor(content)
+        extractor._scan()
+        return {
+            'functions': extractor.functions,
+            'classes': extractor.classes,
+            'imports': extractor.imports,
+            'import_bindings': [],
+            'complexity': ComplexityAnalyzer.file_totals(
+                extractor.module_points, [func['complexity'] for func in extractor.functions]
+            )
+        }
+
+    def _scan(self) -> None:
+        # Frames: (kind, record) with kind 'archetype', 'ability' or 'block'
+        stack: List[Tuple[str, Optional[Dict[str, Any]]]] = []
+        pending: Optional[Dict[str, Any]] = None
+        previous: Optional[str] = None
+        statement_start = True
+        doc_string = ''
+        comments: List[str] = []
+        comment_line = 0
+        chain: List[str] = []
+        chain_open = False
+        body_start: Optional[Dict[str, Any]] = None
+
+        for match in JacExtractor.TOKEN_PATTERN.finditer(self.content):
+            kind = match.lastgroup
+            text = match.group()
+            start = match.start()
+
+            if kind == 'comment':
+                if text.startswith('#*'):
+                    continue
+                # Full-line comments directly above a declaration document it
+                line_begin = self.content.rfind('\n', 0, start) + 1
+                if self.content[line_begin:start].strip():
+                    continue
+                line = self.lines.line_of(start)
+                if line != comment_line + 1:
+                    comments = []
+                comments.append(text.lstrip('#').strip())
+                comment_line = line
+                continue
+
+            ability = self._innermost(stack, 'ability')
+
+            if pending is not None:
+                if self._continue_declaration(pending, kind, text, start, stack):
+                    previous = text
+                    continue
+                if pending['kind'] != 'import' and text == '{':
+                    body_start = pending['record']
+                pending = None
+                statement_start = True
+                previous = text
+                chain, chain_open = [], False
+                continue
+
+            if kind == 'string':
+                if body_start is not None and previous == '{' and not body_start['docstring']:
+                    body_start['docstring'] = self._string_value(text)
+                elif statement_start:
+                    doc_string = self._string_value(text)
+                body_start = None
+                previous = text
+                chain, chain_open = [], False
+                continue
+            body_start = None
+
+            if kind == 'name':
+                if statement_start and text in JacExtractor.IMPORTS:
+                    pending = {'kind': 'import', 'start': start, 'depth': 0}
+                elif statement_start and (text in JacExtractor.ARCHETYPES or text in JacExtractor.ABILITIES):
+                    docstring = doc_string or self._comment_doc(comments, comment_line, start)
+                    # A comment documents one declaration, not others that follow on the same line
+                    comments = []
+                    pending = {'kind': 'archetype' if text in JacExtractor.ARCHETYPES else 'ability',
+                               'keyword': text, 'record': None, 'docstring': docstring, 'depth': 0,
+                               'start': start, 'owner': self._innermost(stack, 'archetype')}
+                else:
+                    if text in JacExtractor.DECISIONS:
+                        if ability is not None:
+                            ability['complexity'] += 1
+                        else:
+                            self.module_points += 1
+                    if previous == '.':
+                        # Methods called on an expression result (`f(x).g()`) are not attributed
+                        if chain:
+                            chain.append(text)
+                    elif text not in JacExtractor.NOT_CALLS:
+                        chain = [text]
+                    else:
+                        chain = []
+                    chain_open = bool(chain)
+                statement_start = False
+                doc_string = ''
+                previous = text
+                continue
+
+            # Operators
+            if text == '(' and chain_open and previous != '.' and ability is not None:
+                call = '.'.join(chain)
+                if call not in ability['calls']:
+                    ability['calls'].append(call)
+            if text != '.':
+                chain, chain_open = [], False
+
+            if text == '{':
+                stack.append(('block', None))
+            elif text == '}':
+                if stack:
+                    stack.pop()
+            statement_start = text in JacExtractor.STATEMENT_START
+            if statement_start:
+                doc_string = ''
+            previous = text
+
+    def _continue_declaration(self, pending: Dict[str, Any], kind: str, text: str, start: int,
+                              stack: List[Tuple[str, Optional[Dict[str, Any]]]]) -> bool:
+        """Feed a token to the pending declaration; False once the declaration has ended."""
+        if pending['kind'] == 'import':
+            if text == '{':
+                pending['depth'] += 1
+            elif text == '}':
+                pending['depth'] -= 1
+            if (text == ';' and pending['depth'] == 0) or (text == '}' and pending['depth'] == 0):
+                statement = self.content[pending['start']:start + (1 if text == '}' else 0)]
+                self.imports.append(re.sub(r'\s+', ' ', statement).strip())
+                return False
+            return True
+
+        record = pending['record']
+        if record is None:
+            if kind != 'name':
+                # A keyword used as an identifier (e.g. `node = ...`): not a declaration
+                return False
+            record = pending['record'] = self._open_record(pending, text, start)
+            pending['signature_start'] = start + len(text)
+            pending['last_name'] = None
+            return True
+
+        if text in ('(', '['):
+            pending['depth'] += 1
+        elif text in (')', ']'):
+            pending['depth'] -= 1
+        elif text == '->':
+            pending['returns'] = True
+        elif kind == 'name':
+            if pending['kind'] == 'archetype' and pending['keyword'] == 'edge' and pending['depth']:
+                record.setdefault('endpoints', []).append(text)
+            elif pending['kind'] == 'archetype':
+                record['inherits_from'].append(text)
+            pending['last_name'] = text
+            return True
+        elif text == ':' and pending['kind'] == 'ability' and not pending.get('returns') \
+                and pending['depth'] <= 1 and pending['last_name']:
+            record['parameters'].append(pending['last_name'])
+        elif (text == '{' or text == ';') and pending['depth'] == 0:
+            if pending['kind'] == 'ability':
+                record['signature'] = re.sub(r'\s+', ' ', self.content[pending['signature_start']:start]).strip()
+            if text == '{':
+                stack.append((pending['kind'], record))
+            return False
+        pending['last_name'] = None
+        return True
+
+    def _open_record(self, pending: Dict[str, Any], name: str, start: int) -> Dict[str, Any]:
+        line = self.lines.line_of(pending['start'])
+        owner = pending['owner']
+        if pending['kind'] == 'archetype':
+            record = {'name': name, 'kind': pending['keyword'], 'inherits_from': [],
+                      'docstring': pending['docstring'], 'line_start': line, 'methods': []}
+            self.classes.append(record)
+            return record
+
+        record = {'name': name, 'parameters': [], 'docstring': pending['docstring'], 'line_start': line,
+                  'calls': [], 'complexity': 1, 'signature': ''}
+        if owner is not None:
+            record['class'] = owner['name']
+            owner['methods'].append(name)
+        self.functions.append(record)
+        return record
+
+    @staticmethod
+    def _innermost(stack: List[Tuple[str, Optional[Dict[str, Any]]]], kind: str) -> Optional[Dict[str, Any]]:
+        for frame_kind, record in reversed(stack):
+            if frame_kind == kind:
+                return record
+        return None
+
+    def _comment_doc(self, comments: List[str], comment_line: int, start: int) -> str:
+        if comments and comment_line == self.lines.line_of(start) - 1:
+            return '\n'.join(comments)
+        return ''
+
+    @staticmethod
+    def _string_value(text: str) -> str:
+        body = text.lstrip('rRbBfF')
+        quote = body[:3] if body[:3] in ('"""', "'''") else body[:1]
+        return body[len(quote):-len(quote)].strip()
+
+
+class SymbolIndex:
+    """Definitions keyed by qualified name, with secondary indexes by short name and by file."""
+
+    def __init__(self):
+        self.definitions: Dict[str, Dict[str, Any]] = {}
+        self.by_name: Dict[str, List[str]] = {}
+        self.by_file: Dict[str, List[str]] = {}
+        self._modules: Dict[str, str] = {}
+        self._bindings: Dict[str, Dict[str, str]] = {}
+
+    @staticmethod
+    def module_name(relative_path: str) -> str:
+        """Convert a repository-relative file path to a dotted module name."""
+        module = os.path.splitext(relative_path)[0].replace(os.sep, '.').replace('/', '.')
+        if module.endswith('.__init__'):
+            module = module[:-len('.__init__')]
+        return module
+
+    def add_file(self, file_path: str, relative_path: str, result: Dict[str, Any]) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Register a file's definitions, returning (qualified name, kind, record) triples."""
+        module = SymbolIndex.module_name(relative_path)
+        self._modules[file_path] = module
+        self._bindings[file_path] = self._resolve_bindings(module, relative_path, result.get('import_bindings', []))
+
+        added = []
+        for cls in result.get('classes', []):
+            added.append((self._register(f"{module}.{cls['name']}", cls['name'], 'class', file_path), 'class', cls))
+        for func in result.get('functions', []):
+            owner = f"{func['class']}." if func.get('class') else ""
+            qualified = f"{module}.{owner}{func['name']}"
+            added.append((self._register(qualified, func['name'], 'function', file_path), 'function', func))
+        return added
+
+    def _register(self, qualified: str, name: str, kind: str, file_path: str) -> str:
+        if qualified in self.definitions:
+            # Redefinitions in the same module (e.g. conditional defs) stay addressable
+            suffix = 2
+            while f"{qualified}#{suffix}" in self.definitions:
+                suffix += 1
+            qualified = f"{qualified}#{suffix}"
+
+        self.definitions[qualified] = {'name': name, 'kind': kind, 'file': file_path}
+        self.by_name.setdefault(name, []).append(qualified)
+        self.by_file.setdefault(file_path, []).append(qualified)
+        return qualified
+
+    @staticmethod
+    def _resolve_bindings(module: str, relative_path: str, bindings: List[List[Any]]) -> Dict[str, str]:
+        """Map local import names to absolute dotted targets."""
+        package = module.split('.')
+        if not os.path.basename(relative_path).startswith('__init__.'):
+            package = package[:-1]
+
+        resolved = {}
+        for local, target, level in bindings:
+            if level:
+                base = package[:len(package) - (level - 1)] if level > 1 else package
+                target = '.'.join(base + [target]) if base else target
+            resolved[local] = target
+        return resolved
+
+    def resolve(self, call: str, file_path: str, owner_class: Optional[str] = None) -> Optional[str]:
+        """Resolve a call site in a file to a qualified definition name."""
+        module = self._modules.get(file_path, '')
+        parts = call.split('.')
+
+        if parts[0] in ('self', 'cls') and len(parts) == 2:
+            if owner_class:
+                candidate = f"{module}.{owner_class}.{parts[1]}"
+                if candidate in self.definitions:
+                    return candidate
+            return self._unique(parts[1])
+
+        # Same-module definitions shadow imports of the same name
+        candidate = f"{module}.{call}"
+        if candidate in self.definitions:
+            return candidate
+
+        binding = self._bindings.get(file_path, {}).get(parts[0])
+        if binding:
+            candidate = '.'.join([binding] + parts[1:])
+            if candidate in self.definitions:
+                return candidate
+            # Modules imported relative to a source root (e.g. src/ layouts)
+            for definition in self.by_name.get(parts[-1], []):
+                if definition.endswith(f".{candidate}"):
+                    return definition
+            return None
+
+        return self._unique(call) if len(parts) == 1 else None
+
+    def _unique(self, name: str) -> Optional[str]:
+        candidates = self.by_name.get(name, [])
+        return candidates[0] if len(candidates) == 1 else None
+
+    def imported_modules(self, file_path: str) -> List[str]:
+        """Absolute dotted targets imported by a file, sorted and distinct."""
+        return sorted(set(self._bindings.get(file_path, {}).values()))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the secondary indexes as plain data."""
+        return {'by_name': self.by_name, 'by_file': self.by_file}
+
+
+class ImportGraph:
+    """File-level import graph of a repository: resolved edges, cycles, layers and a reverse index.
+
+    Nodes are repository-relative paths. Imports that do not resolve to a repository
+    file (standard library, third-party packages, system headers) are left out.
+    """
+
+    QUOTED = re.compile(r'''["']([^"']+)["']''')
+    DOTTED = re.compile(r'^(?:import|include)(?::\w+)?\s+(?:static\s+)?(?:from\s+)?(\.*[\w.]*\w)')
+    C_FAMILY = {'.c', '.h', '.cpp', '.cc', '.cxx', '.hpp', '.hh', '.hxx'}
+
+    def __init__(self):
+        self.edges: Dict[str, List[str]] = {}
+        self.dependents: Dict[str, List[str]] = {}
+        self._pending: Dict[str, Tuple[List[str], List[str]]] = {}
+
+    def add_file(self, relative_path: str, targets: List[str], imports: List[str]) -> None:
+        """Queue a file with its absolute dotted targets and raw import strings for resolution."""
+        self._pending[relative_path.replace(os.sep, '/')] = (targets, imports)
+
+    def resolve(self) -> 'ImportGraph':
+        """Resolve every queued file's imports against the set of queued files."""
+        paths = sorted(self._pending)
+        modules: Dict[str, List[str]] = {}
+        suffixes: Dict[str, List[str]] = {}
+        stems: Dict[str, str] = {}
+        for path in paths:
+            module = SymbolIndex.module_name(path)
+            modules.setdefault(module, []).append(path)
+            # Trailing module components, for src/ and Java source-root layouts; at least two components
+            parts = module.split('.')
+            for start in range(1, len(parts) - 1):
+                suffixes.setdefault('.'.join(parts[start:]), []).append(path)
+            stems.setdefault(posixpath.splitext(path)[0], path)
+
+        for path in paths:
+            targets, imports = self._pending[path]
+            found = set()
+            for target in targets:
+                found.add(self._resolve_module(path, target, modules, suffixes))
+            for spec in imports:
+                found.add(self._resolve_import(path, spec, modules, suffixes, stems))
+            found.discard(None)
+            found.discard(path)
+            self.edges[path] = sorted(found)
+
+        self._pending = {}
+        self._index_dependents()
+        return self
+
+    def _index_dependents(self) -> None:
+        self.dependents = {path: [] for path in self.edges}
+        for path, deps in self.edges.items():
+            for dep in deps:
+                self.dependents[dep].append(path)
+
+    @staticmethod
+    def _pick(candidates: List[str], importer: str) -> str:
+        # utils.py and utils.jac share a module name; prefer the importer's own language
+        extension = posixpath.splitext(importer)[1]
+        for candidate in candidates:
+            if candidate.endswith(extension):
+                return candidate
+        return candidates[0]
+
+    def _resolve_module(self, importer: str, target: str, modules: Dict[str, List[str]],
+                        suffixes: Dict[str, List[str]]) -> Optional[str]:
+        """Resolve a dotted target to the file of its longest importable prefix."""
+        package = SymbolIndex.module_name(importer).split('.')[:-1]
+        if posixpath.basename(importer).startswith('__init__.'):
+            package = SymbolIndex.module_name(importer).split('.')
+
+        level = len(target) - len(target.lstrip('.'))
+        target = target[level:]
+        if level:
+            base = package[:len(package) - (level - 1)] if level > 1 else package
+            target = '.'.join(base + [target]) if target else '.'.join(base)
+        if not target:
+            return None
+
+        parts = target.split('.')
+        for end in range(len(parts), 0, -1):
+            name = '.'.join(parts[:end])
+            if name in modules:
+                return ImportGraph._pick(modules[name], importer)
+            if not level:
+                # Script-style sibling import (`import utils` next to utils.py)
+                sibling = '.'.join(package + [name])
+                if package and sibling in modules:
+                    return ImportGraph._pick(modules[sibling], importer)
+                if len(suffixes.get(name, ())) == 1:
+                    return suffixes[name][0]
+        return None
+
+    def _resolve_import(self, importer: str, spec: str, modules: Dict[str, List[str]],
+                        suffixes: Dict[str, List[str]], stems: Dict[str, str]) -> Optional[str]:
+        """Resolve one raw import string: a quoted path, a keyword import, or a bare Python module."""
+        extension = posixpath.splitext(importer)[1]
+        quoted = ImportGraph.QUOTED.search(spec)
+        if quoted:
+            path = quoted.group(1)
+            directory = posixpath.dirname(importer)
+            if path.startswith('.'):
+                bases = [directory]
+            elif extension in ImportGraph.C_FAMILY and spec.startswith('#include'):
+                bases = [directory, '']
+            else:
+                return None
+            # py_module always names a Python file; otherwise prefer the importer's own language
+            preferred = '.py' if spec.startswith('py_module') else extension
+            for base in bases:
+                candidate = posixpath.normpath(posixpath.join(base, path))
+                for key in (candidate, candidate + preferred):
+                    if key in self._pending:
+                        return key
+                for key in (candidate, candidate + '/index'):
+                    if key in stems:
+                        return stems[key]
+            return None
+
+        match = ImportGraph.DOTTED.match(spec)
+        if match:
+            target = match.group(1)
+        elif extension == '.py' and ' import ' not in spec:
+            # `import a.b as c`: the binding only records `a`, the string keeps the full module
+            target = spec.split(' as ')[0].strip()
+        else:
+            return None
+        return self._resolve_module(importer, target, modules, suffixes)
+
+    def strongly_connected_components(self) -> List[List[str]]:
+        """Tarjan's algorithm, iterative; components come out dependencies-first."""
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack = set()
+        stack: List[str] = []
+        components: List[List[str]] = []
+
+        for root in sorted(self.edges):
+            if root in index:
+                continue
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self.edges[root]))]
+            while work:
+                node, children = work[-1]
+                for child in children:
+                    if child not in index:
+                        index[child] = lowlink[child] = len(index)
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(self.edges.get(child, ()))))
+                        break
+                    if child in on_stack:
+                        lowlink[node] = min(lowlink[node], index[child])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(sorted(component))
+        return components
+
+    def layers(self, components: Optional[List[List[str]]] = None) -> List[List[str]]:
+        """Topological layers of the condensation: layer 0 imports nothing in the repository."""
+        components = components if components is not None else self.strongly_connected_components()
+        level: Dict[str, int] = {}
+        layers: List[List[str]] = []
+        for component in components:
+            members = set(component)
+            depth = max((level[dep] + 1 for member in component
+                         for dep in self.edges.get(member, ()) if dep not in members), default=0)
+            for member in component:
+                level[member] = depth
+            while len(layers) <= depth:
+                layers.append([])
+            layers[depth].extend(component)
+        return [sorted(layer) for layer in layers]
+
+    def affected_by(self, paths: List[str]) -> List[str]:
+        """The given files plus every file that transitively imports one of them."""
+        seen = {path.replace(os.sep, '/') for path in paths}
+        queue = deque(seen)
+        while queue:
+            for dependent in self.dependents.get(queue.popleft(), ()):
+                if dependent not in seen:
+                    seen.add(dependent)
+                    queue.append(dependent)
+        return sorted(seen)
+
+    def to_dict(self, changed: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Edges, reverse index, cycles and layers as plain data; `changed` adds the affected set."""
+        components = self.strongly_connected_components()
+        data = {
+            'edges': self.edges,
+            'dependents': {path: sorted(deps) for path, deps in self.dependents.items()},
+            'cycles': [component for component in components if len(component) > 1],
+            'layers': self.layers(components),
+        }
+        if changed is not None:
+            data['changed'] = sorted(path.replace(os.sep, '/') for path in changed)
+            data['affected'] = self.affected_by(changed)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ImportGraph':
+        """Rebuild a graph from `to_dict` output, e.g. the `import_graph` of a saved analysis.json."""
+        graph = cls()
+        graph.edges = {path: list(deps) for path, deps in data.get('edges', {}).items()}
+        graph._index_dependents()
+        return graph
+
+
+class FilePathTable:
+    """Interns file paths so records store a small integer instead of a path string."""
+
+    __slots__ = ('paths', '_ids')
+
+    def __init__(self):
+        self.paths: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def intern(self, path: str) -> int:
+        """Return the id for a path, assigning one on first use."""
+        file_id = self._ids.get(path)
+        if file_id is None:
+            file_id = len(self.paths)
+            self.paths.append(path)
+            self._ids[path] = file_id
+        return file_id
+
+
+class DocstringSpool:
+    """Docstrings spilled to a temporary file and read back only when accessed."""
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile()
+        self._offsets = array('q')
+        self._lengths = array('q')
+        self._end = 0
+        self._lock = threading.Lock()
+
+    def add(self, text: str) -> int:
+        """Spool a docstring and return its id; empty docstrings are not stored."""
+        if not text:
+            return -1
+        data = text.encode('utf-8')
+        with self._lock:
+            self._file.seek(self._end)
+            self._file.write(data)
+            self._offsets.append(self._end)
+            self._lengths.append(len(data))
+            self._end += len(data)
+            return len(self._offsets) - 1
+
+    def get(self, doc_id: int) -> str:
+        """Load a docstring by id."""
+        if doc_id < 0:
+            return ""
+        with self._lock:
+            self._file.seek(self._offsets[doc_id])
+            return self._file.read(self._lengths[doc_id]).decode('utf-8')
+
+    @property
+    def size(self) -> int:
+        """Bytes written to the spool file."""
+        return self._end
+
+    def close(self) -> None:
+        """Delete the spool file."""
+        self._file.close()
+
+
+class FunctionRecord:
+    """Compact function or method definition."""
+
+    __slots__ = ('name', 'file_id', 'owner', 'line_start', 'complexity',
+                 'parameters', 'calls', 'called_by', 'doc_id')
+
+
+class ClassRecord:
+    """Compact class definition."""
+
+    __slots__ = ('name', 'file_id', 'line_start', 'methods', 'inherits_from', 'doc_id')
+
+
+class RecordView(Mapping):
+    """Read-only dict-like view that materializes records as plain dicts on access."""
+
+    def __init__(self, records: Dict[str, Any], to_dict: Any):
+        self._records = records
+        self._to_dict = to_dict
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        return self._to_dict(key, self._records[key])
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._records
+
+
+class CompactSymbolStore:
+    """Slotted function/class records with interned file paths and lazily loaded docstrings."""
+
+    def __init__(self):
+        self.files = FilePathTable()
+        self.docstrings = DocstringSpool()
+        self.functions: Dict[str, FunctionRecord] = {}
+        self.classes: Dict[str, ClassRecord] = {}
+
+    def add_function(self, qualified_name: str, file_path: str, data: Dict[str, Any]) -> None:
+        """Store a function from an extractor record."""
+        record = FunctionRecord()
+        record.name = data['name']
+        record.file_id = self.files.intern(file_path)
+        record.owner = data.get('class')
+        record.line_start = data.get('line_start')
+        record.complexity = data.get('complexity')
+        record.parameters = tuple(data.get('parameters', ()))
+        record.calls = tuple(data.get('calls', ()))
+        record.called_by = ()
+        record.doc_id = self.docstrings.add(data.get('docstring', ''))
+        self.functions[qualified_name] = record
+
+    def add_class(self, qualified_name: str, file_path: str, data: Dict[str, Any]) -> None:
+        """Store a class from an extractor record."""
+        record = ClassRecord()
+        record.name = data['name']
+        record.file_id = self.files.intern(file_path)
+        record.line_start = data.get('line_start')
+        record.methods = tuple(data.get('methods', ()))
+        record.inherits_from = tuple(data.get('inherits_from', ()))
+        record.doc_id = self.docstrings.add(data.get('docstring', ''))
+        self.classes[qualified_name] = record
+
+    def file_of(self, record: Any) -> str:
+        """Return the file path of a record."""
+        return self.files.paths[record.file_id]
+
+    def set_calls(self, qualified_name: str, targets: List[str]) -> None:
+        """Replace a function's call sites with distinct resolved targets and record the reverse edges."""
+        self.functions[qualified_name].calls = tuple(targets)
+        for target in targets:
+            callee = self.functions[target]
+            # Most functions have no callers; the list is only allocated on first use
+            if not callee.called_by:
+                callee.called_by = [qualified_name]
+            else:
+                callee.called_by.append(qualified_name)
+
+    def function_dict(self, qualified_name: str, record: FunctionRecord) -> Dict[str, Any]:
+        """Materialize a function record in the analysis dict format."""
+        entry = {
+            "name": record.name,
+            "file": self.files.paths[record.file_id],
+            "calls": list(record.calls),
+            "called_by": list(record.called_by),
+            "parameters": list(record.parameters),
+            "docstring": self.docstrings.get(record.doc_id)
+        }
+        if record.owner is not None:
+            entry["class"] = record.owner
+        if record.line_start is not None:
+            entry["line_start"] = record.line_start
+        if record.complexity is not None:
+            entry["complexity"] = record.complexity
+        return entry
+
+    def class_dict(self, qualified_name: str, record: ClassRecord) -> Dict[str, Any]:
+        """Materialize a class record in the analysis dict format."""
+        entry = {
+            "name": record.name,
+            "file": self.files.paths[record.file_id],
+            "methods": list(record.methods),
+            "inherits_from": list(record.inherits_from),
+            "docstring": self.docstrings.get(record.doc_id)
+        }
+        if record.line_start is not None:
+            entry["line_start"] = record.line_start
+        return entry
+
+    def functions_view(self) -> RecordView:
+        """Dict-like view of functions keyed by qualified name."""
+        return RecordView(self.functions, self.function_dict)
+
+    def classes_view(self) -> RecordView:
+        """Dict-like view of classes keyed by qualified name."""
+        return RecordView(self.classes, self.class_dict)
+
+    def call_graph_view(self) -> RecordView:
+        """Dict-like view of call edges keyed by qualified function name."""
+        return RecordView(self.functions, self._call_graph_dict)
+
+    @staticmethod
+    def _call_graph_dict(qualified_name: str, record: FunctionRecord) -> Dict[str, Any]:
+        entry = {"calls": list(record.calls), "called_by": list(record.called_by)}
+        if record.owner is not None:
+            entry["class"] = record.owner
+        return entry
+
+    def inheritance_view(self) -> RecordView:
+        """Dict-like view of base classes and methods keyed by qualified class name."""
+        return RecordView(self.classes, lambda name, record: {
+            "inherits_from": list(record.inherits_from),
+            "methods": list(record.methods)
+        })
+
+    @staticmethod
+    def json_default(value: Any) -> Any:
+        """`default` hook for json.dump that serializes record views as dicts."""
+        if isinstance(value, Mapping):
+            return dict(value)
+        return str(value)
+
+    def close(self) -> None:
+        """Release the docstring spool."""
+        self.docstrings.close()
+
+
+class AnalysisTimeout(Exception):
+    """Raised when a single file exceeds its analysis time budget."""
+
+
+class FileAnalyzer:
+    """Per-file analysis producing plain, cacheable results."""
+
+    @staticmethod
+    def analyze_content(content: str, extension: str) -> Dict[str, Any]:
+        """Analyze file content according to its extension."""
+        if extension == '.py':
+            return FileAnalyzer.analyze_python(content)
+        if extension == '.jac':
+            return FileAnalyzer.analyze_jac(content)
+        if TreeSitterEngine.language_for(extension):
+            result = TreeSitterEngine.extract(content, extension)
+            if result is not None:
+                return result
+        return {'functions': [], 'classes': [], 'imports': []}
+
+    @staticmethod
+    @contextmanager
+    def time_limit(seconds: float):
+        """Raise AnalysisTimeout after `seconds`; only armed in a process's main thread."""
+        if not seconds or not hasattr(signal, 'setitimer') or threading.current_thread() is not threading.main_thread():
+            yield
+            return
+
+        def on_alarm(signum, frame):
+            raise AnalysisTimeout()
+
+        previous = signal.signal(signal.SIGALRM, on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, seconds)
+        try:
+            yield
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+    @staticmethod
+    def analyze_bounded(content: str, extension: str, timeout: float = 0.0) -> Dict[str, Any]:
+        """Analyze within a time budget; over-budget files come back as {'skipped': 'file_timeout'}."""
+        try:
+            with FileAnalyzer.time_limit(timeout):
+                return FileAnalyzer.analyze_content(content, extension)
+        except AnalysisTimeout:
+            return {'skipped': 'file_timeout'}
+
+    @staticmethod
+    def analyze_python(content: str) -> Dict[str, Any]:
+        """Extract functions, classes, imports and call sites from Python code."""
+        result = PythonASTExtractor.extract(content)
+        if result is not None:
+            return result
+
+        # Unparseable source falls back to the regex extractors
+        line_index = LineIndex(content)
+        functions = TextProcessor.extract_functions_python(content, line_index)
+        classes = TextProcessor.extract_classes_python(content, line_index)
+        imports = TextProcessor.extract_imports_python(content)
+
+        complexity = TextProcessor.calculate_cyclomatic_complexity(content)
+        for func in functions:
+            func['complexity'] = complexity
+
+        return {
+            'functions': functions,
+            'classes': classes,
+            'imports': imports,
+            'complexity': {'total': complexity, 'module': complexity, 'max_function': 0, 'average_function': 0.0}
+        }
+
+    @staticmethod
+    def analyze_jac(content: str) -> Dict[str, Any]:
+        """Extract archetypes, abilities, imports and call sites from Jac code."""
+        return JacExtractor.extract(content)
+
+
+def _analyze_chunk(chunk: List[Tuple[str, str]], file_timeout: float = 0.0,
+                   deadline: Optional[float] = None) -> List[Optional[Dict[str, Any]]]:
+    """Process pool entry point: analyze a chunk of (content, extension) pairs.
+
+    Files not started before the deadline come back as None.
+    """
+    results = []
+    for content, extension in chunk:
+        if deadline is not None and time.time() >= deadline:
+            results.append(None)
+        else:
+            results.append(FileAnalyzer.analyze_bounded(content, extension, file_timeout))
+    return results
+
+
+class ParallelAnalyzer:
+    """Spread per-file analysis across a process pool, returning results in input order."""
+
+    # Seconds a worker gets past `file_timeout` to report back before it is killed
+    ISOLATION_GRACE = 1.0
+
+    def __init__(self, workers: int = 0, min_files: int = 32, chunk_bytes: int = 1024 * 1024):
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.min_files = min_files
+        self.chunk_bytes = chunk_bytes
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'ParallelAnalyzer':
+        """Create an analyzer from the `analysis.parallel` section of config.json."""
+        settings = config.get('analysis', {}).get('parallel', {})
+        if not settings.get('enabled', True):
+            return cls(workers=1)
+        return cls(
+            workers=settings.get('workers', 0),
+            min_files=settings.get('min_files', 32),
+            chunk_bytes=settings.get('chunk_bytes', 1024 * 1024)
+        )
+
+    def make_chunks(self, items: List[Tuple[str, str]]) -> List[List[int]]:
+        """Split item indices into contiguous chunks of roughly equal content size."""
+        total = sum(len(content) for content, _ in items)
+        # Aim for several chunks per worker so large files do not leave cores idle
+        target = max(1, min(self.chunk_bytes, total // (self.workers * 4)))
+
+        chunks = []
+        current = []
+        current_size = 0
+        for index, (content, _) in enumerate(items):
+            current.append(index)
+            current_size += len(content)
+            if current_size >= target:
+                chunks.append(current)
+                current = []
+                current_size = 0
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def analyze(self, items: List[Tuple[str, str]], file_timeout: float = 0.0,
+                deadline: Optional[float] = None) -> List[Optional[Dict[str, Any]]]:
+        """Analyze (content, extension) pairs, in parallel when worthwhile.
+
+        Files over `file_timeout` come back as {'skipped': 'file_timeout'}, and files not
+        finished by the wall-clock `deadline` as None.
+        """
+        if not items:
+            return []
+        if self.workers <= 1 or len(items) < self.min_files:
+            if file_timeout:
+                # SIGALRM only fires on the main thread and cannot stop C-level parsing
+                # (ast.parse, tree-sitter), so run files in a worker that can be killed
+                return self._analyze_isolated(items, file_timeout, deadline)
+            return _analyze_chunk(items, file_timeout, deadline)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        chunks = self.make_chunks(items)
+
+        pool = ProcessPoolExecutor(max_workers=max(1, min(self.workers, len(chunks))),
+                                   mp_context=ParallelAnalyzer.mp_context())
+        timed_out = False
+        try:
+            futures = [pool.submit(_analyze_chunk, [items[i] for i in chunk], file_timeout, deadline)
+                       for chunk in chunks]
+            for chunk, future in zip(chunks, futures):
+                try:
+                    chunk_results = future.result(
+                        timeout=None if deadline is None else max(0.0, deadline - time.time()))
+                except FutureTimeoutError:
+                    timed_out = True
+                    break
+                for index, result in zip(chunk, chunk_results):
+                    results[index] = result
+        finally:
+            if timed_out:
+                # Past the deadline a worker may be stuck inside one file: kill it rather than leave it running
+                ParallelAnalyzer._terminate(pool)
+            pool.shutdown(wait=True, cancel_futures=True)
+
+        return results
+
+    def _analyze_isolated(self, items: List[Tuple[str, str]], file_timeout: float,
+                          deadline: Optional[float]) -> List[Optional[Dict[str, Any]]]:
+        """Analyze files one at a time in a single worker, killing it when a file overruns its timeout."""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        pool = None
+        try:
+            for index, (content, extension) in enumerate(items):
+                if deadline is not None and time.time() >= deadline:
+                    break
+                if pool is None:
+                    pool = ProcessPoolExecutor(max_workers=1, mp_context=ParallelAnalyzer.mp_context())
+                    # Start the worker up front so its startup does not count against the first file
+                    pool.submit(int).result()
+                future = pool.submit(FileAnalyzer.analyze_bounded, content, extension, file_timeout)
+                wait = file_timeout + self.ISOLATION_GRACE
+                if deadline is not None:
+                    wait = min(wait, max(0.0, deadline - time.time()))
+                try:
+                    results[index] = future.result(timeout=wait)
+                except FutureTimeoutError:
+                    ParallelAnalyzer._terminate(pool)
+                    pool.shutdown(wait=True, cancel_futures=True)
+                    pool = None
+                    if deadline is not None and time.time() >= deadline:
+                        break
+                    results[index] = {'skipped': 'file_timeout'}
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+        return results
+
+    @staticmethod
+    def mp_context() -> multiprocessing.context.BaseContext:
+        """Start method for worker processes.
+
+        Callers run on job-queue and batch threads, and a child forked from a threaded
+        parent can inherit locks held mid-operation, so workers are never forked directly.
+        """
+        methods = multiprocessing.get_all_start_methods()
+        return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+    @staticmethod
+    def _terminate(pool: ProcessPoolExecutor) -> None:
+        """Kill a pool's worker processes and reap them."""
+        if hasattr(pool, 'terminate_workers'):
+            pool.terminate_workers()
+            return
+        # Before Python 3.14 the executor has no public way to stop a running worker
+        processes = list((getattr(pool, '_processes', None) or {}).values())
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.kill()
+                process.join()
+
+
+class AnalysisCache:
+    """On-disk cache of per-file analysis results keyed by content hash."""
+
+    def __init__(self, directory: str, max_size: int = 256 * 1024 * 1024, enabled: bool = True):
+        self.directory = directory
+        self.max_size = max_size
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'AnalysisCache':
+        """Create a cache from the `cache` section of config.json."""
+        settings = config.get('cache', {})
+        return cls(
+            directory=settings.get('directory', './.cache/analysis'),
+            max_size=settings.get('max_size', 256 * 1024 * 1024),
+            enabled=settings.get('enabled', True)
+        )
+
+    @staticmethod
+    def make_key(content: str, extension: str) -> str:
+        """Build a cache key from analyzer version, extension and file content."""
+        digest = hashlib.sha256()
+        digest.update(f"{ANALYZER_VERSION}\0{extension}\0".encode('utf-8'))
+        digest.update(content.encode('utf-8', errors='surrogatepass'))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for a key, or None on a miss."""
+        if not self.enabled:
+            return None
+
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+            # Touch the entry so eviction sees it as recently used
+            os.utime(entry_path, None)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a result and evict least recently used entries if over the size limit."""
+        if not self.enabled:
+            return
+
+        entry_path = self._entry_path(key)
+        try:
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            data = json.dumps(result, separators=(',', ':')).encode('utf-8')
+            try:
+                replaced = os.path.getsize(entry_path)
+            except OSError:
+                replaced = 0
+            # A unique temp file per write, so threads of one process never share it
+            fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(entry_path))
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, entry_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Warning: could not write analysis cache entry {key}: {e}")
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data) - replaced
+
+            if self._size > self.max_size:
+                self._evict()
+
+    def _list_entries(self) -> List[tuple]:
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+
+        for bucket in os.scandir(self.directory):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                if entry.name.endswith('.json'):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._list_entries())
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache is below 90% of its limit."""
+        entries = sorted(self._list_entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_size * 0.9)
+
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+        self._size = total
+
+
 class CodeMetrics:
-    """Class for calculating code metrics and statistics."""
+    """Class for calculating code metrics and statistics.
+
+    Files are counted in one streaming pass, and the project keeps running totals
+    per extension and per language, so memory does not grow with the file count.
+    """
+
+    # (line comment prefixes, (block start, block end)) for types not listed in config.json
+    DEFAULT_COMMENT_SYNTAX = {
+        '.py': (('#',), None),
+        '.jac': (('#',), ('#*', '*#')),
+        '.sh': (('#',), None),
+        '.yaml': (('#',), None),
+        '.yml': (('#',), None),
+        '.ps1': (('#',), ('<#', '#>')),
+        '.bat': (('REM ', 'rem ', '::'), None),
+        '.html': ((), ('<!--', '-->')),
+        '.xml': ((), ('<!--', '-->')),
+        '.md': ((), ('<!--', '-->')),
+        '.css': ((), ('/*', '*/')),
+        '.js': (('//',), ('/*', '*/')),
+        '.ts': (('//',), ('/*', '*/')),
+        '.java': (('//',), ('/*', '*/')),
+        '.c': (('//',), ('/*', '*/')),
+        '.cpp': (('//',), ('/*', '*/')),
+        '.h': (('//',), ('/*', '*/')),
+    }
+    NO_COMMENTS = ((), None)
+    # Longest first so '"""' is not read as an empty '""' string; only the last three may span lines
+    STRING_DELIMITERS = ('"""', "'''", '`', '"', "'")
+    MULTILINE_STRINGS = ('"""', "'''", '`')
+    _scanners: Dict[Tuple, Any] = {}
+    DECISION_PATTERN = re.compile(r'\b(?:if|elif|for|while|case|catch|except)\b|&&|\|\||\b(?:and|or)\b')
 
     @staticmethod
-    def calculate_file_metrics(file_path: str) -> Dict[str, Any]:
-        """Calculate metrics for a single file."""
-        content = FileUtils.read_file_content(file_path)
-        if not content:
-            return {}
+    def comment_syntax(config: Dict[str, Any]) -> Dict[str, Tuple[Tuple[str, ...], Optional[Tuple[str, str]]]]:
+        """Comment syntax per extension, from `agents.code_analyzer.languages` over the defaults."""
+        syntax = dict(CodeMetrics.DEFAULT_COMMENT_SYNTAX)
+        for language in config.get('agents', {}).get('code_analyzer', {}).get('languages', []):
+            if 'line_comment' not in language and 'block_comment' not in language:
+                continue
+            line = language.get('line_comment') or ()
+            block = language.get('block_comment')
+            for ext in language.get('extensions', []):
+                syntax[ext] = ((line,) if isinstance(line, str) else tuple(line), tuple(block) if block else None)
+        return syntax
+
+    @staticmethod
+    def language_names(config: Dict[str, Any]) -> Dict[str, str]:
+        """Language name per extension from `agents.code_analyzer.languages`."""
+        names = {}
+        for language in config.get('agents', {}).get('code_analyzer', {}).get('languages', []):
+            for ext in language.get('extensions', []):
+                names[ext] = language['name']
+        return names
 
-        lines = content.split('\n')
-        total_lines = len(lines)
-        code_lines = len([line for line in lines if line.strip() and not line.strip().startswith('#')])
-        comment_lines = len([line for line in lines if line.strip().startswith('#')])
-        blank_lines = len([line for line in lines if not line.strip()])
+    @staticmethod
+    def _scanner(syntax: Tuple[Tuple[str, ...], Optional[Tuple[str, str]]]) -> Optional[Any]:
+        """Regex for the next comment or string opener under a comment syntax, compiled once."""
+        if syntax not in CodeMetrics._scanners:
+            line_prefixes, block = syntax
+            tokens = list(line_prefixes) + ([block[0]] if block else [])
+            # Quotes only delimit strings in languages with line comments; in markup they are prose
+            if line_prefixes:
+                tokens += CodeMetrics.STRING_DELIMITERS
+            tokens.sort(key=len, reverse=True)
+            CodeMetrics._scanners[syntax] = re.compile('|'.join(map(re.escape, tokens))) if tokens else None
+        return CodeMetrics._scanners[syntax]
+
+    @staticmethod
+    def _string_end(line: str, pos: int, delimiter: str) -> int:
+        """Index just past the unescaped closing delimiter at or after pos, or -1."""
+        while True:
+            end = line.find(delimiter, pos)
+            if end < 0:
+                return -1
+            escapes = 0
+            while end - escapes > pos and line[end - escapes - 1] == '\\':
+                escapes += 1
+            if escapes % 2 == 0:
+                return end + len(delimiter)
+            pos = end + 1
+
+    @staticmethod
+    def count_lines(lines: Any, syntax: Tuple[Tuple[str, ...], Optional[Tuple[str, str]]]) -> Dict[str, int]:
+        """Count total, code, comment and blank lines and decision points in one pass.
+
+        A line is a comment line only if nothing but comments remains on it; comment markers
+        inside string literals are ignored, and decision points are counted in code only.
+        """
+        line_prefixes, block = syntax
+        block_start, block_end = block if block else (None, None)
+        scanner = CodeMetrics._scanner(syntax)
+        decision_pattern = CodeMetrics.DECISION_PATTERN
+        total = code = comment = blank = decisions = 0
+        in_block = False
+        open_string: Optional[str] = None
+
+        for raw in lines:
+            total += 1
+            line = raw.strip()
+            if not line and not in_block:
+                blank += 1
+                continue
+
+            has_code = open_string is not None
+            has_comment = in_block
+            segments = []
+            pos = 0
+            while pos < len(line):
+                if in_block:
+                    end = line.find(block_end, pos)
+                    if end < 0:
+                        break
+                    pos = end + len(block_end)
+                    in_block = False
+                    continue
+                if open_string is not None:
+                    end = CodeMetrics._string_end(line, pos, open_string)
+                    if end < 0:
+                        break
+                    pos = end
+                    open_string = None
+                    continue
+
+                match = scanner.search(line, pos) if scanner else None
+                stop = match.start() if match else len(line)
+                if line[pos:stop].strip():
+                    has_code = True
+                    segments.append(line[pos:stop])
+                if match is None:
+                    break
+                token = match.group()
+                pos = match.end()
+                if token == block_start:
+                    has_comment = in_block = True
+                elif token in line_prefixes:
+                    has_comment = True
+                    break
+                else:
+                    has_code = True
+                    open_string = token
+
+            # Ordinary quotes end with the line even when unterminated
+            if open_string is not None and open_string not in CodeMetrics.MULTILINE_STRINGS:
+                open_string = None
+
+            if has_code:
+                code += 1
+                for segment in segments:
+                    decisions += len(decision_pattern.findall(segment))
+            elif has_comment:
+                comment += 1
+            else:
+                blank += 1
 
         return {
-            'total_lines': total_lines,
-            'code_lines': code_lines,
-            'comment_lines': comment_lines,
-            'blank_lines': blank_lines,
-            'comment_ratio': comment_lines / total_lines if total_lines > 0 else 0,
-            'file_size': os.path.getsize(file_path)
+            'total_lines': total,
+            'code_lines': code,
+            'comment_lines': comment,
+            'blank_lines': blank,
+            'decision_points': decisions
         }
 
     @staticmethod
-    def calculate_project_metrics(project_path: str) -> Dict[str, Any]:
+    def calculate_file_metrics(file_path: str, content_store: Optional['FileContentStore'] = None,
+                               syntax: Optional[Tuple[Tuple[str, ...], Optional[Tuple[str, str]]]] = None) -> Dict[str, Any]:
+        """Calculate metrics for a single file."""
+        if syntax is None:
+            syntax = CodeMetrics.comment_syntax(ConfigUtils.load_config()).get(
+                FileUtils.get_file_extension(file_path), CodeMetrics.NO_COMMENTS)
+
+        try:
+            if content_store is not None:
+                content = content_store.get_text(file_path, errors='ignore')
+                if content is None:
+                    return {}
+                counts = CodeMetrics.count_lines(io.StringIO(content), syntax)
+            else:
+                with open(file_path, 'r', encoding='utf-8', errors='ignore', buffering=1 << 16) as f:
+                    counts = CodeMetrics.count_lines(f, syntax)
+            counts['file_size'] = os.path.getsize(file_path)
+        except OSError:
+            return {}
+
+        total_lines = counts['total_lines']
+        counts['comment_ratio'] = counts['comment_lines'] / total_lines if total_lines > 0 else 0
+        return counts
+
+    @staticmethod
+    def calculate_project_metrics(project_path: str, content_store: Optional['FileContentStore'] = None,
+                                  path_filter: Optional[PathFilter] = None) -> Dict[str, Any]:
         """Calculate metrics for entire project."""
+        config = ConfigUtils.load_config()
+        syntax = CodeMetrics.comment_syntax(config)
+        languages = CodeMetrics.language_names(config)
         metrics = {
             'total_files': 0,
             'total_lines': 0,
@@ -208,93 +2487,1396 @@ class CodeMetrics:
             'language_complexity': {}
         }
 
-        for root, dirs, files in os.walk(project_path):
-            # Skip common directories
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['__pycache__', 'node_modules', '.git']]
+        if path_filter is None:
+            path_filter = PathFilter.from_config(config)
 
-            for file in files:
-                file_path = os.path.join(root, file)
+        for relative_dir, entries in path_filter.walk(project_path):
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    continue
+                file_path = entry.path
 
                 if FileUtils.is_text_file(file_path):
-                    file_metrics = CodeMetrics.calculate_file_metrics(file_path)
+                    ext = FileUtils.get_file_extension(file_path)
+                    file_metrics = CodeMetrics.calculate_file_metrics(
+                        file_path, content_store, syntax.get(ext, CodeMetrics.NO_COMMENTS))
+                    if not file_metrics:
+                        continue
 
                     metrics['total_files'] += 1
                     metrics['total_lines'] += file_metrics['total_lines']
                     metrics['total_size'] += file_metrics['file_size']
 
-                    # Track by file type
-                    ext = FileUtils.get_file_extension(file_path)
-                    if ext not in metrics['files_by_type']:
-                        metrics['files_by_type'][ext] = []
-                    metrics['files_by_type'][ext].append(file_metrics)
-
+                    # Running totals by file type
+                    by_type = metrics['files_by_type'].get(ext)
+                    if by_type is None:
+                        by_type = metrics['files_by_type'][ext] = {
+                            'files': 0, 'total_lines': 0, 'code_lines': 0,
+                            'comment_lines': 0, 'blank_lines': 0, 'size': 0
+                        }
+                    by_type['files'] += 1
+                    by_type['total_lines'] += file_metrics['total_lines']
+                    by_type['code_lines'] += file_metrics['code_lines']
+                    by_type['comment_lines'] += file_metrics['comment_lines']
+                    by_type['blank_lines'] += file_metrics['blank_lines']
+                    by_type['size'] += file_metrics['file_size']
+
+                    if ext in languages:
+                        language = metrics['language_complexity'].setdefault(
+                            languages[ext], {'files': 0, 'code_lines': 0, 'decision_points': 0})
+                        language['files'] += 1
+                        language['code_lines'] += file_metrics['code_lines']
+                        language['decision_points'] += file_metrics['decision_points']
+
+        for language in metrics['language_complexity'].values():
+            # Decision points per 100 lines of code
+            language['density'] = round(100 * language['decision_points'] / language['code_lines'], 2) if language['code_lines'] else 0.0
         return metrics
 
 
 class MermaidGenerator:
-    """Generate Mermaid diagrams for code visualization."""
+    """Generate Mermaid diagrams for code visualization.
+
+    Nodes are grouped into one subgraph per module. Above the node budget only the
+    most-connected nodes are drawn. The rest of each module collapses into a single
+    summary node, so diagram size stays bounded however large the repository is.
+    """
+
+    DEFAULT_MAX_NODES = 150
+    DEFAULT_MAX_EDGES = 300
+    DIRECTIONS = {'top-down': 'TD', 'bottom-up': 'BT', 'left-right': 'LR', 'right-left': 'RL'}
 
     @staticmethod
-    def generate_call_graph(functions: Dict[str, Any]) -> str:
+    def node_id(name: str) -> str:
+        """Convert a (possibly qualified) symbol name into a valid Mermaid node id."""
+        return re.sub(r'\W', '_', name)
+
+    @staticmethod
+    def budget(kind: str) -> Dict[str, Any]:
+        """Node/edge budget and direction for a diagram kind from the `diagrams` section of config.json."""
+        settings = ConfigUtils.load_config().get('diagrams', {}).get(kind, {})
+        return {
+            'max_nodes': settings.get('max_nodes', MermaidGenerator.DEFAULT_MAX_NODES),
+            'max_edges': settings.get('max_edges', MermaidGenerator.DEFAULT_MAX_EDGES),
+            'direction': settings.get('direction', 'top-down')
+        }
+
+    @staticmethod
+    def module_of(name: str, info: Dict[str, Any]) -> str:
+        """Module part of a qualified symbol name; methods drop their class as well."""
+        parts = name.split('#', 1)[0].split('.')
+        depth = 2 if info.get('class') else 1
+        return '.'.join(parts[:-depth]) if len(parts) > depth else ''
+
+    @staticmethod
+    def generate_call_graph(functions: Dict[str, Any], max_nodes: int = DEFAULT_MAX_NODES,
+                            max_edges: int = DEFAULT_MAX_EDGES, direction: str = 'top-down') -> str:
         """Generate Mermaid diagram for function call graph."""
         if not functions:
             return "graph TD\n    A[No functions found]"
 
-        diagram = "graph TD\n"
-
+        modules = {}
+        edges = []
         for func_name, func_info in functions.items():
-            # Add function node
-            diagram += f'    {func_name}["{func_name}()"]\n'
-
-            # Add calls
+            modules[func_name] = MermaidGenerator.module_of(func_name, func_info)
             for called_func in func_info.get('calls', []):
-                diagram += f'    {func_name} --> {called_func}\n'
+                edges.append((func_name, called_func))
 
-        return diagram
+        return MermaidGenerator._render_graph(modules, edges, '()', max_nodes, max_edges, direction)
 
     @staticmethod
-    def generate_inheritance_graph(classes: Dict[str, Any]) -> str:
+    def generate_inheritance_graph(classes: Dict[str, Any], max_nodes: int = DEFAULT_MAX_NODES,
+                                   max_edges: int = DEFAULT_MAX_EDGES, direction: str = 'top-down') -> str:
         """Generate Mermaid diagram for class inheritance."""
         if not classes:
             return "graph TD\n    A[No classes found]"
 
-        diagram = "graph TD\n"
-
+        modules = {}
+        edges = []
         for class_name, class_info in classes.items():
-            # Add class node
-            diagram += f'    {class_name}["{class_name}"]\n'
-
-            # Add inheritance relationships
+            modules[class_name] = MermaidGenerator.module_of(class_name, {})
             for parent_class in class_info.get('inherits_from', []):
-                diagram += f'    {parent_class} --> {class_name}\n'
+                edges.append((parent_class, class_name))
 
-        return diagram
+        return MermaidGenerator._render_graph(modules, edges, '', max_nodes, max_edges, direction)
 
     @staticmethod
-    def generate_file_structure_tree(file_tree: Dict[str, Any]) -> str:
-        """Generate Mermaid diagram for file structure."""
+    def generate_dependency_graph(edges: Dict[str, List[str]], max_nodes: int = DEFAULT_MAX_NODES,
+                                  max_edges: int = DEFAULT_MAX_EDGES, direction: str = 'top-down') -> str:
+        """Generate Mermaid diagram for resolved file imports, clustered by directory."""
+        if not edges:
+            return "graph TD\n    A[No files found]"
+
+        # Paths become dotted names so the directory is the module and the file name the label
+        def name_of(path: str) -> str:
+            return path.replace('/', '.')
+
+        modules = {}
+        pairs = []
+        for path, deps in edges.items():
+            directory = posixpath.dirname(path)
+            modules[name_of(path)] = directory.replace('/', '.')
+            for dep in deps:
+                pairs.append((name_of(path), name_of(dep)))
+
+        return MermaidGenerator._render_graph(modules, pairs, '', max_nodes, max_edges, direction)
+
+    @staticmethod
+    def _render_graph(modules: Dict[str, str], edges: List[Tuple[str, str]], suffix: str,
+                      max_nodes: int, max_edges: int, direction: str) -> str:
+        """Render symbols clustered by module within the node and edge budgets.
+
+        `modules` maps every repository symbol to its module. Edge endpoints that are
+        not repository symbols (e.g. external base classes) are drawn outside any subgraph.
+        """
+        degree: Dict[str, int] = {}
+        for source, target in edges:
+            degree[source] = degree.get(source, 0) + 1
+            degree[target] = degree.get(target, 0) + 1
+
+        nodes = list(modules)
+        nodes.extend(name for name in degree if name not in modules)
+        if len(nodes) > max_nodes:
+            kept = set(heapq.nlargest(max_nodes, nodes, key=lambda name: degree.get(name, 0)))
+        else:
+            kept = set(nodes)
+
+        # Hidden symbols collapse into one summary node per module that still has visible nodes
+        clusters: Dict[str, List[str]] = {}
+        hidden: Dict[str, int] = {}
+        for name in nodes:
+            module = modules.get(name)
+            if name in kept:
+                clusters.setdefault(module, []).append(name)
+            else:
+                hidden[module] = hidden.get(module, 0) + 1
+
+        def summary_id(module: Optional[str]) -> str:
+            if module not in clusters:
+                return "more__other"
+            if module is None:
+                return "more__external"
+            return f"more__{MermaidGenerator.node_id('mod_' + module)}"
+
+        def visible(name: str) -> str:
+            if name in kept:
+                return MermaidGenerator.node_id(name)
+            return summary_id(modules.get(name))
+
+        lines = [f"graph {MermaidGenerator.DIRECTIONS.get(direction, direction)}"]
+        for module, members in clusters.items():
+            indent = "    "
+            if module is not None:
+                lines.append(f'    subgraph {MermaidGenerator.node_id("mod_" + module)}["{module or "(root)"}"]')
+                indent = "        "
+            for name in members:
+                label = name[len(module) + 1:] if module else name
+                lines.append(f'{indent}{MermaidGenerator.node_id(name)}["{label}{suffix}"]')
+            if module in hidden:
+                lines.append(f'{indent}{summary_id(module)}["... {hidden.pop(module)} more"]')
+            if module is not None:
+                lines.append("    end")
+
+        other = sum(hidden.values())
+        if other:
+            lines.append(f'    more__other["... {other} more in {len(hidden)} other modules"]')
+
+        # Edges between drawn nodes come first; collapsed endpoints are merged and deduplicated
+        drawn = set()
+        ordered = [edge for edge in edges if edge[0] in kept and edge[1] in kept]
+        ordered.extend(edge for edge in edges if edge[0] not in kept or edge[1] not in kept)
+        omitted = 0
+        for source, target in ordered:
+            edge = (visible(source), visible(target))
+            if edge[0] == edge[1] and edge[0].startswith('more__') or edge in drawn:
+                continue
+            if len(drawn) >= max_edges:
+                omitted += 1
+                continue
+            drawn.add(edge)
+            lines.append(f"    {edge[0]} --> {edge[1]}")
+
+        if omitted:
+            lines.append(f"    %% {omitted} edges omitted (budget {max_edges})")
+        if len(kept) < len(nodes):
+            lines.append(f"    %% showing {len(kept)} of {len(nodes)} nodes (budget {max_nodes})")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def generate_file_structure_tree(file_tree: Dict[str, Any], max_nodes: int = DEFAULT_MAX_NODES) -> str:
+        """Generate Mermaid diagram for file structure, breadth-first within the node budget."""
         if not file_tree:
             return "graph TD\n    A[Empty repository]"
 
-        diagram = "graph TD\n"
+        lines = ["graph TD"]
+        count = 0
+        queue = deque([(file_tree, None)])
+        while queue:
+            node, parent = queue.popleft()
+            if count >= max_nodes:
+                # Every remaining entry is summarized under its parent directory
+                skipped = {parent: 1}
+                while queue:
+                    _, other_parent = queue.popleft()
+                    skipped[other_parent] = skipped.get(other_parent, 0) + 1
+                for index, (parent_id, amount) in enumerate(skipped.items()):
+                    lines.append(f'    more_{index}["... {amount} more"]')
+                    if parent_id:
+                        lines.append(f'    {parent_id} --> more_{index}')
+                break
+
+            # Ids are positional so files with the same name in different directories stay distinct
+            node_id = f"n{count}"
+            count += 1
+            icon = "📁" if node['type'] == 'directory' else "📄"
+            lines.append(f'    {node_id}["{icon} {node["name"]}"]')
+            if parent:
+                lines.append(f'    {parent} --> {node_id}')
+            if node['type'] == 'directory':
+                queue.extend((child, node_id) for child in node.get('children', []))
 
-        def add_node(node: Dict[str, Any], parent: str = None):
-            node_id = node['name'].replace('.', '_').replace('-', '_')
+        return "\n".join(lines) + "\n"
 
-            if node['type'] == 'directory':
-                diagram = f'    {node_id}["📁 {node["name"]}"]\n'
-                if parent:
-                    diagram += f'    {parent} --> {node_id}\n'
 
-                for child in node.get('children', []):
-                    add_node(child, node_id)
+class DocumentationShards:
+    """Per-package documentation pages and the manifest used to skip unchanged ones."""
+
+    MANIFEST = '.shards.json'
+    PAGES = 'pages'
+    # Shard of files at the repository root; no directory can be named '.'
+    ROOT = '.'
+    # Bump when the page layout changes so every shard is re-rendered
+    FORMAT_VERSION = "2"
+    # Diagrams drawn on shard pages; their node/edge budgets are part of every digest
+    DIAGRAMS = ('call_graph', 'inheritance_graph')
+
+    def __init__(self, output_dir: str, repo_path: str):
+        self.output_dir = output_dir
+        self.repo_path = repo_path
+        self.pages_dir = os.path.join(output_dir, DocumentationShards.PAGES)
+        self.manifest_path = os.path.join(output_dir, DocumentationShards.MANIFEST)
+        self._relative: Dict[str, str] = {}
+
+    @staticmethod
+    def shard_of(relative_path: str) -> str:
+        """Return the directory a repository-relative file belongs to, in '/' form."""
+        return os.path.dirname(relative_path).replace(os.sep, '/') or DocumentationShards.ROOT
+
+    @staticmethod
+    def page_name(shard: str) -> str:
+        """File name for a shard page: a readable slug plus a hash of the exact directory path.
+
+        Dotted names would collide (`v1.2/` and `v1/2/`), so the hash keeps pages distinct.
+        """
+        if shard == DocumentationShards.ROOT:
+            return '_root'
+        slug = re.sub(r'[^A-Za-z0-9._-]', '_', shard.replace('/', '.'))
+        return f"{slug}-{hashlib.sha1(shard.encode('utf-8')).hexdigest()[:10]}"
+
+    def relative(self, file_path: str) -> str:
+        """Repository-relative path of an analyzed file, memoized per path."""
+        relative = self._relative.get(file_path)
+        if relative is None:
+            relative = os.path.relpath(file_path, self.repo_path).replace(os.sep, '/')
+            self._relative[file_path] = relative
+        return relative
+
+    def page_link(self, shard: str) -> str:
+        """Link to a shard page relative to the index."""
+        return f"{DocumentationShards.PAGES}/{DocumentationShards.page_name(shard)}.md"
+
+    def page_path(self, shard: str) -> str:
+        """Filesystem path of a shard page."""
+        return os.path.join(self.pages_dir, f"{DocumentationShards.page_name(shard)}.md")
+
+    def output_size(self) -> int:
+        """Bytes of the index page plus every shard page."""
+        paths = [os.path.join(self.output_dir, 'README.md')]
+        if os.path.isdir(self.pages_dir):
+            paths.extend(entry.path for entry in os.scandir(self.pages_dir) if entry.is_file())
+        return sum(os.path.getsize(path) for path in paths if os.path.exists(path))
+
+    def plan(self, analysis: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Group symbol names and files by shard and hash each shard's inputs.
+
+        Only names are kept; records are materialized again for shards that need rendering.
+        """
+        shards: Dict[str, Dict[str, Any]] = {}
+        hashers: Dict[str, Any] = {}
+        diagrams = json.dumps([MermaidGenerator.budget(kind) for kind in DocumentationShards.DIAGRAMS],
+                              sort_keys=True)
+
+        def shard_for(relative: str) -> Tuple[Dict[str, Any], Any]:
+            name = DocumentationShards.shard_of(relative)
+            if name not in shards:
+                shards[name] = {'functions': [], 'classes': [], 'files': []}
+                hashers[name] = hashlib.sha256(
+                    f"{DocumentationShards.FORMAT_VERSION}\0{ANALYZER_VERSION}\0{diagrams}\0".encode('utf-8'))
+            return shards[name], hashers[name]
+
+        for kind in ('functions', 'classes'):
+            for name, info in analysis[kind].items():
+                entry = dict(info)
+                entry['file'] = self.relative(info['file'])
+                shard, hasher = shard_for(entry['file'])
+                shard[kind].append(name)
+                hasher.update(json.dumps([kind, name, entry], sort_keys=True).encode('utf-8'))
+
+        complexity = analysis.get('complexity', {})
+        for file_path, deps in analysis['dependencies'].items():
+            relative = self.relative(file_path)
+            shard, hasher = shard_for(relative)
+            shard['files'].append(file_path)
+            hasher.update(json.dumps(['file', relative, deps, complexity.get(file_path)],
+                                     sort_keys=True).encode('utf-8'))
+
+        for name, shard in shards.items():
+            shard['digest'] = hashers[name].hexdigest()
+        return dict(sorted(shards.items()))
+
+    def _load_manifest(self) -> Dict[str, str]:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('shards', {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def changed(self, plan: Dict[str, Dict[str, Any]]) -> List[str]:
+        """Shards whose inputs differ from the last run or whose page is missing."""
+        previous = self._load_manifest()
+        return [
+            name for name, shard in plan.items()
+            if previous.get(name) != shard['digest'] or not os.path.exists(self.page_path(name))
+        ]
+
+    def materialize(self, analysis: Dict[str, Any], shard: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the render input for one shard, with repository-relative file paths."""
+        complexity = analysis.get('complexity', {})
+        result: Dict[str, Any] = {'functions': {}, 'classes': {}, 'dependencies': {}, 'complexity': {}}
+        for kind in ('functions', 'classes'):
+            for name in shard[kind]:
+                entry = dict(analysis[kind][name])
+                entry['file'] = self.relative(entry['file'])
+                result[kind][name] = entry
+        for file_path in shard['files']:
+            relative = self.relative(file_path)
+            result['dependencies'][relative] = analysis['dependencies'][file_path]
+            if file_path in complexity:
+                result['complexity'][relative] = complexity[file_path]
+        return result
+
+    def save_manifest(self, plan: Dict[str, Dict[str, Any]], stale: Optional[List[str]] = None) -> None:
+        """Record shard digests and delete pages of shards that no longer exist.
+
+        Shards in `stale` were not rendered this run; they are recorded without a digest so
+        the next run renders them again.
+        """
+        # Pages are matched by file name so pages written under an older naming scheme go too
+        current = {os.path.basename(self.page_path(name)) for name in plan}
+        if os.path.isdir(self.pages_dir):
+            for entry in os.scandir(self.pages_dir):
+                if entry.name.endswith('.md') and entry.name not in current:
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        pass
+
+        manifest = {
+            'version': DocumentationShards.FORMAT_VERSION,
+            'shards': {name: None if name in (stale or ()) else shard['digest'] for name, shard in plan.items()}
+        }
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+
+class GitMirror:
+    """Local cache of bare git mirrors with shallow/blobless clones and worktree checkouts."""
+
+    _locks: Dict[str, threading.Lock] = {}
+    _locks_guard = threading.Lock()
+
+    def __init__(self, directory: str = './.cache/mirrors', enabled: bool = True,
+                 depth: Optional[int] = None, blobless: bool = False, timeout: int = 300):
+        self.directory = os.path.abspath(directory)
+        self.enabled = enabled
+        self.depth = depth
+        self.blobless = blobless
+        self.timeout = timeout
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'GitMirror':
+        """Create a mirror cache from the `git` section of config.json."""
+        settings = config.get('git', {})
+        mirror_settings = settings.get('mirror_cache', {})
+        return cls(
+            directory=mirror_settings.get('directory', './.cache/mirrors'),
+            enabled=mirror_settings.get('enabled', True),
+            depth=settings.get('clone_depth'),
+            blobless=settings.get('blobless', False),
+            timeout=settings.get('timeout', 300)
+        )
+
+    def mirror_path(self, url: str) -> str:
+        """Return the bare mirror directory used for a remote URL."""
+        name = re.sub(r'[^\w.-]+', '_', url.rstrip('/').split('/')[-1])
+        if name.endswith('.git'):
+            name = name[:-4]
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]
+        return os.path.join(self.directory, f"{name}-{digest}.git")
+
+    def _clone_options(self) -> List[str]:
+        options = []
+        if self.depth:
+            options.append(f"--depth={int(self.depth)}")
+        if self.blobless:
+            options.append("--filter=blob:none")
+        return options
+
+    def _git(self, args: List[str], cwd: Optional[str] = None) -> subprocess.CompletedProcess:
+        result = subprocess.run(
+            ["git"] + args,
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            timeout=self.timeout
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"git {args[0]} failed: {result.stderr.strip()}")
+        return result
+
+    def _lock_for(self, path: str) -> threading.Lock:
+        with GitMirror._locks_guard:
+            if path not in GitMirror._locks:
+                GitMirror._locks[path] = threading.Lock()
+            return GitMirror._locks[path]
+
+    def ensure_mirror(self, url: str) -> str:
+        """Create the bare mirror for a URL, or fetch updates into an existing one."""
+        mirror = self.mirror_path(url)
+        if os.path.isdir(mirror):
+            fetch_args = ["--git-dir", mirror, "fetch", "--prune", "--force", "origin"]
+            if self.depth:
+                fetch_args.append(f"--depth={int(self.depth)}")
+            self._git(fetch_args)
+        else:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_mirror = f"{mirror}.{os.getpid()}.tmp"
+            shutil.rmtree(tmp_mirror, ignore_errors=True)
+            try:
+                self._git(["clone", "--mirror"] + self._clone_options() + [url, tmp_mirror])
+                os.replace(tmp_mirror, mirror)
+            finally:
+                shutil.rmtree(tmp_mirror, ignore_errors=True)
+        return mirror
+
+    def checkout(self, url: str, prefix: str = "codebase_genius_") -> Optional[str]:
+        """Check out the remote HEAD into a fresh temporary directory and return its path."""
+        dest = tempfile.mkdtemp(prefix=prefix)
+        try:
+            if self.enabled:
+                mirror = self.mirror_path(url)
+                with self._lock_for(mirror):
+                    self.ensure_mirror(url)
+                    self._git(["--git-dir", mirror, "worktree", "prune"])
+                    self._git(["--git-dir", mirror, "worktree", "add", "--detach", dest, "HEAD"])
+            else:
+                self._git(["clone"] + self._clone_options() + [url, dest])
+            return dest
+        except (OSError, RuntimeError, subprocess.SubprocessError) as e:
+            print(f"Error cloning {url}: {e}")
+            shutil.rmtree(dest, ignore_errors=True)
+            return None
+
+    def resolve_head(self, url: str) -> Optional[str]:
+        """Return the commit the remote HEAD points at, without cloning."""
+        try:
+            output = self._git(["ls-remote", url, "HEAD"]).stdout.split()
+        except (OSError, RuntimeError, subprocess.SubprocessError):
+            return None
+        return output[0] if output else None
+
+    def release(self, path: str) -> None:
+        """Remove a checkout, detaching it from its mirror if it is a worktree."""
+        git_file = os.path.join(path, '.git')
+        if os.path.isfile(git_file):
+            try:
+                with open(git_file, 'r', encoding='utf-8') as f:
+                    gitdir = f.read().split('gitdir:', 1)[1].strip()
+                mirror = os.path.dirname(os.path.dirname(gitdir))
+                with self._lock_for(mirror):
+                    self._git(["--git-dir", mirror, "worktree", "remove", "--force", path])
+            except (OSError, IndexError, RuntimeError, subprocess.SubprocessError):
+                pass
+        shutil.rmtree(path, ignore_errors=True)
+
+
+class JobQueue:
+    """Bounded worker pool running documentation jobs with pollable status."""
+
+    _shared: Optional['JobQueue'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, workers: int = 2, max_pending: int = 32, max_finished: int = 256):
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="codebase_genius_job")
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._active: Dict[str, str] = {}
+        self._finished: List[str] = []
+
+    @classmethod
+    def shared(cls) -> 'JobQueue':
+        """Return the process-wide queue configured from the `jobs` section of config.json."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                settings = ConfigUtils.load_config().get('jobs', {})
+                cls._shared = cls(
+                    workers=settings.get('workers', 2),
+                    max_pending=settings.get('max_pending', 32),
+                    max_finished=settings.get('max_finished', 256)
+                )
+            return cls._shared
+
+    def submit(self, key: str, func: Any) -> Dict[str, Any]:
+        """Queue func(report_phase) under a key, reusing the in-flight job for the same key."""
+        with self._lock:
+            if key in self._active:
+                return self._summary(self._jobs[self._active[key]])
+
+            if len(self._active) >= self.max_pending:
+                raise RuntimeError(f"Job queue is full ({self.max_pending} jobs pending)")
+
+            job = {
+                "id": uuid.uuid4().hex,
+                "key": key,
+                "status": "queued",
+                "phase": "queued",
+                "submitted_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+                "result": None,
+                "error": None
+            }
+            self._jobs[job["id"]] = job
+            self._active[key] = job["id"]
+
+        self._executor.submit(self._run, job, func)
+        return self._summary(job)
+
+    def _run(self, job: Dict[str, Any], func: Any) -> None:
+        def report_phase(phase: str) -> None:
+            job["phase"] = phase
+
+        job["status"] = "running"
+        job["started_at"] = time.time()
+        try:
+            job["result"] = func(report_phase)
+            job["status"] = "completed"
+        except Exception as e:
+            job["error"] = str(e)
+            job["status"] = "failed"
+        finally:
+            job["finished_at"] = time.time()
+            with self._lock:
+                self._active.pop(job["key"], None)
+                self._finished.append(job["id"])
+                # Forget the oldest finished jobs so the job table stays bounded
+                while len(self._finished) > self.max_finished:
+                    self._jobs.pop(self._finished.pop(0), None)
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job's status and current phase, or None if unknown."""
+        job = self._jobs.get(job_id)
+        return self._summary(job) if job else None
+
+    def result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job's status together with its result or error, or None if unknown."""
+        job = self._jobs.get(job_id)
+        if not job:
+            return None
+        summary = self._summary(job)
+        summary["result"] = job["result"]
+        summary["error"] = job["error"]
+        return summary
+
+    @staticmethod
+    def _summary(job: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "job_id": job["id"],
+            "key": job["key"],
+            "status": job["status"],
+            "phase": job["phase"],
+            "submitted_at": job["submitted_at"],
+            "started_at": job["started_at"],
+            "finished_at": job["finished_at"]
+        }
+
+
+class ResultCache:
+    """Index of generated outputs keyed by repository URL, HEAD commit and analyzer version."""
+
+    # Instances are created per request, so index locks and in-flight outputs are tracked per process
+    _locks: Dict[str, threading.Lock] = {}
+    _held: Dict[str, int] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, index_path: str = './outputs/.result_cache.json', enabled: bool = True,
+                 ttl: int = 24 * 60 * 60, max_entries: int = 500, max_size: int = 5 * 1024 * 1024 * 1024):
+        self.index_path = index_path
+        self.enabled = enabled
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_size = max_size
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'ResultCache':
+        """Create a result cache from the `result_cache` section of config.json."""
+        settings = config.get('result_cache', {})
+        return cls(
+            index_path=settings.get('index', './outputs/.result_cache.json'),
+            enabled=settings.get('enabled', True),
+            ttl=settings.get('ttl', 24 * 60 * 60),
+            max_entries=settings.get('max_entries', 500),
+            max_size=settings.get('max_size', 5 * 1024 * 1024 * 1024)
+        )
+
+    @staticmethod
+    def make_key(url: str, commit: str) -> str:
+        """Build the cache key for a repository at a commit."""
+        return hashlib.sha256(f"{url}\0{commit}\0{ANALYZER_VERSION}".encode('utf-8')).hexdigest()
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @contextmanager
+    def _index_lock(self):
+        """Serialize read-modify-write of the index across threads and, where flock exists, processes."""
+        path = os.path.abspath(self.index_path)
+        with ResultCache._shared_lock:
+            lock = ResultCache._locks.setdefault(path, threading.Lock())
+        with lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(f"{path}.lock", 'a') as handle:
+                try:
+                    import fcntl
+                except ImportError:
+                    fcntl = None
+                if fcntl:
+                    fcntl.flock(handle, fcntl.LOCK_EX)
+                yield
+
+    @classmethod
+    @contextmanager
+    def hold(cls, output_dir: str):
+        """Mark an output directory as being written so eviction leaves it alone."""
+        path = os.path.abspath(output_dir)
+        with cls._shared_lock:
+            cls._held[path] = cls._held.get(path, 0) + 1
+        try:
+            yield
+        finally:
+            with cls._shared_lock:
+                cls._held[path] -= 1
+                if not cls._held[path]:
+                    del cls._held[path]
+
+    @classmethod
+    def _is_held(cls, output_dir: str) -> bool:
+        with cls._shared_lock:
+            return os.path.abspath(output_dir) in cls._held
+
+    def _save_index(self, index: Dict[str, Dict[str, Any]]) -> None:
+        os.makedirs(os.path.dirname(self.index_path) or '.', exist_ok=True)
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def lookup(self, url: str, commit: str) -> Optional[Dict[str, Any]]:
+        """Return the live entry for a repository at a commit, or None."""
+        if not self.enabled:
+            return None
+
+        # The index is replaced atomically, so readers need no lock
+        entry = self._load_index().get(ResultCache.make_key(url, commit))
+
+        if not entry or time.time() - entry['created_at'] > self.ttl:
+            return None
+        if not (os.path.exists(entry['docs_path']) and os.path.exists(entry['analysis_path'])):
+            return None
+        return entry
+
+    def store(self, url: str, commit: str, output_dir: str) -> None:
+        """Record the outputs generated for a repository at a commit, then enforce limits."""
+        if not self.enabled:
+            return
+
+        entry = {
+            'url': url,
+            'commit': commit,
+            'analyzer_version': ANALYZER_VERSION,
+            'output_dir': output_dir,
+            'docs_path': os.path.join(output_dir, 'README.md'),
+            'analysis_path': os.path.join(output_dir, 'analysis.json'),
+            'size': FileUtils.get_directory_size(output_dir),
+            'created_at': time.time()
+        }
+
+        with self._index_lock():
+            index = self._load_index()
+            # Older commits of the same repository were overwritten in place
+            index = {key: value for key, value in index.items() if value['output_dir'] != output_dir}
+            index[ResultCache.make_key(url, commit)] = entry
+            self._save_index(self._enforce_limits(index))
+
+    def _enforce_limits(self, index: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Drop expired entries, then the oldest ones, deleting their outputs.
+
+        Entries whose output directory a running job holds are kept until a later store.
+        """
+        now = time.time()
+        kept = []
+        for key, entry in sorted(index.items(), key=lambda item: item[1]['created_at'], reverse=True):
+            if now - entry['created_at'] > self.ttl and not ResultCache._is_held(entry['output_dir']):
+                shutil.rmtree(entry['output_dir'], ignore_errors=True)
             else:
-                diagram = f'    {node_id}["📄 {node["name"]}"]\n'
-                if parent:
-                    diagram += f'    {parent} --> {node_id}\n'
+                kept.append((key, entry))
+
+        total = 0
+        result = {}
+        for key, entry in kept:
+            over = len(result) >= self.max_entries or total + entry['size'] > self.max_size
+            if over and not ResultCache._is_held(entry['output_dir']):
+                shutil.rmtree(entry['output_dir'], ignore_errors=True)
+                continue
+            total += entry['size']
+            result[key] = entry
+        return result
+
+
+class CodeGraphStore:
+    """Indexed SQLite copy of a repository's analysis graph for fast repeat queries."""
+
+    SCHEMA = """
+        CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+        CREATE TABLE files (id INTEGER PRIMARY KEY, path TEXT UNIQUE, module TEXT, complexity INTEGER);
+        CREATE TABLE symbols (
+            id INTEGER PRIMARY KEY, qname TEXT UNIQUE, name TEXT, kind TEXT,
+            file_id INTEGER REFERENCES files(id), owner TEXT, line_start INTEGER, complexity INTEGER,
+            docstring TEXT
+        );
+        CREATE TABLE calls (caller_id INTEGER, callee_id INTEGER);
+        CREATE TABLE inherits (class_id INTEGER, base TEXT);
+        CREATE TABLE imports (file_id INTEGER, target TEXT);
+        CREATE TABLE file_imports (file_id INTEGER, dep_id INTEGER);
+        CREATE INDEX symbols_name ON symbols(name);
+        CREATE INDEX symbols_file ON symbols(file_id, line_start);
+        CREATE INDEX calls_callee ON calls(callee_id);
+        CREATE INDEX calls_caller ON calls(caller_id);
+        CREATE INDEX inherits_base ON inherits(base);
+        CREATE INDEX imports_target ON imports(target);
+        CREATE INDEX file_imports_dep ON file_imports(dep_id);
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @classmethod
+    def for_output(cls, output_dir: str, config: Optional[Dict[str, Any]] = None) -> Optional['CodeGraphStore']:
+        """Store inside a repository's output directory, or None when disabled in config.json."""
+        settings = (config if config is not None else ConfigUtils.load_config()).get('graph_store', {})
+        if not settings.get('enabled', True):
+            return None
+        return cls(os.path.join(output_dir, settings.get('filename', 'graph.sqlite')))
+
+    def exists(self) -> bool:
+        """Whether a graph has been written for this repository."""
+        return os.path.exists(self.path)
+
+    def write(self, repo_path: str, analysis: Dict[str, Any], meta: Optional[Dict[str, Any]] = None) -> None:
+        """Replace the stored graph with the given analysis; readers never see a partial graph."""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+        def relative(file_path: str) -> str:
+            return os.path.relpath(file_path, repo_path).replace(os.sep, '/')
+
+        connection = sqlite3.connect(tmp_path)
+        try:
+            # Bulk load into a fresh file: no journal needed, the rename publishes it
+            connection.execute("PRAGMA journal_mode = OFF")
+            connection.execute("PRAGMA synchronous = OFF")
+            connection.executescript(CodeGraphStore.SCHEMA)
+
+            entries = dict(meta or {})
+            entries.update({'analyzer_version': ANALYZER_VERSION, 'created_at': time.time()})
+            connection.executemany("INSERT INTO meta VALUES (?, ?)",
+                                   [(key, json.dumps(value)) for key, value in entries.items()])
+
+            file_ids: Dict[str, int] = {}
+            complexity = analysis.get('complexity', {})
+            imports = []
+            for file_id, (file_path, deps) in enumerate(analysis.get('dependencies', {}).items(), 1):
+                file_ids[file_path] = file_id
+                path = relative(file_path)
+                total = complexity.get(file_path)
+                total = total.get('total') if isinstance(total, dict) else total
+                connection.execute("INSERT INTO files VALUES (?, ?, ?, ?)",
+                                   (file_id, path, SymbolIndex.module_name(path), total))
+                imports.extend((file_id, target) for target in deps.get('modules', []))
+            connection.executemany("INSERT INTO imports VALUES (?, ?)", imports)
+
+            # Resolved file-to-file edges; indexed by dependency for reverse lookups
+            path_ids = {relative(file_path): file_id for file_path, file_id in file_ids.items()}
+            connection.executemany("INSERT INTO file_imports VALUES (?, ?)", (
+                (path_ids[path], path_ids[dep])
+                for path, deps in analysis.get('import_graph', {}).get('edges', {}).items()
+                for dep in deps if path in path_ids and dep in path_ids
+            ))
+
+            def file_id_of(file_path: str) -> int:
+                if file_path not in file_ids:
+                    file_ids[file_path] = len(file_ids) + 1
+                    path = relative(file_path)
+                    connection.execute("INSERT INTO files VALUES (?, ?, ?, NULL)",
+                                       (file_ids[file_path], path, SymbolIndex.module_name(path)))
+                return file_ids[file_path]
+
+            symbol_ids: Dict[str, int] = {}
+            rows = []
+            for qname, info in analysis.get('classes', {}).items():
+                symbol_ids[qname] = len(symbol_ids) + 1
+                rows.append((symbol_ids[qname], qname, info['name'], 'class', file_id_of(info['file']),
+                             None, info.get('line_start'), None, info.get('docstring', '')))
+            for qname, info in analysis.get('functions', {}).items():
+                symbol_ids[qname] = len(symbol_ids) + 1
+                kind = 'method' if info.get('class') else 'function'
+                rows.append((symbol_ids[qname], qname, info['name'], kind, file_id_of(info['file']),
+                             info.get('class'), info.get('line_start'), info.get('complexity'), info.get('docstring', '')))
+            connection.executemany("INSERT INTO symbols VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+            connection.executemany("INSERT INTO calls VALUES (?, ?)", (
+                (symbol_ids[qname], symbol_ids[callee])
+                for qname, info in analysis.get('call_graph', {}).items()
+                for callee in info.get('calls', []) if callee in symbol_ids
+            ))
+            connection.executemany("INSERT INTO inherits VALUES (?, ?)", (
+                (symbol_ids[qname], base)
+                for qname, info in analysis.get('inheritance_graph', {}).items()
+                for base in info.get('inherits_from', [])
+            ))
+            connection.commit()
+        finally:
+            connection.close()
+        os.replace(tmp_path, self.path)
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self.exists():
+            raise FileNotFoundError(self.path)
+        connection = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def _query(self, sql: str, params: Any) -> List[Dict[str, Any]]:
+        connection = self._connect()
+        try:
+            return [dict(row) for row in connection.execute(sql, params)]
+        finally:
+            connection.close()
+
+    # Symbols match by qualified name, or by short name when no qualified name matches
+    _MATCH = "(SELECT id FROM symbols WHERE qname = :name UNION SELECT id FROM symbols WHERE name = :name AND NOT EXISTS (SELECT 1 FROM symbols WHERE qname = :name))"
+
+    def meta(self) -> Dict[str, Any]:
+        """Metadata recorded with the graph."""
+        return {row['key']: json.loads(row['value']) for row in self._query("SELECT key, value FROM meta", ())}
+
+    def callers_of(self, name: str) -> List[Dict[str, Any]]:
+        """Functions that call the named function."""
+        return self._query(f"""
+            SELECT callee.qname AS callee, caller.qname AS caller, files.path AS file, caller.line_start
+            FROM calls
+            JOIN symbols AS caller ON caller.id = calls.caller_id
+            JOIN symbols AS callee ON callee.id = calls.callee_id
+            JOIN files ON files.id = caller.file_id
+            WHERE calls.callee_id IN {CodeGraphStore._MATCH}
+            ORDER BY caller.qname
+        """, {'name': name})
+
+    def definitions_in(self, path: str) -> List[Dict[str, Any]]:
+        """Classes, functions and methods defined in a repository-relative file, in line order."""
+        path = path.replace(os.sep, '/')
+        if path.startswith('./'):
+            path = path[2:]
+        return self._query("""
+            SELECT symbols.qname, symbols.kind, symbols.owner, symbols.line_start, symbols.complexity
+            FROM symbols JOIN files ON files.id = symbols.file_id
+            WHERE files.path = ?
+            ORDER BY symbols.line_start, symbols.qname
+        """, (path,))
+
+    def subclasses_of(self, name: str) -> List[Dict[str, Any]]:
+        """Direct and transitive subclasses of a class, with their distance from it."""
+        return self._query(f"""
+            WITH RECURSIVE targets(qname) AS (
+                SELECT qname FROM symbols WHERE id IN {CodeGraphStore._MATCH} AND kind = 'class'
+                UNION SELECT :name WHERE NOT EXISTS (SELECT 1 FROM symbols WHERE id IN {CodeGraphStore._MATCH} AND kind = 'class')
+            ),
+            descendants(qname, depth) AS (
+                SELECT qname, 0 FROM targets
+                UNION
+                SELECT symbols.qname, descendants.depth + 1
+                FROM inherits
+                JOIN descendants ON inherits.base = descendants.qname
+                JOIN symbols ON symbols.id = inherits.class_id
+                -- Inheritance cycles would recurse forever; no shortest path is longer than the class count
+                WHERE descendants.depth < (SELECT COUNT(*) FROM symbols WHERE kind = 'class')
+            )
+            SELECT descendants.qname, MIN(descendants.depth) AS depth, files.path AS file, symbols.line_start
+            FROM descendants
+            JOIN symbols ON symbols.qname = descendants.qname
+            JOIN files ON files.id = symbols.file_id
+            WHERE descendants.depth > 0
+            GROUP BY descendants.qname
+            ORDER BY depth, descendants.qname
+        """, {'name': name})
+
+    def import_dependents(self, module: str) -> List[Dict[str, Any]]:
+        """Files importing a module or anything inside it."""
+        # '/' sorts right after '.', so the range covers every dotted child and stays indexable
+        return self._query("""
+            SELECT DISTINCT files.path AS file, files.module, imports.target
+            FROM imports JOIN files ON files.id = imports.file_id
+            WHERE imports.target = ? OR (imports.target >= ? AND imports.target < ?)
+            ORDER BY files.path, imports.target
+        """, (module, module + '.', module + '/'))
+
+    def affected_by(self, file_path: str) -> List[Dict[str, Any]]:
+        """A file and every file that transitively imports it, i.e. what to re-analyze when it changes."""
+        path = file_path[2:] if file_path.startswith('./') else file_path
+        return self._query("""
+            WITH RECURSIVE affected(id) AS (
+                SELECT id FROM files WHERE path = ?
+                UNION
+                SELECT file_imports.file_id
+                FROM file_imports JOIN affected ON file_imports.dep_id = affected.id
+            )
+            SELECT files.path AS file, files.module
+            FROM affected JOIN files ON files.id = affected.id
+            ORDER BY files.path
+        """, (path,))
+
+
+class RequestCoalescer:
+    """Run at most one call per key at a time, sharing its outcome with concurrent callers."""
+
+    _shared: Optional['RequestCoalescer'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+
+    @classmethod
+    def shared(cls) -> 'RequestCoalescer':
+        """Return the process-wide coalescer."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def run(self, key: str, func: Any) -> Any:
+        """Call func() unless a call for the same key is in flight, in which case wait for it."""
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            result = func()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+
+class MetricsRegistry:
+    """Process-wide counters and latency histograms rendered in Prometheus text format."""
+
+    PREFIX = "codebase_genius_"
+    DEFAULT_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+    _shared: Optional['MetricsRegistry'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Tuple, float]] = {}
+        self._histograms: Dict[str, Dict[Tuple, Dict[str, Any]]] = {}
+
+    @classmethod
+    def shared(cls) -> 'MetricsRegistry':
+        """Return the process-wide registry."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @staticmethod
+    def _label_key(labels: Optional[Dict[str, str]]) -> Tuple:
+        return tuple(sorted((labels or {}).items()))
+
+    def inc(self, name: str, amount: float = 1, labels: Optional[Dict[str, str]] = None) -> None:
+        """Increase a counter."""
+        key = MetricsRegistry._label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+        """Record an observation in a histogram."""
+        key = MetricsRegistry._label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+                series[key] = histogram
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram["buckets"][index] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    @staticmethod
+    def _format_labels(key: Tuple, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(key) + ([extra] if extra else [])
+        if not pairs:
+            return ""
+        escaped = []
+        for name, value in pairs:
+            value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            escaped.append(f'{name}="{value}"')
+        return "{" + ",".join(escaped) + "}"
+
+    @staticmethod
+    def _format_value(value: float) -> str:
+        return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name in sorted(self._counters):
+                metric = f"{MetricsRegistry.PREFIX}{name}"
+                lines.append(f"# TYPE {metric} counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{metric}{MetricsRegistry._format_labels(key)} {MetricsRegistry._format_value(value)}")
+
+            for name in sorted(self._histograms):
+                metric = f"{MetricsRegistry.PREFIX}{name}"
+                lines.append(f"# TYPE {metric} histogram")
+                for key, histogram in sorted(self._histograms[name].items()):
+                    for bound, count in zip(self.buckets, histogram["buckets"]):
+                        labels = MetricsRegistry._format_labels(key, ("le", MetricsRegistry._format_value(bound)))
+                        lines.append(f"{metric}_bucket{labels} {count}")
+                    labels = MetricsRegistry._format_labels(key, ("le", "+Inf"))
+                    lines.append(f"{metric}_bucket{labels} {histogram['count']}")
+                    labels = MetricsRegistry._format_labels(key)
+                    lines.append(f"{metric}_sum{labels} {MetricsRegistry._format_value(histogram['sum'])}")
+                    lines.append(f"{metric}_count{labels} {histogram['count']}")
+
+        return "\n".join(lines) + "\n"
+
+
+class BatchPipeline:
+    """Two-stage pipeline over many repositories: fetch on an I/O pool, process on a CPU pool.
+
+    A repository is handed to the CPU pool as soon as its fetch finishes, so clones and
+    analyses overlap. At most `max_in_flight` repositories are fetched but not yet processed,
+    which bounds the checkouts on disk when cloning outpaces analysis.
+    """
+
+    def __init__(self, io_workers: int = 4, cpu_workers: int = 2, max_in_flight: int = 0):
+        self.io_workers = max(1, io_workers)
+        self.cpu_workers = max(1, cpu_workers)
+        self.max_in_flight = max_in_flight or self.io_workers + self.cpu_workers
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'BatchPipeline':
+        """Create a pipeline from the `batch` section of config.json."""
+        settings = config.get('batch', {})
+        return cls(
+            io_workers=settings.get('io_workers', 4),
+            cpu_workers=settings.get('cpu_workers', 0) or max(1, (os.cpu_count() or 2) // 2),
+            max_in_flight=settings.get('max_in_flight', 0)
+        )
+
+    def run(self, items: List[str], fetch: Any, process: Any) -> List[Dict[str, Any]]:
+        """Run fetch(item) then process(item, fetched) for every item, returning reports in input order.
+
+        An exception from either stage marks that item failed without affecting the others.
+        """
+        reports = [{"source": item, "status": "queued", "result": None, "error": None,
+                    "timings": {}} for item in items]
+        slots = threading.BoundedSemaphore(self.max_in_flight)
+        done: List[Future] = []
+
+        def run_process(report: Dict[str, Any], fetched: Any, fetched_at: float) -> None:
+            start = time.perf_counter()
+            report["timings"]["wait"] = round(start - fetched_at, 4)
+            try:
+                report["result"] = process(report["source"], fetched)
+                report["status"] = "success"
+            except Exception as e:
+                report["error"] = str(e)
+                report["status"] = "failed"
+            finally:
+                report["timings"]["process"] = round(time.perf_counter() - start, 4)
+                slots.release()
+
+        with ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="codebase_genius_io") as io_pool, \
+                ThreadPoolExecutor(max_workers=self.cpu_workers, thread_name_prefix="codebase_genius_cpu") as cpu_pool:
+
+            def run_fetch(report: Dict[str, Any]) -> None:
+                start = time.perf_counter()
+                report["status"] = "fetching"
+                try:
+                    fetched = fetch(report["source"])
+                except Exception as e:
+                    report["error"] = str(e)
+                    report["status"] = "failed"
+                    slots.release()
+                    return
+                finally:
+                    report["timings"]["fetch"] = round(time.perf_counter() - start, 4)
+                report["status"] = "processing"
+                done.append(cpu_pool.submit(run_process, report, fetched, time.perf_counter()))
+
+            fetches = []
+            for report in reports:
+                # Blocks while max_in_flight repositories are fetched or being processed
+                slots.acquire()
+                fetches.append(io_pool.submit(run_fetch, report))
+            for future in fetches:
+                future.result()
+            for future in list(done):
+                future.result()
+
+        for report in reports:
+            report["timings"]["total"] = round(sum(report["timings"].get(stage, 0.0)
+                                                  for stage in ("fetch", "wait", "process")), 4)
+        return reports
+
+
+class RunBudget:
+    """Per-file, per-phase and per-repository limits for one run, and a record of what was cut.
+
+    Reads processing.max_repo_size, error_handling.timeout and graceful_degradation, plus
+    the per-file and per-phase settings next to them in config.json.
+    """
+
+    MAX_RECORDED = 1000
+
+    def __init__(self, max_repo_size: int = 1024 * 1024 * 1024, timeout: float = 300, phase_timeout: float = 0,
+                 file_timeout: float = 10, max_analysis_size: int = 2 * 1024 * 1024,
+                 max_line_length: int = 500, graceful: bool = True):
+        self.max_repo_size = max_repo_size
+        self.timeout = timeout
+        self.phase_timeout = phase_timeout
+        self.file_timeout = file_timeout
+        self.max_analysis_size = max_analysis_size
+        self.max_line_length = max_line_length
+        self.graceful = graceful
+        self.started_at = time.time()
+        self.phase: Optional[str] = None
+        self.phase_deadline: Optional[float] = None
+        self.repo_bytes = 0
+        self.truncated: Optional[str] = None
+        self.skipped: List[Dict[str, str]] = []
+        self.skipped_total = 0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'RunBudget':
+        """Create a budget from the `processing` and `error_handling` sections of config.json."""
+        processing = config.get('processing', {})
+        errors = config.get('error_handling', {})
+        return cls(
+            max_repo_size=processing.get('max_repo_size', 1024 * 1024 * 1024),
+            timeout=errors.get('timeout', 300),
+            phase_timeout=errors.get('phase_timeout', 0),
+            file_timeout=errors.get('file_timeout', 10),
+            max_analysis_size=processing.get('max_analysis_size', 2 * 1024 * 1024),
+            max_line_length=processing.get('max_average_line_length', 500),
+            graceful=errors.get('graceful_degradation', True)
+        )
+
+    def begin_phase(self, name: str) -> None:
+        """Start the time budget of a pipeline phase."""
+        self.phase = name
+        self.phase_deadline = time.time() + self.phase_timeout if self.phase_timeout else None
+
+    def deadline(self) -> Optional[float]:
+        """Wall-clock time at which the current phase or the run runs out, if bounded."""
+        run_deadline = self.started_at + self.timeout if self.timeout else None
+        deadlines = [d for d in (run_deadline, self.phase_deadline) if d is not None]
+        return min(deadlines) if deadlines else None
+
+    def expired(self) -> bool:
+        """Whether the current phase or the run is out of time."""
+        deadline = self.deadline()
+        return deadline is not None and time.time() >= deadline
+
+    def expire_reason(self) -> str:
+        """Which time budget ran out."""
+        if self.phase_deadline is not None and self.phase_deadline == self.deadline():
+            return f"{self.phase}_timeout"
+        return "repo_timeout"
+
+    def charge(self, size: int) -> bool:
+        """Count walked bytes against the repository size cap; False once it is exceeded."""
+        self.repo_bytes += size
+        if self.max_repo_size and self.repo_bytes > self.max_repo_size:
+            self.truncate("max_repo_size")
+            return False
+        return True
+
+    def truncate(self, reason: str) -> None:
+        """Record that the repository was only partially processed; the first reason is kept."""
+        if self.truncated is None:
+            self.truncated = reason
+
+    def check_file(self, content: str) -> Optional[str]:
+        """Reason to skip a file before analysis (oversized or minified), or None."""
+        if self.max_analysis_size and len(content) > self.max_analysis_size:
+            return "too_large"
+        # Minified bundles and generated blobs have very long lines and are not worth parsing
+        if self.max_line_length and len(content) > 4096 \
+                and len(content) > self.max_line_length * (content.count('\n') + 1):
+            return "minified"
+        return None
+
+    def skip(self, path: str, reason: str) -> None:
+        """Record a file left out of the analysis."""
+        self.skipped_total += 1
+        if len(self.skipped) < RunBudget.MAX_RECORDED:
+            self.skipped.append({"path": path, "reason": reason})
+
+    def exceeded(self) -> bool:
+        """Whether anything was cut to stay within budget."""
+        return self.truncated is not None or self.skipped_total > 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the budget outcome as plain data for the outputs."""
+        return {
+            "truncated": self.truncated,
+            "repo_bytes": self.repo_bytes,
+            "elapsed_seconds": round(time.time() - self.started_at, 4),
+            "skipped_total": self.skipped_total,
+            "skipped": list(self.skipped)
+        }
+
 
-        add_node(file_tree)
-        return diagram
+class RunStats:
+    """Measurements for a single pipeline run, fed into the shared MetricsRegistry."""
+
+    COUNTERS = (
+        "files_scanned", "files_skipped", "bytes_read", "cache_hits",
+        "functions_extracted", "classes_extracted", "output_bytes", "files_over_budget"
+    )
+
+    def __init__(self, repo_name: str = "", registry: Optional[MetricsRegistry] = None):
+        self.repo_name = repo_name
+        self.registry = registry or MetricsRegistry.shared()
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.status: Optional[str] = None
+        self.phases: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {name: 0 for name in RunStats.COUNTERS}
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a pipeline phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+            self.registry.observe("phase_duration_seconds", elapsed, {"phase": name})
+
+    def add(self, counter: str, amount: int = 1) -> None:
+        """Increase one of this run's counters."""
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def finish(self, status: str) -> None:
+        """Close the run and add its totals to the registry; later calls are ignored."""
+        if self.status is not None:
+            return
+
+        self.status = status
+        self.finished_at = time.time()
+        self.registry.inc("runs_total", 1, {"status": status})
+        self.registry.observe("run_duration_seconds", self.finished_at - self.started_at)
+        for name, value in self.counters.items():
+            self.registry.inc(f"{name}_total", value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the run summary as plain data."""
+        end = self.finished_at or time.time()
+        return {
+            "repo": self.repo_name,
+            "status": self.status or "running",
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_seconds": round(end - self.started_at, 4),
+            "phases": {name: round(seconds, 4) for name, seconds in self.phases.items()},
+            "counters": dict(self.counters)
+        }
+
+    def write(self, path: str) -> None:
+        """Write the run summary as JSON."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+class ConfigUtils:
+    """Utility class for loading system configuration."""
+
+    DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
+    _loaded: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
+        """Load config.json once per process, returning an empty config if it is missing."""
+        config_path = config_path or ConfigUtils.DEFAULT_CONFIG_PATH
+        if config_path not in ConfigUtils._loaded:
+            try:
+                with open(config_path, 'r', encoding='utf-8') as f:
+                    ConfigUtils._loaded[config_path] = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Warning: could not load config {config_path}: {e}")
+                ConfigUtils._loaded[config_path] = {}
+        return ConfigUtils._loaded[config_path]
 
 
 class ValidationUtils:
@@ -331,6 +3913,14 @@ class ValidationUtils:
         except Exception:
             return False
 
+    @staticmethod
+    def validate_repo_url(url: str, config: Optional[Dict[str, Any]] = None) -> bool:
+        """Validate a repository URL: GitHub, or file:// when git.allow_file_urls is enabled."""
+        if url and url.startswith('file://'):
+            settings = (config if config is not None else ConfigUtils.load_config()).get('git', {})
+            return bool(settings.get('allow_file_urls', False)) and os.path.isdir(url[len('file://'):])
+        return ValidationUtils.validate_github_url(url)
+
     @staticmethod
     def validate_file_size(file_path: str, max_size: int = 10 * 1024 * 1024) -> bool:
         """Validate if file size is within limits."""